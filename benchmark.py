@@ -0,0 +1,1287 @@
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import glob
+import io
+import itertools
+import platform
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rt_review_sanitizer.py")
+
+# Read-only CLI commands and the heavy stacks none of them may import
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "show": ["--show", "Synthetic Movie 0"],
+    "list-movies": ["--list-movies"],
+    "history": ["--history", "Synthetic Movie 0"],
+    "check-scores": ["--check-scores"],
+    "triage-report": ["--triage-report", "100"],
+}
+STARTUP_FORBIDDEN_MODULES = ("selenium", "transformers", "openai", "requests", "tqdm", "torch")
+SUITE_BASELINE_PATH = os.path.join(FIXTURES_DIR, "benchmark_baseline.json")
+
+def time_call(func, *args, repeat=5):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def print_timing(label, seconds, count):
+    rate = count / seconds if seconds > 0 else float('inf')
+    print(f"  {label:<28} {seconds * 1000:9.1f} ms  ({rate:,.0f} reviews/s)")
+
+def launch_headless_browser():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    import rt_review_sanitizer as rts
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    return webdriver.Chrome(service=Service(rts.CHROMEDRIVER_PATH), options=options)
+
+def first_difference(expected, actual):
+    # Describes the first card where two parsed review lists disagree, or None if they match
+    if expected == actual:
+        return None
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        fields = [field for field in want.keys() | got.keys() if want.get(field) != got.get(field)]
+        if fields:
+            return f"card {index}: " + ", ".join(f"{field} {got.get(field)!r} != {want.get(field)!r}" for field in sorted(fields))
+    return f"{len(actual)} reviews parsed, {len(expected)} expected"
+
+def bench_parse(args):
+    import rt_review_sanitizer as rts
+
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "reviews_page_*.html")))
+    if not fixtures:
+        print(f"No review page fixtures found in {FIXTURES_DIR}")
+        sys.exit(1)
+
+    if args.save_expected and not args.browser:
+        print("--save-expected records what Selenium reads per element, so it needs --browser")
+        sys.exit(1)
+
+    failures = []
+    driver = launch_headless_browser() if args.browser else None
+    try:
+        for path in fixtures:
+            with open(path, encoding="utf-8") as f:
+                page_source = f.read()
+
+            seconds, reviews = time_call(rts.parse_reviews_from_html, page_source, repeat=args.repeat)
+            print(f"\n{os.path.basename(path)}: {len(reviews)} reviews")
+            print_timing("html (page_source)", seconds, len(reviews))
+
+            outputs = [("html", reviews)]
+            if driver:
+                driver.get("file://" + path)
+                element_seconds, element_reviews = time_call(rts.parse_reviews_per_element, driver, repeat=1)
+                bulk_seconds, bulk_reviews = time_call(rts.parse_reviews_bulk, driver, repeat=args.repeat)
+                print_timing("element (per-card lookups)", element_seconds, len(element_reviews))
+                print_timing("bulk (execute_script)", bulk_seconds, len(bulk_reviews))
+                print(f"  Speedup bulk vs element: {element_seconds / bulk_seconds:.1f}x")
+                outputs += [("element", element_reviews), ("bulk", bulk_reviews)]
+
+            # Each fixture's reviews as Selenium's WebElement.text reads them through the per-element parser;
+            # the other modes are never recorded, so a regression in them can't be saved as the expected output
+            expected_path = os.path.splitext(path)[0] + ".expected.json"
+            if args.save_expected:
+                with open(expected_path, "w", encoding="utf-8") as f:
+                    json.dump(element_reviews, f, indent=1, ensure_ascii=False)
+                print(f"  Saved the element parser's reviews to {expected_path}; check the diff by hand")
+            if not os.path.exists(expected_path):
+                failures.append(f"{os.path.basename(path)}: no {os.path.basename(expected_path)}; "
+                                "run with --browser --save-expected")
+                continue
+            with open(expected_path, encoding="utf-8") as f:
+                expected = json.load(f)
+
+            for mode, parsed in outputs:
+                difference = first_difference(expected, parsed)
+                if difference:
+                    failures.append(f"{os.path.basename(path)} ({mode}): {difference}")
+    finally:
+        if driver:
+            driver.quit()
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: every parsing mode matches the expected reviews")
+
+class StubRottenTomatoesHandler(BaseHTTPRequestHandler):
+    # Replays the recorded movie page and review endpoint pages from fixtures/api
+    protocol_version = "HTTP/1.1"
+    movie_page = ""
+    review_pages = {}
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parts = urlsplit(self.path)
+
+        if parts.path.startswith("/m/fixture_movie/reviews"):
+            self.send_body(200, "text/html", self.movie_page)
+        elif parts.path.startswith("/napi/movie/") and parts.path.endswith("/reviews/user"):
+            cursor = parse_qs(parts.query).get("endCursor", [""])[0]
+            page = self.review_pages.get(cursor)
+            if page is None:
+                self.send_body(400, "application/json", json.dumps({"error": "unknown cursor"}))
+            else:
+                self.send_body(200, "application/json", json.dumps(page))
+        else:
+            self.send_body(404, "text/html", "<html><body>Sorry, please try again later.</body></html>")
+
+    def send_body(self, status, content_type, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def bench_api(args):
+    import rt_review_sanitizer as rts
+
+    api_dir = os.path.join(FIXTURES_DIR, "api")
+    with open(os.path.join(api_dir, "movie_page.html"), encoding="utf-8") as f:
+        movie_page = f.read()
+    with open(os.path.join(api_dir, "reviews_user_pages.json"), encoding="utf-8") as f:
+        review_pages = json.load(f)
+
+    handler = type("Handler", (StubRottenTomatoesHandler,), {
+        "movie_page": movie_page, "review_pages": review_pages, "latency": args.latency / 1000
+    })
+    server, base_url = start_stub_server(handler)
+    try:
+        movie_url = f"{base_url}/m/fixture_movie/reviews?type=user"
+        seconds, reviews = time_call(rts.scrape_reviews_api, movie_url, repeat=args.repeat)
+        print(f"\nStub review endpoint ({len(review_pages)} pages, {args.latency} ms latency): {len(reviews)} reviews")
+        print_timing("api (pooled keep-alive)", seconds, len(reviews))
+
+        # The endpoint pages were recorded from the same reviews as the page fixture; dates differ in format
+        failures = []
+        with open(os.path.join(FIXTURES_DIR, "reviews_page_300.expected.json"), encoding="utf-8") as f:
+            expected = [{field: review[field] for field in ('text', 'rating', 'username')} for review in json.load(f)]
+        difference = first_difference(expected, [{field: review[field] for field in ('text', 'rating', 'username')}
+                                                 for review in reviews])
+        if difference:
+            failures.append(f"endpoint reviews differ from the page-parsed reviews: {difference}")
+
+        missing = rts.scrape_reviews_api(f"{base_url}/m/no_such_movie/reviews?type=user")
+        if missing is not None:
+            failures.append(f"an unknown movie returned {len(missing)} reviews instead of None")
+    finally:
+        server.shutdown()
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: endpoint reviews match the page-parsed reviews and an unknown movie returns None")
+
+class FakeDeepSeekHandler(BaseHTTPRequestHandler):
+    # OpenAI-compatible /chat/completions stub with injected latency and rate limiting.
+    # Requests beyond `capacity` concurrent ones, or a random `rate_limit_probability` share, get a 429.
+    # A `malformed_probability` share of requests, picked by their body so a repeat gets the same reply as the
+    # model would, are answered with JSON cut off at max_tokens or with no content at all.
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+    capacity = 16
+    rate_limit_probability = 0.0
+    malformed_probability = 0.0
+    retry_after = 1
+    lock = threading.Lock()
+    in_flight = 0
+    served = 0
+    rate_limited = 0
+    retry_not_before = {}  # request body -> when its Retry-After runs out
+    early_retries = 0
+    malformed_bodies = set()
+    malformed_repeats = 0
+
+    @classmethod
+    def reset(cls):
+        cls.in_flight = 0
+        cls.served = 0
+        cls.rate_limited = 0
+        cls.retry_not_before = {}
+        cls.early_retries = 0
+        cls.malformed_bodies = set()
+        cls.malformed_repeats = 0
+
+    @staticmethod
+    def verdict(text):
+        # Deterministic stand-in for the model: longer reviews are better and more likely authentic
+        return {
+            "is_authentic": len(text) > 30,
+            "quality_score": round(min(1.0, 0.1 + len(text) / 300), 2),
+            "reasoning": "Synthetic verdict from the fake DeepSeek server."
+        }
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.loads(raw)
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            # A retry of a rate-limited request must wait out its Retry-After (allowing for timer granularity)
+            if now < cls.retry_not_before.get(raw, 0) - 0.01:
+                cls.early_retries += 1
+            cls.in_flight += 1
+            overloaded = cls.in_flight > cls.capacity or random.random() < cls.rate_limit_probability
+            if overloaded:
+                cls.rate_limited += 1
+                cls.retry_not_before[raw] = now + cls.retry_after
+        try:
+            if overloaded:
+                self.send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                               {"Retry-After": str(cls.retry_after)})
+                return
+
+            time.sleep(cls.latency)
+            user_content = body["messages"][-1]["content"]
+            if user_content.startswith("REVIEWS: "):
+                reviews = json.loads(user_content[len("REVIEWS: "):])
+                content = {"results": [dict(self.verdict(r["text"]), review_id=r["review_id"]) for r in reviews]}
+            else:
+                content = self.verdict(user_content[len("REVIEW TEXT: "):])
+
+            prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+            completion = json.dumps(content)
+            finish_reason = "stop"
+            malformed = zlib.crc32(raw) % 1000 < cls.malformed_probability * 1000
+            if malformed:
+                completion, finish_reason = (completion[:len(completion) // 2], "length") if zlib.crc32(raw) % 2 else (None, "stop")
+            with cls.lock:
+                cls.served += 1
+                if malformed:
+                    cls.malformed_repeats += raw in cls.malformed_bodies
+                    cls.malformed_bodies.add(raw)
+            self.send_json(200, {
+                "id": f"chatcmpl-fake-{cls.served}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": completion}, "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(completion or "") // 4,
+                          "total_tokens": prompt_tokens + len(completion or "") // 4}
+            })
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def point_at_fake_deepseek(rts, base_url):
+    from openai import OpenAI
+
+    rts.DEEPSEEK_BASE_URL = base_url
+    # Default retry settings, as in get_deepseek_client, so rate limits are retried after their Retry-After
+    rts.deepseek_client = OpenAI(api_key="benchmark", base_url=base_url)
+
+def use_temp_database(rts, directory, name):
+    rts.DB_NAME = os.path.join(directory, name)
+    rts.verdict_cache = None
+    rts.setup_database()
+
+def bench_analyze(args):
+    import rt_review_sanitizer as rts
+
+    handler = type("Handler", (FakeDeepSeekHandler,), {
+        "latency": args.latency / 1000, "capacity": args.capacity,
+        "rate_limit_probability": args.rate_limit, "malformed_probability": args.malformed, "lock": threading.Lock()
+    })
+    server, base_url = start_stub_server(handler)
+    point_at_fake_deepseek(rts, base_url)
+
+    with open(os.path.join(FIXTURES_DIR, "reviews_page_300.html"), encoding="utf-8") as f:
+        reviews = rts.parse_reviews_from_html(f.read())
+    # Make every text distinct so the verdict cache doesn't hide the API path
+    reviews = [dict(review, text=f"{review['text']} (#{i})") for i, review in enumerate(reviews)]
+
+    print(f"\nFake DeepSeek: {args.latency} ms latency, capacity {args.capacity}, "
+          f"{args.rate_limit * 100:.0f}% random 429s, {args.malformed * 100:.0f}% malformed replies; "
+          f"{len(reviews)} reviews, batch mode {args.batch}")
+    failures = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for engine in args.engines:
+                use_temp_database(rts, tmp, f"analyze_{engine}.db")
+                movie_id = rts.save_reviews_to_db(reviews, "Fixture Movie", "fixture")
+                handler.reset()
+                backoffs = rts.metrics.counters.get('concurrency_backoffs', 0)
+
+                start = time.perf_counter()
+                analyzed = rts.analyze_reviews_with_ai(movie_id, batch_mode=args.batch, engine=engine)
+                seconds = time.perf_counter() - start
+                backoffs = rts.metrics.counters.get('concurrency_backoffs', 0) - backoffs
+
+                conn = sqlite3.connect(rts.DB_NAME)
+                fake_scores, retryable, verdicts = conn.execute('''
+                    SELECT SUM(reasoning = ?), SUM(reasoning = ?), SUM(quality_score IS NOT NULL) FROM ai_analysis
+                ''', (rts.ANALYSIS_FAILED_REASONING, rts.ANALYSIS_RETRY_REASONING)).fetchone()
+                conn.close()
+
+                print(f"\n  engine={engine}")
+                print_timing("analyze_reviews_with_ai", seconds, analyzed)
+                print(f"  {handler.served} requests served, {handler.rate_limited} rate-limited "
+                      f"({handler.early_retries} retried before Retry-After), {len(handler.malformed_bodies)} malformed "
+                      f"({handler.malformed_repeats} sent again), {backoffs} concurrency backoffs, "
+                      f"{fake_scores or 0} fake failure scores written, {retryable or 0} left retryable")
+                if rts.check_movie_scores(movie_id):
+                    failures.append(f"{engine}: movie_scores disagrees with a full recomputation")
+
+                if fake_scores:
+                    failures.append(f"{engine}: {fake_scores} placeholder verdicts were written for failed requests")
+                if (verdicts or 0) + (retryable or 0) != len(reviews) or analyzed != (verdicts or 0):
+                    failures.append(f"{engine}: {verdicts or 0} verdicts and {retryable or 0} retryable rows for "
+                                    f"{len(reviews)} reviews, {analyzed} reported analyzed")
+                if handler.malformed_repeats:
+                    failures.append(f"{engine}: {handler.malformed_repeats} requests were repeated after a malformed reply")
+                if handler.early_retries:
+                    failures.append(f"{engine}: {handler.early_retries} requests retried before their Retry-After")
+                if engine == "async" and handler.rate_limited and not backoffs:
+                    failures.append(f"{engine}: the concurrency limit never dropped after {handler.rate_limited} 429s")
+    finally:
+        server.shutdown()
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: failed requests were left retryable, Retry-After was honored and concurrency backed off on 429s")
+
+def fill_synthetic_reviews(rts, movies, reviews_per_movie, analyzed_share=0.9, seed=155):
+    # Bulk-loads random reviews and verdicts straight into the current database
+    rng = random.Random(seed)
+    conn = sqlite3.connect(rts.DB_NAME)
+    with conn:
+        for m in range(movies):
+            movie_id = rts.get_or_create_movie(conn.cursor(), f"Synthetic Movie {m}", f"synthetic://{m}")
+            first_id = (conn.execute("SELECT MAX(id) FROM reviews").fetchone()[0] or 0) + 1
+            conn.executemany('''
+                INSERT INTO reviews (movie_id, review_text, original_rating, review_type, username, date, review_hash)
+                VALUES (?, ?, ?, 'audience', ?, ?, ?)
+            ''', ((movie_id, f"Synthetic review {m}-{i} " + "words " * rng.randint(1, 40),
+                   rng.choice([None] + [x / 2 for x in range(1, 11)]), f"user{rng.randint(1, 10 ** 6)}",
+                   f"{rng.randint(1, 6)}d", f"{m}-{i}") for i in range(reviews_per_movie)))
+            conn.executemany('''
+                INSERT INTO ai_analysis (review_id, movie_id, is_authentic, quality_score, reasoning)
+                VALUES (?, ?, ?, ?, 'synthetic')
+            ''', ((first_id + i, movie_id, rng.random() > 0.2, round(rng.uniform(0.1, 1.0), 2))
+                  for i in range(reviews_per_movie) if rng.random() < analyzed_share))
+    conn.close()
+
+def parse_importtime(stderr):
+    # Returns (total µs, {top-level module: cumulative µs}) from `python -X importtime` output
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            modules[name.strip()] = int(cumulative)
+    return sum(modules.values()), modules
+
+def bench_startup(args):
+    import rt_review_sanitizer as rts
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CLI reads final.db from its working directory
+        use_temp_database(rts, tmp, "final.db")
+        fill_synthetic_reviews(rts, movies=3, reviews_per_movie=200)
+
+        print(f"\nStartup import time per command (budget {args.budget:.0f} ms):")
+        for name, command in STARTUP_COMMANDS.items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                completed = subprocess.run([sys.executable, "-X", "importtime", SCRIPT_PATH, *command],
+                                           cwd=tmp, capture_output=True, text=True)
+                timings.append((time.perf_counter() - start, parse_importtime(completed.stderr)))
+            wall, (total_us, modules) = min(timings, key=lambda timing: timing[1][0])
+
+            heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:3]
+            print(f"  {name:<14} imports {total_us / 1000:7.1f} ms, wall {wall * 1000:7.1f} ms  "
+                  f"(heaviest: {', '.join(f'{module} {us / 1000:.0f} ms' for module, us in heaviest)})")
+
+            forbidden = sorted(module for module in modules if module.split(".")[0] in STARTUP_FORBIDDEN_MODULES)
+            if completed.returncode != 0:
+                failures.append(f"{name} exited with status {completed.returncode}")
+            if forbidden:
+                failures.append(f"{name} imported {', '.join(forbidden)}")
+            if total_us / 1000 > args.budget:
+                failures.append(f"{name} spent {total_us / 1000:.0f} ms importing modules")
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: every command started within budget without loading the scraping or AI stacks")
+
+CAMPAIGN_TEXT = "Absolutely disgraceful, this film betrays the fans and the original story, do not waste your money on it"
+
+def synthetic_vocabulary(rng):
+    return [f"{rng.choice('bcdfghklmnprstvw')}{rng.choice('aeiou')}{rng.choice('nrstl')}{i}" for i in range(5000)]
+
+def campaign_copy(vocabulary, rng):
+    # A copy of the campaign review with one word swapped
+    words = CAMPAIGN_TEXT.split()
+    words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words)
+
+def synthetic_review_texts(count, campaign_size, rng):
+    # Random prose plus one copy-paste campaign whose copies each differ by a word or two
+    vocabulary = synthetic_vocabulary(rng)
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(10, 60))) for _ in range(count - campaign_size)]
+    texts += [campaign_copy(vocabulary, rng) for _ in range(campaign_size)]
+    rng.shuffle(texts)
+    return texts
+
+def synthetic_reviews(count, rng, campaign_share=0.01):
+    # Review dicts generated lazily, so 10^6 of them can be streamed without building the texts up front
+    vocabulary = synthetic_vocabulary(rng)
+    ratings = [None] + [x / 2 for x in range(1, 11)]
+    for i in range(count):
+        if rng.random() < campaign_share:
+            text = campaign_copy(vocabulary, rng)
+        else:
+            text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(10, 60)))
+        yield {'text': text, 'rating': rng.choice(ratings), 'username': f"user{i}", 'date': f"{rng.randint(1, 28)}d"}
+
+def bench_duplicates(args):
+    import rt_review_sanitizer as rts
+
+    rng = random.Random(155)
+    texts = synthetic_review_texts(args.reviews, args.campaign, rng)
+    reviews = ({'text': text, 'rating': rng.choice([0.5, 3.0, 4.5]), 'username': f"user{i}", 'date': "1d"}
+               for i, text in enumerate(texts))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        use_temp_database(rts, tmp, "duplicates.db")
+        start = time.perf_counter()
+        movie_id = rts.save_reviews_stream(reviews, "Synthetic Movie", "synthetic://duplicates")
+        seconds = time.perf_counter() - start
+
+        conn = sqlite3.connect(rts.DB_NAME)
+        flagged = conn.execute("SELECT COUNT(*) FROM reviews WHERE movie_id = ? AND near_duplicate_of IS NOT NULL",
+                               (movie_id,)).fetchone()[0]
+        conn.close()
+
+        print(f"\n{args.reviews} reviews, one campaign of {args.campaign} near-identical copies")
+        print_timing("save + near-duplicate index", seconds, args.reviews)
+        print(f"  {flagged} reviews flagged as near-duplicates (expected about {max(args.campaign - 1, 0)})")
+        rts.near_duplicate_report(3)
+
+def resume_child(args):
+    # One pipeline run for bench_resume, killed with os._exit partway through when asked
+    import rt_review_sanitizer as rts
+
+    rts.DB_NAME = args.db
+    point_at_fake_deepseek(rts, args.deepseek_url)
+    rts.setup_database()
+
+    def crash_after(name, calls):
+        func = getattr(rts, name)
+        count = [0]
+
+        def wrapper(*func_args):
+            count[0] += 1
+            if count[0] > calls:
+                os._exit(3)
+            return func(*func_args)
+        setattr(rts, name, wrapper)
+
+    if args.crash_after_pages is not None:
+        crash_after("insert_reviews", args.crash_after_pages)
+    if args.crash_after_flushes is not None:
+        crash_after("save_analysis_results", args.crash_after_flushes)
+
+    scraped = rts.scrape_movie("Fixture Movie", args.movie_url)
+    rts.analyze_movie(scraped[0])
+
+def bench_resume(args):
+    import rt_review_sanitizer as rts
+
+    api_dir = os.path.join(FIXTURES_DIR, "api")
+    with open(os.path.join(api_dir, "movie_page.html"), encoding="utf-8") as f:
+        movie_page = f.read()
+    with open(os.path.join(api_dir, "reviews_user_pages.json"), encoding="utf-8") as f:
+        review_pages = json.load(f)
+
+    page_requests = []
+
+    class CountingHandler(StubRottenTomatoesHandler):
+        def do_GET(self):
+            if "/napi/" in self.path:
+                page_requests.append(self.path)
+            super().do_GET()
+
+    rt_handler = type("Handler", (CountingHandler,), {"movie_page": movie_page, "review_pages": review_pages})
+    rt_server, rt_url = start_stub_server(rt_handler)
+    deepseek_handler = type("Handler", (FakeDeepSeekHandler,), {"latency": args.latency / 1000, "lock": threading.Lock()})
+    deepseek_server, deepseek_url = start_stub_server(deepseek_handler)
+    movie_url = f"{rt_url}/m/fixture_movie/reviews?type=user"
+
+    failures = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            rts.DB_NAME = os.path.join(tmp, "resume.db")
+
+            def run(label, *extra):
+                del page_requests[:]
+                completed = subprocess.run([sys.executable, os.path.abspath(__file__), "resume-child", rts.DB_NAME,
+                                            movie_url, deepseek_url, *extra], capture_output=True, text=True)
+                conn = sqlite3.connect(rts.DB_NAME)
+                reviews = conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+                in_progress, done = conn.execute('''
+                    SELECT SUM(reasoning = ?), SUM(quality_score IS NOT NULL) FROM ai_analysis
+                ''', (rts.ANALYSIS_IN_PROGRESS_REASONING,)).fetchone()
+                stage, cursor = conn.execute("SELECT stage, cursor FROM run_ledger").fetchone()
+                conn.close()
+                print(f"  {label:<38} exit {completed.returncode}, {len(page_requests):>2} pages fetched, "
+                      f"{reviews} reviews saved, {done or 0} analyzed, {in_progress or 0} in progress; stage {stage}")
+                return completed, reviews, stage, cursor
+
+            print(f"\nCrash and resume against the stub endpoint ({len(review_pages)} pages) and fake DeepSeek:")
+            _, _, stage, cursor = run(f"crash after {args.crash_after_pages} saved pages",
+                                          "--crash-after-pages", str(args.crash_after_pages))
+            if stage != "scrape" or not cursor:
+                failures.append("the crashed scrape left no cursor to resume from")
+
+            _, resumed, stage, _ = run("resume, crash after 1 analysis flush", "--crash-after-flushes", "1")
+            if len(page_requests) != len(review_pages) - args.crash_after_pages:
+                failures.append(f"the resumed scrape fetched {len(page_requests)} pages instead of "
+                                f"{len(review_pages) - args.crash_after_pages}")
+
+            conn = sqlite3.connect(rts.DB_NAME)
+            with conn:
+                # Stand-in for waiting out ANALYSIS_LEASE_SECONDS
+                expired = conn.execute("UPDATE ai_analysis SET lease_expires_at = 0 WHERE reasoning = ?",
+                                       (rts.ANALYSIS_IN_PROGRESS_REASONING,)).rowcount
+            conn.close()
+            print(f"  expired the crashed run's {expired} leases")
+
+            completed, final, stage, _ = run("resume to completion")
+            conn = sqlite3.connect(rts.DB_NAME)
+            unanalyzed = conn.execute('''
+                SELECT COUNT(*) FROM reviews r LEFT JOIN ai_analysis a ON a.review_id = r.id
+                WHERE a.quality_score IS NULL
+            ''').fetchone()[0]
+            conn.close()
+            if completed.returncode != 0:
+                failures.append(f"the final run failed:\n{completed.stdout[-2000:]}{completed.stderr[-2000:]}")
+            if stage != "done" or unanalyzed:
+                failures.append(f"run ended in stage {stage} with {unanalyzed} reviews unanalyzed")
+            if final != resumed:
+                failures.append(f"the final run saved {final - resumed} extra reviews")
+            if rts.check_movie_scores():
+                failures.append("movie_scores drifted from the saved rows")
+    finally:
+        rt_server.shutdown()
+        deepseek_server.shutdown()
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: every crash resumed from its checkpoint and each review was saved and analyzed once")
+
+def bench_stream(args):
+    # Sequential scrape-then-analyze against the streamed pipeline, on the stub endpoint and fake DeepSeek
+    import rt_review_sanitizer as rts
+
+    api_dir = os.path.join(FIXTURES_DIR, "api")
+    with open(os.path.join(api_dir, "movie_page.html"), encoding="utf-8") as f:
+        movie_page = f.read()
+    with open(os.path.join(api_dir, "reviews_user_pages.json"), encoding="utf-8") as f:
+        review_pages = json.load(f)
+
+    rt_handler = type("Handler", (StubRottenTomatoesHandler,), {
+        "movie_page": movie_page, "review_pages": review_pages, "latency": args.page_latency / 1000
+    })
+    rt_server, rt_url = start_stub_server(rt_handler)
+    deepseek_handler = type("Handler", (FakeDeepSeekHandler,), {"latency": args.latency / 1000, "lock": threading.Lock()})
+    deepseek_server, deepseek_url = start_stub_server(deepseek_handler)
+    point_at_fake_deepseek(rts, deepseek_url)
+    movie_url = f"{rt_url}/m/fixture_movie/reviews?type=user"
+
+    save_analysis_results = rts.save_analysis_results
+    first_verdict = []
+
+    def timed_save(*func_args):
+        if not first_verdict:
+            first_verdict.append(time.perf_counter())
+        return save_analysis_results(*func_args)
+    rts.save_analysis_results = timed_save
+
+    def sequential(title):
+        scraped = rts.scrape_movie(title, movie_url)
+        rts.analyze_movie(scraped[0])
+        return scraped
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, run in (("sequential", sequential), ("streamed", lambda title: rts.process_movie(title, movie_url))):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    use_temp_database(rts, tmp, f"{label}.db")
+                del first_verdict[:]
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    start = time.perf_counter()
+                    _, loaded = run("Fixture Movie")
+                    seconds = time.perf_counter() - start
+                conn = sqlite3.connect(rts.DB_NAME)
+                analyzed = conn.execute("SELECT COUNT(*) FROM ai_analysis WHERE quality_score IS NOT NULL").fetchone()[0]
+                conn.close()
+                results[label] = (seconds, first_verdict[0] - start if first_verdict else seconds, loaded, analyzed)
+    finally:
+        rts.save_analysis_results = save_analysis_results
+        rt_server.shutdown()
+        deepseek_server.shutdown()
+
+    print(f"\nStub endpoint ({len(review_pages)} pages, {args.page_latency} ms each), fake DeepSeek ({args.latency} ms):")
+    for label, (seconds, first, loaded, analyzed) in results.items():
+        print(f"  {label:<12} total {seconds * 1000:8.1f} ms, first verdict after {first * 1000:8.1f} ms"
+              f"  ({loaded} loaded, {analyzed} analyzed)")
+    if len({result[2:] for result in results.values()}) != 1:
+        print("\nFAIL: the streamed run saved or analyzed a different number of reviews")
+        sys.exit(1)
+
+class FixturePage:
+    # Stands in for a WebDriver in the page_source parse path
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+def scaled_review_page(count):
+    # The 300-card fixture page with its cards repeated until the page holds at least `count` reviews
+    with open(os.path.join(FIXTURES_DIR, "reviews_page_300.html"), encoding="utf-8") as f:
+        page = f.read()
+    first_card = page.index('<div class="audience-review-row"')
+    cards_end = page.index('<div class="load-more-container">')
+    cards_end = page.rindex('</div>', first_card, cards_end)
+    copies = -(-count // 300)
+    return page[:first_card] + page[first_card:cards_end] * copies + page[cards_end:]
+
+def measure(func, prepare=lambda: (), repeat=1, min_seconds=0.0, max_repeat=50):
+    # Best-of-repeat wall time untraced, repeating quick calls until min_seconds have been spent, then one
+    # more call under tracemalloc for the peak memory it allocates. prepare() returns fresh arguments for
+    # each call; output is discarded so it doesn't skew the timing.
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        while len(timings) < repeat or (sum(timings) < min_seconds and len(timings) < max_repeat):
+            call_args = prepare()
+            start = time.perf_counter()
+            func(*call_args)
+            timings.append(time.perf_counter() - start)
+
+        call_args = prepare()
+        tracemalloc.start()
+        try:
+            traced_at_start = tracemalloc.get_traced_memory()[0]
+            func(*call_args)
+            peak = tracemalloc.get_traced_memory()[1] - traced_at_start
+        finally:
+            tracemalloc.stop()
+    return min(timings), peak
+
+def fill_synthetic_verdicts(rts, movie_id, seed=155):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(rts.DB_NAME)
+    with conn:
+        review_ids = [review_id for review_id, in conn.execute("SELECT id FROM reviews WHERE movie_id = ?", (movie_id,))]
+        conn.executemany('''
+            INSERT INTO ai_analysis (review_id, movie_id, is_authentic, quality_score, reasoning)
+            VALUES (?, ?, ?, ?, 'synthetic')
+        ''', ((review_id, movie_id, rng.random() > 0.2, round(rng.uniform(0.1, 1.0), 2)) for review_id in review_ids))
+    conn.close()
+
+def service_get(port, path):
+    # Returns (status, JSON body, seconds)
+    import http.client
+    from urllib.parse import quote
+
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    try:
+        conn.request("GET", quote(path, safe="/?=&"))
+        response = conn.getresponse()
+        return response.status, json.loads(response.read()), time.perf_counter() - start
+    finally:
+        conn.close()
+
+def start_service(rts, **kwargs):
+    service = rts.ReviewService(**kwargs)
+    started = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(service.serve("127.0.0.1", 0, lambda _: started.set())), daemon=True)
+    thread.start()
+    if not started.wait(60):
+        raise RuntimeError("the service did not start")
+    return service, thread
+
+def stop_service(service, thread):
+    service.stop()
+    thread.join()
+    service.close()
+
+def bench_service(args):
+    # Drives the HTTP service mode against the stub review endpoint and fake DeepSeek: concurrent requests
+    # for one title share a job, repeats are cached, stale results are served while a refresh runs, and a
+    # restarted service answers from the database
+    import rt_review_sanitizer as rts
+
+    api_dir = os.path.join(FIXTURES_DIR, "api")
+    with open(os.path.join(api_dir, "movie_page.html"), encoding="utf-8") as f:
+        movie_page = f.read()
+    with open(os.path.join(api_dir, "reviews_user_pages.json"), encoding="utf-8") as f:
+        review_pages = json.load(f)
+
+    movie_requests = []
+
+    class CountingHandler(StubRottenTomatoesHandler):
+        def do_GET(self):
+            if self.path.startswith("/m/"):
+                movie_requests.append(self.path)
+            super().do_GET()
+
+    rt_handler = type("Handler", (CountingHandler,), {
+        "movie_page": movie_page, "review_pages": review_pages, "latency": args.page_latency / 1000
+    })
+    rt_server, rt_url = start_stub_server(rt_handler)
+    deepseek_handler = type("Handler", (FakeDeepSeekHandler,), {"latency": args.latency / 1000, "lock": threading.Lock()})
+    deepseek_server, deepseek_url = start_stub_server(deepseek_handler)
+    point_at_fake_deepseek(rts, deepseek_url)
+    rts.BASE_URL = f"{rt_url}/m/"
+    title = "Fixture Movie"
+
+    lines = []
+    failures = []
+
+    def check(condition, failure):
+        if not condition:
+            failures.append(failure)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp, \
+             contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            use_temp_database(rts, tmp, "service.db")
+            service, thread = start_service(rts, workers=2)
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=args.clients) as executor:
+                    cold = list(executor.map(lambda _: service_get(service.port, f"/score?title={title}&wait=120"),
+                                             range(args.clients)))
+                job_ids = {body.get('id') for _, body, _ in cold}
+                check(all(status == 200 for status, _, _ in cold), f"cold requests returned {[c[0] for c in cold]}")
+                check(len(job_ids) == 1, f"{args.clients} concurrent requests started {len(job_ids)} jobs")
+                check(len(movie_requests) == 1, f"the movie was scraped {len(movie_requests)} times")
+                cold_job = service.jobs[next(iter(job_ids))]
+                lines.append(f"  {args.clients} concurrent cold requests   1 job, {len(movie_requests)} scrape, "
+                             f"slowest response {max(c[2] for c in cold) * 1000:8.1f} ms "
+                             f"(job {(cold_job.finished_at - cold_job.started_at) * 1000:.1f} ms)")
+
+                status, body, seconds = service_get(service.port, f"/score?title={title}")
+                check(status == 200 and body['status'] == 'fresh', f"repeat request returned {status} {body.get('status')}")
+                check(len(movie_requests) == 1, "a fresh cached result was scraped again")
+                lines.append(f"  cached request               {body['status']}, {seconds * 1000:8.1f} ms")
+
+                status, body, _ = service_get(service.port, f"/jobs/{cold_job.id}")
+                check(status == 200 and body['status'] == 'done' and body['result']['total_reviews'] == 300,
+                      f"job status returned {status} {body}")
+
+                ttl, service.cache.ttl = service.cache.ttl, 0
+                served = deepseek_handler.served
+                status, body, seconds = service_get(service.port, f"/score?title={title}")
+                check(status == 200 and body['status'] == 'stale' and body.get('job'), f"stale request returned {status} {body}")
+                stale_seconds = seconds
+                refresh = service.jobs[body['job']]
+                while refresh.finished_at is None:
+                    time.sleep(0.05)
+                service.cache.ttl = ttl
+                check(refresh.status == 'done' and len(movie_requests) == 2, f"the refresh ended {refresh.status} "
+                      f"after {len(movie_requests) - 1} scrapes")
+                status, body, _ = service_get(service.port, f"/score?title={title}")
+                check(body.get('status') == 'fresh' and body['age_seconds'] < 5, f"after the refresh got {body}")
+                lines.append(f"  stale request                served in {stale_seconds * 1000:8.1f} ms while refreshing "
+                             f"(warm refresh {(refresh.finished_at - refresh.started_at) * 1000:.1f} ms, "
+                             f"{deepseek_handler.served - served} DeepSeek requests)")
+
+                status, body, _ = service_get(service.port, "/score?title=No Such Movie&wait=60")
+                check(status == 404 and body['status'] == 'not_found', f"unknown movie returned {status} {body}")
+                status, _, _ = service_get(service.port, "/score")
+                check(status == 400, f"missing title returned {status}")
+                for wait in ("-1", "nan", "inf", "soon"):
+                    status, _, _ = service_get(service.port, f"/score?title={title}&wait={wait}")
+                    check(status == 400, f"wait={wait} returned {status}")
+                status, body, _ = service_get(service.port, "/health")
+                check(status == 200 and body['running_jobs'] == 0, f"health returned {status} {body}")
+            finally:
+                stop_service(service, thread)
+
+            service, thread = start_service(rts, workers=2)
+            try:
+                status, body, seconds = service_get(service.port, f"/score?title={title}")
+                check(status == 200 and body['status'] == 'fresh' and len(movie_requests) == 3,
+                      f"a restarted service returned {status} {body.get('status')} for a stored movie")
+                lines.append(f"  after restart                {body.get('status')} from the database, {seconds * 1000:8.1f} ms")
+            finally:
+                stop_service(service, thread)
+    finally:
+        rt_server.shutdown()
+        deepseek_server.shutdown()
+
+    print(f"\nService against the stub endpoint ({args.page_latency} ms per page) and fake DeepSeek ({args.latency} ms):")
+    print("\n".join(lines))
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: requests were coalesced, cached, refreshed while stale and answered after a restart")
+
+def bench_trends(args):
+    # Rolling-window scores and bomb-onset detection over dated synthetic reviews with one injected review
+    # bomb, against rescanning every review and reparsing its card date
+    import rt_review_sanitizer as rts
+
+    day = 86400
+    end = time.time()
+    bomb_day = int((end - args.bomb_days_ago * day) // day) * day
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            use_temp_database(rts, tmp, "trends.db")
+        print(f"\nFilling {args.rows} synthetic reviews across {args.movies} movies over {args.days} days...")
+        fill_synthetic_reviews(rts, args.movies, args.rows // args.movies)
+        conn = sqlite3.connect(rts.DB_NAME)
+        with conn:
+            # Spread evenly over the period, so only the injected bomb stands out
+            conn.execute("UPDATE reviews SET created_at = ? - (id * 7919 % ?)", (end, args.days * day))
+            movie_id = conn.execute("SELECT id FROM movies ORDER BY id LIMIT 1").fetchone()[0]
+            first_id = conn.execute("SELECT MAX(id) FROM reviews").fetchone()[0] + 1
+            conn.executemany('''
+                INSERT INTO reviews (id, movie_id, review_text, original_rating, review_type, username, date, created_at, review_hash)
+                VALUES (?, ?, 'Worst movie ever, total garbage', 0.5, 'audience', ?, 'Jan 1', ?, ?)
+            ''', ((first_id + i, movie_id, f"bomber{i}", bomb_day + i * day / args.bomb, f"bomb-{i}") for i in range(args.bomb)))
+            conn.executemany('''
+                INSERT INTO ai_analysis (review_id, movie_id, is_authentic, quality_score, reasoning)
+                VALUES (?, ?, 0, 0.1, 'synthetic')
+            ''', ((first_id + i, movie_id) for i in range(args.bomb)))
+        movie_ids = [row[0] for row in conn.execute("SELECT id FROM movies ORDER BY id")]
+        for snapshot_movie in movie_ids:
+            for run in range(args.snapshots):
+                rts.record_score_snapshot(snapshot_movie, end - (args.snapshots - run) * day)
+
+        def full_pass():
+            # The alternative without created_at: every review's card date reparsed to bucket it
+            buckets = {}
+            for review_movie, date, is_authentic in conn.execute('''
+                SELECT r.movie_id, r.date, a.is_authentic FROM reviews r LEFT JOIN ai_analysis a ON a.review_id = r.id
+            '''):
+                timestamp = rts.parse_review_timestamp(date, end)
+                if timestamp is not None and is_authentic == 0:
+                    key = (review_movie, int(timestamp // day))
+                    buckets[key] = buckets.get(key, 0) + 1
+            return buckets
+
+        window_query = rts.score_rebuild_query("WHERE r.movie_id = ? AND r.created_at >= ? AND r.created_at < ?")
+
+        def per_window():
+            # The alternative without prefix sums: one aggregate per window
+            return [[conn.execute(window_query, (m, t - 7 * day, t)).fetchall()
+                     for t in range(int(end), int(end - args.days * day), -day)] for m in movie_ids]
+
+        paths = [
+            ("rolling 7-day windows", lambda: [rts.rolling_window_scores(m, 7 * day, day, end - args.days * day, end)
+                                               for m in movie_ids]),
+            ("  one aggregate per window", per_window),
+            ("bomb onsets", lambda: [rts.detect_bomb_onsets(m) for m in movie_ids]),
+            ("  full pass + date reparse", full_pass),
+            ("score history", lambda: [rts.score_history(m) for m in movie_ids]),
+        ]
+        print(f"\n{'query (all movies)':<30} {'time':>12} {'per movie':>12}")
+        for label, func in paths:
+            seconds, _ = measure(func, repeat=args.repeat)
+            print(f"  {label:<28} {seconds * 1000:9.1f} ms {seconds * 1000 / len(movie_ids):9.2f} ms")
+
+        failures = []
+        onsets = rts.detect_bomb_onsets(movie_id)
+        found = [onset for onset in onsets if onset.start <= bomb_day < onset.end]
+        print(f"\nInjected {args.bomb} inauthentic reviews on {rts.format_timestamp(bomb_day)} UTC; detected onsets:")
+        for onset in onsets:
+            print(f"  {rts.format_timestamp(onset.start)} to {rts.format_timestamp(onset.end)}: {onset.inauthentic} inauthentic "
+                  f"(peak {onset.peak}, baseline {onset.baseline:.1f})")
+        if not found:
+            failures.append("the injected bomb was not detected")
+        others = sum(len(rts.detect_bomb_onsets(m)) for m in movie_ids if m != movie_id)
+        print(f"  {others} onsets flagged in the {len(movie_ids) - 1} movies without a bomb")
+
+        # A window spanning every review must agree with the incremental movie_scores
+        (_, whole), = rts.rolling_window_scores(movie_id, 2 * args.days * day, day, end, end + 1)
+        expected = rts.compute_movie_results(movie_id, None, conn)
+        if not same_results(whole, expected):
+            failures.append("a window over every review disagrees with movie_scores")
+        if len(rts.score_history(movie_id)) != args.snapshots:
+            failures.append("score history is missing snapshots")
+        conn.close()
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nOK: the bomb was found and the windowed scores match movie_scores")
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def same_results(a, b, tolerance=1e-9):
+    # MovieResults equal up to float summation order
+    for key, value in a.to_dict().items():
+        other = b.to_dict()[key]
+        if isinstance(value, float) or isinstance(other, float):
+            if value is None or other is None:
+                if value is not other:
+                    return False
+            elif abs(value - other) > tolerance * max(1, abs(value)):
+                return False
+        elif key == 'distribution':
+            if [(x['label'], x['count']) for x in value] != [(x['label'], x['count']) for x in other]:
+                return False
+        elif value != other:
+            return False
+    return True
+
+def bench_export(args):
+    # Export to each columnar format and score every movie from memory-mapped columns, against the SQLite
+    # aggregate and a row-by-row cursor over the same join
+    import rt_review_sanitizer as rts
+
+    formats = [fmt for fmt in args.formats if fmt == "npy" or rts.importlib.util.find_spec("pyarrow")]
+    skipped = set(args.formats) - set(formats)
+    if skipped:
+        print(f"pyarrow is not installed; skipping {', '.join(sorted(skipped))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            use_temp_database(rts, tmp, "export.db")
+        print(f"\nFilling {args.rows} synthetic reviews across {args.movies} movies...")
+        fill_synthetic_reviews(rts, args.movies, args.rows // args.movies)
+        conn = sqlite3.connect(rts.DB_NAME)
+        with conn:
+            # Some near-duplicates and unfinished claims, so every column matters
+            conn.execute("UPDATE reviews SET near_duplicate_of = id - 1 WHERE id % 50 = 0")
+            conn.execute("UPDATE ai_analysis SET quality_score = NULL, is_authentic = NULL, reasoning = ? "
+                         "WHERE review_id % 97 = 0", (rts.ANALYSIS_IN_PROGRESS_REASONING,))
+        titles = dict(conn.execute("SELECT id, title FROM movies"))
+        reference = {movie_id: rts.compute_movie_results(movie_id, title, conn) for movie_id, title in titles.items()}
+
+        def sqlite_aggregate():
+            return [rts.movie_results_from_scores(row[0], titles[row[0]], dict(zip(rts.SCORE_COLUMNS, row[1:])))
+                    for row in conn.execute(rts.score_rebuild_query())]
+
+        def sqlite_cursor():
+            import numpy as np
+            results = []
+            for movie_id, title in titles.items():
+                chunks = [columns for columns, _ in rts.export_chunks(conn.execute(rts.EXPORT_QUERY, (movie_id,)))]
+                columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in rts.EXPORT_COLUMNS}
+                results.append(rts.movie_results_from_scores(movie_id, title, rts.scores_from_columns(columns)))
+            return results
+
+        paths = [("sqlite aggregate", sqlite_aggregate), ("sqlite cursor + numpy", sqlite_cursor)]
+        print(f"\n{'path':<30} {'time':>12} {'throughput':>18} {'memory':>14} {'on disk':>10}")
+        failures = []
+        for fmt in formats:
+            export_dir = os.path.join(tmp, fmt)
+            seconds, peak = measure(rts.export_dataset, lambda: (export_dir, None, fmt))
+            print(f"  {'export ' + fmt:<28} {seconds * 1000:9.1f} ms {args.rows / seconds:>12,.0f} rows/s "
+                  f"{peak / 2 ** 20:8.1f} MiB peak {directory_size(export_dir) / 2 ** 20:7.1f} MiB")
+            paths.append((f"{fmt} columns", functools.partial(rts.export_movie_results, export_dir)))
+
+        for label, func in paths:
+            results = func()
+            if len(results) != len(reference) or not all(same_results(r, reference[r.movie_id]) for r in results):
+                failures.append(label)
+            seconds, peak = measure(func, repeat=args.repeat)
+            print(f"  {label:<28} {seconds * 1000:9.1f} ms {args.rows / seconds:>12,.0f} rows/s {peak / 2 ** 20:8.1f} MiB peak")
+        conn.close()
+
+    if failures:
+        print(f"\nFAIL: scores differ from movie_scores for {', '.join(failures)}")
+        sys.exit(1)
+    print("\nOK: every path matches the scores in movie_scores")
+
+def bench_suite(args):
+    import rt_review_sanitizer as rts
+
+    results = {}
+
+    def record(path, size, seconds, peak, items):
+        results[f"{path}@{size}"] = {
+            'path': path, 'size': size, 'seconds': seconds, 'items': items,
+            'items_per_second': items / seconds if seconds > 0 else None, 'peak_bytes': peak
+        }
+        rate = items / seconds if seconds > 0 else float('inf')
+        print(f"  {path:<28} {size:>8}  {seconds * 1000:10.1f} ms  {rate:12,.0f} items/s  {peak / 2 ** 20:8.1f} MiB peak")
+
+    print(f"\n{'path':<30} {'size':>8}  {'best time':>13}  {'throughput':>18}  {'memory':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            reviews = list(synthetic_reviews(size, random.Random(size)))
+
+            if size <= args.max_parse_size:
+                page = FixturePage(scaled_review_page(size))
+                seconds, peak = measure(rts.parse_reviews, lambda: (page, "html"), repeat=args.repeat, min_seconds=args.min_seconds)
+                record("parse_reviews", size, seconds, peak, -(-size // 300) * 300)
+
+            databases = itertools.count()
+            movie_title = "Synthetic Movie"
+
+            def fresh_database():
+                use_temp_database(rts, tmp, f"suite_{size}_{next(databases)}.db")
+                return reviews, movie_title, "synthetic://suite"
+
+            seconds, peak = measure(rts.save_reviews_to_db, fresh_database, repeat=1)
+            record("save_reviews_to_db", size, seconds, peak, size)
+
+            # The last database holds the traced save; give every review a verdict for the scoring paths
+            movie_id = rts.find_movie_id(movie_title)
+            fill_synthetic_verdicts(rts, movie_id)
+            conn = sqlite3.connect(rts.DB_NAME)
+            seconds, peak = measure(rts.rebuild_movie_scores, lambda: (conn, movie_id), repeat=args.repeat, min_seconds=args.min_seconds)
+            record("rebuild_movie_scores", size, seconds, peak, size)
+            conn.close()
+
+            calls = args.score_calls
+            seconds, peak = measure(lambda: [rts.calculate_sanitized_score(movie_id) for _ in range(calls)], repeat=args.repeat, min_seconds=args.min_seconds)
+            record("calculate_sanitized_score", size, seconds, peak, calls)
+            seconds, peak = measure(lambda: [rts.display_analysis_results(movie_title) for _ in range(calls)], repeat=args.repeat, min_seconds=args.min_seconds)
+            record("display_analysis_results", size, seconds, peak, calls)
+
+        if args.analyze_size:
+            handler = type("Handler", (FakeDeepSeekHandler,), {"latency": args.latency / 1000, "lock": threading.Lock()})
+            server, base_url = start_stub_server(handler)
+            point_at_fake_deepseek(rts, base_url)
+            reviews = list(synthetic_reviews(args.analyze_size, random.Random(args.analyze_size)))
+            databases = itertools.count()
+
+            def fresh_movie():
+                use_temp_database(rts, tmp, f"suite_analyze_{next(databases)}.db")
+                return rts.save_reviews_to_db(reviews, "Synthetic Movie", "synthetic://suite"),
+
+            try:
+                seconds, peak = measure(rts.analyze_reviews_with_ai, fresh_movie, repeat=1)
+            finally:
+                server.shutdown()
+            record("analyze_reviews_with_ai", args.analyze_size, seconds, peak, args.analyze_size)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)['results']
+
+    # Memory below the floor is noise, so it can't fail the comparison
+    memory_floor = 1 << 20
+    regressions = []
+    print(f"\nAgainst {args.baseline} (tolerance {args.tolerance * 100:.0f}%):")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]
+        speed = result['items_per_second'] / before['items_per_second']
+        memory = max(result['peak_bytes'], memory_floor) / max(before['peak_bytes'], memory_floor)
+        flags = []
+        if speed < 1 - args.tolerance:
+            flags.append("slower")
+        if memory > 1 + args.tolerance:
+            flags.append("more memory")
+        print(f"  {key:<38} throughput {speed:5.2f}x, memory {memory:5.2f}x{'  <- ' + ', '.join(flags) if flags else ''}")
+        if flags:
+            regressions.append(key)
+
+    if regressions:
+        print(f"\nFAIL: regressions in {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nOK: no path regressed beyond the tolerance")
+
+def bench_plans(args):
+    import rt_review_sanitizer as rts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            rts.DB_NAME = args.db
+            rts.migrate_database()
+        else:
+            use_temp_database(rts, tmp, "plans.db")
+            fill_synthetic_reviews(rts, movies=20, reviews_per_movie=2000)
+            conn = sqlite3.connect(rts.DB_NAME)
+            conn.execute("ANALYZE")
+            conn.close()
+
+        conn = sqlite3.connect(rts.DB_NAME)
+        scans = rts.query_plan_scans(conn)
+        for name, (sql, params) in rts.PLANNED_QUERIES.items():
+            print(f"\n{name}:")
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                print(f"  {row[-1]}")
+        conn.close()
+
+    if scans:
+        print(f"\nFAIL: full table scans in {', '.join(scans)}")
+        sys.exit(1)
+    print("\nOK: no statement performs a full SCAN")
+
+if __name__ == "__main__":
+    os.environ.setdefault("DEEPSEEK_API_KEY", "benchmark")
+
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the RT review sanitizer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = subparsers.add_parser("parse", help="Compare review card parsing modes on saved HTML fixtures")
+    parse_parser.add_argument("--browser", action="store_true",
+                              help="Also load the fixtures in headless Chrome and time the Selenium paths")
+    parse_parser.add_argument("--repeat", type=int, default=5)
+    parse_parser.add_argument("--save-expected", action="store_true",
+                              help="Record the element parser's output (with --browser) as each fixture's expected reviews")
+    parse_parser.set_defaults(func=bench_parse)
+
+    api_parser = subparsers.add_parser("api", help="Page through the JSON review endpoint served by a local stub")
+    api_parser.add_argument("--latency", type=float, default=20, help="Stub server latency per request in ms")
+    api_parser.add_argument("--repeat", type=int, default=3)
+    api_parser.set_defaults(func=bench_api)
+
+    analyze_parser = subparsers.add_parser("analyze", help="Run AI analysis against a local fake DeepSeek server")
+    analyze_parser.add_argument("--engines", nargs="+", default=["threads", "async"], choices=["threads", "async"])
+    analyze_parser.add_argument("--latency", type=float, default=200, help="Fake API latency per request in ms")
+    analyze_parser.add_argument("--capacity", type=int, default=16, help="Concurrent requests before the fake API returns 429")
+    analyze_parser.add_argument("--rate-limit", type=float, default=0.1, help="Share of requests randomly rejected with 429")
+    analyze_parser.add_argument("--malformed", type=float, default=0.05,
+                                help="Share of requests answered with truncated JSON or no content")
+    analyze_parser.add_argument("--batch", action=argparse.BooleanOptionalAction, default=False,
+                                help="Pack several reviews per request")
+    analyze_parser.set_defaults(func=bench_analyze)
+
+    plans_parser = subparsers.add_parser("plans", help="Fail if a hot per-movie query plan contains a full SCAN")
+    plans_parser.add_argument("--db", help="Check (and migrate) an existing database instead of a synthetic one")
+    plans_parser.set_defaults(func=bench_plans)
+
+    duplicates_parser = subparsers.add_parser("duplicates", help="Time near-duplicate indexing on synthetic reviews with a campaign")
+    duplicates_parser.add_argument("--reviews", type=int, default=20000)
+    duplicates_parser.add_argument("--campaign", type=int, default=200, help="Near-identical copies mixed into the reviews")
+    duplicates_parser.set_defaults(func=bench_duplicates)
+
+    startup_parser = subparsers.add_parser("startup", help="Fail if a read-only CLI command imports too much at startup")
+    startup_parser.add_argument("--budget", type=float, default=300, help="Import time budget per command in ms")
+    startup_parser.add_argument("--repeat", type=int, default=3)
+    startup_parser.set_defaults(func=bench_startup)
+
+    suite_parser = subparsers.add_parser("suite", help="Time and trace memory of every hot path at several sizes, against a baseline")
+    suite_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Synthetic reviews per run")
+    suite_parser.add_argument("--max-parse-size", type=int, default=100000, help="Largest page to parse (about 1 KB per card)")
+    suite_parser.add_argument("--score-calls", type=int, default=200, help="Score lookups and result displays timed per size")
+    suite_parser.add_argument("--analyze-size", type=int, default=1000, help="Reviews sent to the fake DeepSeek server (0 to skip)")
+    suite_parser.add_argument("--latency", type=float, default=50, help="Fake API latency per request in ms")
+    suite_parser.add_argument("--repeat", type=int, default=3)
+    suite_parser.add_argument("--min-seconds", type=float, default=1.0, help="Keep repeating quick paths for this long")
+    suite_parser.add_argument("--baseline", default=SUITE_BASELINE_PATH)
+    suite_parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline instead of comparing")
+    suite_parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed throughput drop or memory growth")
+    suite_parser.set_defaults(func=bench_suite)
+
+    resume_parser = subparsers.add_parser("resume", help="Kill runs mid-scrape and mid-analysis, then check they resume")
+    resume_parser.add_argument("--crash-after-pages", type=int, default=3, help="Review pages saved before the first crash")
+    resume_parser.add_argument("--latency", type=float, default=200, help="Fake API latency per request in ms")
+    resume_parser.set_defaults(func=bench_resume)
+
+    export_parser = subparsers.add_parser("export", help="Score movies from exported columnar files vs. the SQLite paths")
+    export_parser.add_argument("--rows", type=int, default=1000000)
+    export_parser.add_argument("--movies", type=int, default=100)
+    export_parser.add_argument("--formats", nargs="+", default=["parquet", "arrow", "npy"], choices=["parquet", "arrow", "npy"])
+    export_parser.add_argument("--repeat", type=int, default=3)
+    export_parser.set_defaults(func=bench_export)
+
+    service_parser = subparsers.add_parser("service", help="Check coalescing, caching and refreshes of the HTTP service mode")
+    service_parser.add_argument("--clients", type=int, default=8, help="Concurrent requests for the same movie")
+    service_parser.add_argument("--page-latency", type=float, default=20, help="Stub review endpoint latency per page in ms")
+    service_parser.add_argument("--latency", type=float, default=50, help="Fake API latency per request in ms")
+    service_parser.set_defaults(func=bench_service)
+
+    trends_parser = subparsers.add_parser("trends", help="Time rolling-window scores and bomb-onset detection on dated reviews")
+    trends_parser.add_argument("--rows", type=int, default=200000)
+    trends_parser.add_argument("--movies", type=int, default=20)
+    trends_parser.add_argument("--days", type=int, default=365, help="Period the review dates are spread over")
+    trends_parser.add_argument("--bomb", type=int, default=60, help="Inauthentic reviews injected into one day of the first movie")
+    trends_parser.add_argument("--bomb-days-ago", type=int, default=100)
+    trends_parser.add_argument("--snapshots", type=int, default=30, help="Score snapshots recorded per movie")
+    trends_parser.add_argument("--repeat", type=int, default=3)
+    trends_parser.set_defaults(func=bench_trends)
+
+    stream_parser = subparsers.add_parser("stream", help="Compare scrape-then-analyze with the streamed pipeline")
+    stream_parser.add_argument("--page-latency", type=float, default=100, help="Stub review endpoint latency per page in ms")
+    stream_parser.add_argument("--latency", type=float, default=200, help="Fake API latency per request in ms")
+    stream_parser.set_defaults(func=bench_stream)
+
+    resume_child_parser = subparsers.add_parser("resume-child", help="A single run started by the resume benchmark")
+    resume_child_parser.add_argument("db")
+    resume_child_parser.add_argument("movie_url")
+    resume_child_parser.add_argument("deepseek_url")
+    resume_child_parser.add_argument("--crash-after-pages", type=int)
+    resume_child_parser.add_argument("--crash-after-flushes", type=int)
+    resume_child_parser.set_defaults(func=resume_child)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -1,47 +1,335 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from transformers import pipeline
+# selenium, transformers, openai, requests and tqdm are imported inside the stages that use them,
+# so read-only commands such as --show start without loading the scraping or AI stacks
+from html.parser import HTMLParser
 import sqlite3
 import time
+import math
 import re
 import hashlib
-from tqdm import tqdm
 from dotenv import load_dotenv
 import os
 import json
-from openai import OpenAI
+import asyncio
+import random
+from email.utils import parsedate_to_datetime
 import concurrent.futures
+import argparse
+import queue
+import threading
+import unicodedata
+import itertools
+import functools
+import atexit
+import uuid
+import shutil
+import importlib.util
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qs
+from http import HTTPStatus
 
 CHROMEDRIVER_PATH = "./chromedriver"
 DB_NAME = "final.db"
-SCROLL_PAUSE_TIME = 2
+PAGE_LOAD_TIMEOUT = 15
+LOAD_MORE_MIN_TIMEOUT = 2
+LOAD_MORE_MAX_TIMEOUT = 10
+NETWORK_IDLE_MS = 750
+MAX_STALLED_CLICKS = 2
 MAX_CLICKS = 50
 TARGET_REVIEWS = 300
+PARSE_MODE = "bulk"  # "bulk" (one execute_script), "html" (page_source) or "element"
 BASE_URL = "https://www.rottentomatoes.com/m/"
+SCRAPE_BACKEND = "api"  # "api" (paginated JSON endpoint, Selenium fallback) or "selenium"
+HTTP_TIMEOUT = 15
+HTTP_POOL_SIZE = 10
+BATCH_SCRAPE_WORKERS = 2
+BATCH_ANALYZE_WORKERS = 2
+DRIVER_POOL_SIZE = 2
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+DEEPSEEK_MODEL = "deepseek-chat"
+ANALYSIS_ENGINE = "async"  # "async" (AsyncOpenAI with adaptive concurrency) or "threads"
+ANALYSIS_INITIAL_CONCURRENCY = 4
+ANALYSIS_MAX_CONCURRENCY = 64
+ANALYSIS_MAX_ATTEMPTS = 6
+ANALYSIS_BACKOFF_BASE = 0.5
+ANALYSIS_BACKOFF_CAP = 30
+ANALYSIS_REQUEST_TIMEOUT = 60
+ANALYSIS_FAILED_REASONING = "API analysis failed."  # placeholder verdict stored by older versions when the API failed
+ANALYSIS_RETRY_REASONING = "Analysis failed, will retry"
+ANALYSIS_IN_PROGRESS_REASONING = "Analysis in progress"
+ANALYSIS_BATCH_MODE = True
+ANALYSIS_BATCH_TOKEN_BUDGET = 3000  # prompt tokens of review text per batched request
+ANALYSIS_MAX_OUTPUT_TOKENS = 4000
+ANALYSIS_OUTPUT_TOKENS_PER_REVIEW = 80
+VERDICT_CACHE_SIZE = 10000
+TRIAGE_MODE = "heuristic"  # "heuristic" (text features), "model" (local TRIAGE_MODEL classifier) or "off"
+TRIAGE_MODEL = None  # text-classification model whose labels are "authentic" and "inauthentic"
+TRIAGE_CONFIDENCE_THRESHOLD = 0.9  # reviews triaged with less confidence go to the API
+TRIAGE_BATCH_SIZE = 256
+TRIAGE_CONFIDENT_WORDS = 50  # below this length an "authentic" triage verdict loses confidence proportionally
+TRIAGE_SETTLE_AUTHENTIC = False  # also settle confident "authentic" verdicts locally; enable only once --triage-report shows they agree with the LLM
+DB_WRITE_BATCH_SIZE = 200
+SAVE_CHUNK_SIZE = 5000
+REVIEW_DATE_SLACK = 600  # seconds a card may be read before it is saved, allowed on top of the precision of its date
+DB_FLUSH_INTERVAL = 1.0
+DB_BUSY_TIMEOUT_MS = 30000
+ANALYSIS_LEASE_SECONDS = 120  # claims on pending reviews; the running writer renews its own every third of this
+NEAR_DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard similarity of the byte shingles
+NEAR_DUPLICATE_SHINGLE_SIZE = 5
+NEAR_DUPLICATE_MIN_CHARS = 40  # shorter reviews are too generic to count as copies of each other
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 4 rows per band: pairs above ~0.5 similarity usually share a bucket
+LSH_BUCKET_CANDIDATES = 50  # members read per bucket, so lookups stay cheap inside huge campaigns
+NEAR_DUPLICATE_INDEX_CHUNK = 5000
+STREAM_BUFFER_CHUNKS = 8  # pages or clicks buffered between scraper, database and analysis before the producer blocks
+STREAM_ANALYSIS_MIN_REVIEWS = 100  # saved reviews that start an analysis round while the scrape is still running
+PRUNE_PARSED_ROWS = False  # remove review rows from the page once they are parsed and saved (Selenium backend)
+EXPORT_FORMAT = "auto"  # "parquet" or "arrow" (need pyarrow), "npy", or "auto" for parquet when pyarrow is installed
+EXPORT_CHUNK_ROWS = 50000  # rows read from SQLite and written per batch while exporting
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_WORKERS = 4  # movies the service scrapes and analyzes at once
+SERVICE_RESULT_TTL = 6 * 3600  # seconds a computed score is served as fresh
+SERVICE_STALE_TTL = 24 * 3600  # further seconds it is still served, marked stale, while a refresh runs
+SERVICE_CACHE_SIZE = 1000  # movies whose results the service keeps in memory
+SERVICE_JOB_HISTORY = 1000  # finished jobs kept for status lookups
+SERVICE_MAX_WAIT = 300  # longest a /score request may wait for its job
+BOMB_BUCKET_SECONDS = 86400  # review dates older than a week are only known to the day
+BOMB_BASELINE_BUCKETS = 14  # trailing buckets whose mean inauthentic volume a spike is compared with
+BOMB_SPIKE_FACTOR = 3.0  # a bucket spikes when its inauthentic reviews exceed this multiple of the baseline
+BOMB_MIN_REVIEWS = 10  # ...and number at least this many
+BOMB_SPIKE_SIGMA = 5.0  # ...and sit this many Poisson standard deviations above the baseline, so quiet movies' noise doesn't spike
+BOMB_MIN_BASELINE_BUCKETS = 3  # a movie's first buckets have no history to compare with
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+RUN_ID = uuid.uuid4().hex  # owner of the analysis leases and run_ledger rows written by this process
 
 load_dotenv()
-deepseek_client = OpenAI(
-    api_key=os.getenv("DEEPSEEK_API_KEY"),
-    base_url="https://api.deepseek.com"
-)
+deepseek_client = None
+
+def get_deepseek_client():
+    global deepseek_client
+    if deepseek_client is None:
+        from openai import OpenAI
+
+        deepseek_client = OpenAI(
+            api_key=os.getenv("DEEPSEEK_API_KEY"),
+            base_url=DEEPSEEK_BASE_URL
+        )
+    return deepseek_client
 
 def get_thread_safe_connection():
     return sqlite3.connect(DB_NAME, check_same_thread=False)
 
+def get_writer_connection():
+    # WAL lets readers keep going during writes; synchronous=NORMAL skips the fsync per commit
+    # but still never corrupts the database, and a commit survives anything short of power loss
+    conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    return conn
+
 def generate_review_hash(review_text, username, date, movie_id):
     unique_string = f"{review_text[:100]}_{username}_{date}_{movie_id}"
     return hashlib.md5(unique_string.encode()).hexdigest()
 
-def setup_ai_analysis_table():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+def review_row_hash(review_text, username, created_at, date, movie_id):
+    # Only catches exact repeats; a review re-scraped with a different card age is matched by insert_reviews
+    # within the precision of its date instead
+    return generate_review_hash(review_text, username, date if created_at is None else created_at, movie_id)
+
+# (label, lower bound) from best to worst; a review falls in the first bucket whose bound it reaches
+QUALITY_BUCKETS = [
+    ('Excellent (90-100%)', 0.9),
+    ('Good (70-89%)', 0.7),
+    ('Fair (50-69%)', 0.5),
+    ('Poor (30-49%)', 0.3),
+    ('Very Poor (10-29%)', None),
+]
+
+# Running sums kept per movie in movie_scores, as each row's contribution in terms of {r} (star rating),
+# {q} (AI quality score) and {a} (is_authentic). The same expressions drive the triggers that maintain
+# the table incrementally and the from-scratch rebuild used by check_movie_scores.
+# Reviews still waiting for (or retrying) analysis have a NULL quality score and only count towards the RT score.
+REVIEW_SCORE_COLUMNS = {
+    'rated_reviews': "CASE WHEN {r} IS NOT NULL THEN 1 ELSE 0 END",
+    'fresh_reviews': "CASE WHEN {r} >= 3.5 THEN 1 ELSE 0 END",
+}
+
+def quality_bucket_condition(index):
+    conditions = ["{q} IS NOT NULL"]
+    lower = QUALITY_BUCKETS[index][1]
+    upper = QUALITY_BUCKETS[index - 1][1] if index else None
+    if lower is not None:
+        conditions.append(f"{{q}} >= {lower}")
+    if upper is not None:
+        conditions.append(f"{{q}} < {upper}")
+    return " AND ".join(conditions)
+
+def analysis_score_columns():
+    # Inauthentic reviews weigh 0 in the sanitized score; everyone else weighs their quality score
+    columns = {
+        'analyzed_reviews': "CASE WHEN {q} IS NOT NULL THEN 1 ELSE 0 END",
+        'analyzed_rated_reviews': "CASE WHEN {q} IS NOT NULL AND {r} IS NOT NULL THEN 1 ELSE 0 END",
+        'analyzed_rating_sum': "CASE WHEN {q} IS NOT NULL AND {r} IS NOT NULL THEN {r} ELSE 0 END",
+        'quality_sum': "COALESCE({q}, 0)",
+        'authentic_count': "CASE WHEN {q} IS NOT NULL AND {a} THEN 1 ELSE 0 END",
+        'inauthentic_count': "CASE WHEN {q} IS NOT NULL AND NOT {a} THEN 1 ELSE 0 END",
+        'total_weight': "CASE WHEN {q} IS NOT NULL AND {a} AND {r} IS NOT NULL THEN {q} ELSE 0 END",
+        'weighted_sum': "CASE WHEN {q} IS NOT NULL AND {a} AND {r} IS NOT NULL THEN {q} * {r} ELSE 0 END",
+    }
+    for index in range(len(QUALITY_BUCKETS)):
+        condition = quality_bucket_condition(index)
+        columns[f'bucket_{index}_count'] = f"CASE WHEN {condition} THEN 1 ELSE 0 END"
+        columns[f'bucket_{index}_quality_sum'] = f"CASE WHEN {condition} THEN {{q}} ELSE 0 END"
+    return columns
+
+ANALYSIS_SCORE_COLUMNS = analysis_score_columns()
+MOVIE_SCORE_COLUMNS = list(REVIEW_SCORE_COLUMNS) + list(ANALYSIS_SCORE_COLUMNS)
+
+def movie_scores_rebuild_query(where=""):
+    sums = [f"SUM({expr.format(r='r.original_rating')})" for expr in REVIEW_SCORE_COLUMNS.values()]
+    sums += [f"SUM({expr.format(q='a.quality_score', a='a.is_authentic', r='r.original_rating')})"
+             for expr in ANALYSIS_SCORE_COLUMNS.values()]
+    return f'''
+        SELECT r.movie_id, {", ".join(sums)}
+        FROM reviews r
+        LEFT JOIN ai_analysis a ON r.id = a.review_id
+        {where}
+        GROUP BY r.movie_id
+    '''
+
+def movie_scores_trigger(name, event, table, movie_id, columns, new=None, old=None):
+    # new/old are the {q, a, r} (and from version 4, {d}) bindings of the row after/before the change
+    assignments = []
+    for column, expr in columns.items():
+        delta = ""
+        if new:
+            delta += f" + ({expr.format(**new)})"
+        if old:
+            delta += f" - ({expr.format(**old)})"
+        assignments.append(f"{column} = {column}{delta}")
+    return f'''
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table}
+        BEGIN
+            INSERT OR IGNORE INTO movie_scores (movie_id) VALUES ({movie_id});
+            UPDATE movie_scores SET {", ".join(assignments)} WHERE movie_id = {movie_id};
+        END
+    '''
+
+def movie_scores_migration():
+    new_analysis = {'q': 'NEW.quality_score', 'a': 'NEW.is_authentic',
+                    'r': '(SELECT original_rating FROM reviews WHERE id = NEW.review_id)'}
+    old_analysis = {'q': 'OLD.quality_score', 'a': 'OLD.is_authentic',
+                    'r': '(SELECT original_rating FROM reviews WHERE id = OLD.review_id)'}
+    column_defs = ", ".join(f"{column} {'REAL' if column.endswith(('_sum', '_weight')) else 'INTEGER'} NOT NULL DEFAULT 0"
+                            for column in MOVIE_SCORE_COLUMNS)
+    return [
+        f"CREATE TABLE IF NOT EXISTS movie_scores (movie_id INTEGER PRIMARY KEY REFERENCES movies (id), {column_defs})",
+        movie_scores_trigger("movie_scores_review_insert", "INSERT", "reviews", "NEW.movie_id",
+                             REVIEW_SCORE_COLUMNS, new={'r': 'NEW.original_rating'}),
+        movie_scores_trigger("movie_scores_review_delete", "DELETE", "reviews", "OLD.movie_id",
+                             REVIEW_SCORE_COLUMNS, old={'r': 'OLD.original_rating'}),
+        movie_scores_trigger("movie_scores_analysis_insert", "INSERT", "ai_analysis", "NEW.movie_id",
+                             ANALYSIS_SCORE_COLUMNS, new=new_analysis),
+        movie_scores_trigger("movie_scores_analysis_update", "UPDATE OF is_authentic, quality_score", "ai_analysis",
+                             "NEW.movie_id", ANALYSIS_SCORE_COLUMNS, new=new_analysis, old=old_analysis),
+        movie_scores_trigger("movie_scores_analysis_delete", "DELETE", "ai_analysis", "OLD.movie_id",
+                             ANALYSIS_SCORE_COLUMNS, old=old_analysis),
+        f"INSERT OR REPLACE INTO movie_scores (movie_id, {', '.join(MOVIE_SCORE_COLUMNS)}) {movie_scores_rebuild_query()}",
+    ]
+
+# Schema version 4 tracks near-duplicates: it counts them and gives them no weight in the sanitized score,
+# so a copy-paste campaign counts once; {d} is the review's near_duplicate_of. These are the columns of the
+# current movie_scores table, used by every query that reads or rebuilds it; the version 3 definitions
+# above stay exactly as that migration applied them.
+NEAR_DUPLICATE_REVIEW_SCORE_COLUMNS = {
+    **REVIEW_SCORE_COLUMNS,
+    'near_duplicate_reviews': "CASE WHEN {d} IS NOT NULL THEN 1 ELSE 0 END",
+}
+NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS = {
+    **ANALYSIS_SCORE_COLUMNS,
+    'total_weight': "CASE WHEN {q} IS NOT NULL AND {a} AND {r} IS NOT NULL AND {d} IS NULL THEN {q} ELSE 0 END",
+    'weighted_sum': "CASE WHEN {q} IS NOT NULL AND {a} AND {r} IS NOT NULL AND {d} IS NULL THEN {q} * {r} ELSE 0 END",
+}
+SCORE_COLUMNS = list(NEAR_DUPLICATE_REVIEW_SCORE_COLUMNS) + list(NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS)
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ai_analysis (
+def review_score_terms():
+    # Each review's contribution to the movie_scores columns, over reviews r LEFT JOIN ai_analysis a
+    return ([expr.format(r='r.original_rating', d='r.near_duplicate_of')
+             for expr in NEAR_DUPLICATE_REVIEW_SCORE_COLUMNS.values()]
+            + [expr.format(q='a.quality_score', a='a.is_authentic', r='r.original_rating', d='r.near_duplicate_of')
+               for expr in NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS.values()])
+
+def score_rebuild_query(where=""):
+    sums = [f"SUM({term})" for term in review_score_terms()]
+    return f'''
+        SELECT r.movie_id, {", ".join(sums)}
+        FROM reviews r
+        LEFT JOIN ai_analysis a ON r.id = a.review_id
+        {where}
+        GROUP BY r.movie_id
+    '''
+
+MOVIE_SCORES_TRIGGERS = ["movie_scores_review_insert", "movie_scores_review_delete", "movie_scores_review_duplicate",
+                         "movie_scores_analysis_insert", "movie_scores_analysis_update", "movie_scores_analysis_delete"]
+
+def near_duplicate_scores_migration():
+    review_columns, analysis_columns = NEAR_DUPLICATE_REVIEW_SCORE_COLUMNS, NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS
+
+    def analysis_row(row):
+        return {'q': f'{row}.quality_score', 'a': f'{row}.is_authentic',
+                'r': f'(SELECT original_rating FROM reviews WHERE id = {row}.review_id)',
+                'd': f'(SELECT near_duplicate_of FROM reviews WHERE id = {row}.review_id)'}
+
+    def review_row(row):
+        return {'q': f'(SELECT quality_score FROM ai_analysis WHERE review_id = {row}.id)',
+                'a': f'(SELECT is_authentic FROM ai_analysis WHERE review_id = {row}.id)',
+                'r': f'{row}.original_rating', 'd': f'{row}.near_duplicate_of'}
+
+    column_defs = ", ".join(f"{column} {'REAL' if column.endswith(('_sum', '_weight')) else 'INTEGER'} NOT NULL DEFAULT 0"
+                            for column in SCORE_COLUMNS)
+    # Marking or unmarking a near-duplicate moves its weight in or out of the sanitized score
+    duplicate_columns = {column: expr for column, expr in {**review_columns, **analysis_columns}.items()
+                         if '{d}' in expr}
+    return [
+        f"CREATE TABLE IF NOT EXISTS movie_scores (movie_id INTEGER PRIMARY KEY REFERENCES movies (id), {column_defs})",
+        movie_scores_trigger("movie_scores_review_insert", "INSERT", "reviews", "NEW.movie_id",
+                             review_columns, new=review_row('NEW')),
+        movie_scores_trigger("movie_scores_review_delete", "DELETE", "reviews", "OLD.movie_id",
+                             review_columns, old=review_row('OLD')),
+        movie_scores_trigger("movie_scores_analysis_insert", "INSERT", "ai_analysis", "NEW.movie_id",
+                             analysis_columns, new=analysis_row('NEW')),
+        movie_scores_trigger("movie_scores_analysis_update", "UPDATE OF is_authentic, quality_score", "ai_analysis",
+                             "NEW.movie_id", analysis_columns, new=analysis_row('NEW'), old=analysis_row('OLD')),
+        movie_scores_trigger("movie_scores_analysis_delete", "DELETE", "ai_analysis", "OLD.movie_id",
+                             analysis_columns, old=analysis_row('OLD')),
+        movie_scores_trigger("movie_scores_review_duplicate", "UPDATE OF near_duplicate_of", "reviews",
+                             "NEW.movie_id", duplicate_columns, new=review_row('NEW'), old=review_row('OLD')),
+        f"INSERT OR REPLACE INTO movie_scores (movie_id, {', '.join(SCORE_COLUMNS)}) {score_rebuild_query()}",
+    ]
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version). Append new
+# migrations to the end and never edit applied ones. Version 1 uses IF NOT EXISTS so databases
+# created before migrations existed are upgraded in place.
+SCHEMA_MIGRATIONS = [
+    [
+        '''CREATE TABLE IF NOT EXISTS movies
+           (id INTEGER PRIMARY KEY,
+            title TEXT UNIQUE,
+            rt_url TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS reviews
+           (id INTEGER PRIMARY KEY,
+            movie_id INTEGER,
+            review_text TEXT NOT NULL,
+            original_rating REAL,
+            review_type TEXT,
+            username TEXT,
+            date TEXT,
+            review_hash TEXT UNIQUE,  -- Add this column for deduplication
+            FOREIGN KEY (movie_id) REFERENCES movies (id))''',
+        '''CREATE TABLE IF NOT EXISTS ai_analysis (
             review_id INTEGER PRIMARY KEY,
             movie_id INTEGER,
             is_authentic BOOLEAN,
@@ -50,35 +338,219 @@ def setup_ai_analysis_table():
             analysis_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (review_id) REFERENCES reviews (id),
             FOREIGN KEY (movie_id) REFERENCES movies (id)
-        )
-    ''')
-    conn.commit()
+        )''',
+        '''CREATE TABLE IF NOT EXISTS verdict_cache (
+            text_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            is_authentic BOOLEAN,
+            quality_score REAL,
+            reasoning TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (text_hash, model, prompt_version)
+        )''',
+    ],
+    [
+        # Covering indexes for the per-movie score, summary and pending-analysis queries
+        "CREATE INDEX IF NOT EXISTS idx_reviews_movie_rating ON reviews (movie_id, original_rating)",
+        "CREATE INDEX IF NOT EXISTS idx_ai_analysis_movie ON ai_analysis (movie_id, is_authentic, quality_score)",
+        "ANALYZE",
+    ],
+    # Incrementally maintained per-movie score aggregates, filled from the existing rows
+    movie_scores_migration(),
+    [
+        # MinHash signatures and LSH buckets for near-duplicate detection; cluster_id is shared by every
+        # near-duplicate of a review, across movies. A review whose movie already has an earlier member of
+        # its cluster points at that representative through near_duplicate_of.
+        "ALTER TABLE reviews ADD COLUMN near_duplicate_of INTEGER",
+        '''CREATE TABLE IF NOT EXISTS review_signatures (
+            review_id INTEGER PRIMARY KEY REFERENCES reviews (id),
+            movie_id INTEGER NOT NULL,
+            cluster_id INTEGER,
+            signature BLOB
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_review_signatures_cluster ON review_signatures (cluster_id, movie_id, review_id)",
+        '''CREATE TABLE IF NOT EXISTS review_lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            review_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, review_id)
+        ) WITHOUT ROWID''',
+        # movie_scores is recreated with near-duplicate aware triggers
+        *(f"DROP TRIGGER IF EXISTS {name}" for name in MOVIE_SCORES_TRIGGERS),
+        "DROP TABLE IF EXISTS movie_scores",
+        *near_duplicate_scores_migration(),
+    ],
+    [
+        # Analysis claims expire, so rows held by a crashed run are picked up again once its lease runs out
+        "ALTER TABLE ai_analysis ADD COLUMN lease_owner TEXT",
+        "ALTER TABLE ai_analysis ADD COLUMN lease_expires_at REAL",
+        # The latest run per movie: the stage it reached, where scraping resumes and the seconds spent per stage
+        '''CREATE TABLE IF NOT EXISTS run_ledger (
+            movie_id INTEGER PRIMARY KEY REFERENCES movies (id),
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            backend TEXT,
+            cursor TEXT,
+            reviews_loaded INTEGER NOT NULL DEFAULT 0,
+            reviews_saved INTEGER NOT NULL DEFAULT 0,
+            reviews_analyzed INTEGER NOT NULL DEFAULT 0,
+            stage_seconds TEXT NOT NULL DEFAULT '{}',
+            error TEXT,
+            started_at REAL,
+            stage_started_at REAL,
+            updated_at REAL,
+            finished_at REAL
+        )''',
+    ],
+    [
+        # Review dates as epoch seconds, normalized at ingest. Rows saved before this kept only the relative
+        # card text ("2d", "Jan 5"), so they are dated from when they were claimed for analysis, which follows
+        # the scrape (or from now if they never were).
+        "ALTER TABLE reviews ADD COLUMN created_at REAL",
+        '''UPDATE reviews SET created_at = review_timestamp(date, (
+            SELECT CAST(strftime('%s', analysis_time) AS REAL) FROM ai_analysis WHERE review_id = reviews.id))''',
+        # Covers the rolling-window and bomb-onset range scans apart from the ai_analysis lookups
+        "CREATE INDEX IF NOT EXISTS idx_reviews_movie_created ON reviews (movie_id, created_at, original_rating, near_duplicate_of)",
+        # The scores each run ended with, so a movie's score history can be read back by time range
+        '''CREATE TABLE IF NOT EXISTS score_snapshots (
+            movie_id INTEGER NOT NULL REFERENCES movies (id),
+            taken_at REAL NOT NULL,
+            run_id TEXT NOT NULL,
+            rt_score REAL,
+            sanitized_score REAL,
+            rated_reviews INTEGER NOT NULL,
+            analyzed_reviews INTEGER NOT NULL,
+            authentic_count INTEGER NOT NULL,
+            inauthentic_count INTEGER NOT NULL,
+            near_duplicate_reviews INTEGER NOT NULL,
+            PRIMARY KEY (movie_id, taken_at)
+        ) WITHOUT ROWID''',
+    ],
+    [
+        # Earlier threaded runs stored a placeholder verdict when the API failed; make those reviews
+        # retryable so they stop counting as inauthentic and are analyzed again next run
+        f'''UPDATE ai_analysis SET is_authentic = NULL, quality_score = NULL, reasoning = '{ANALYSIS_RETRY_REASONING}',
+                   lease_owner = NULL, lease_expires_at = NULL
+            WHERE reasoning = '{ANALYSIS_FAILED_REASONING}'
+        ''',
+    ],
+    [
+        # Review hashes covered the card date, so a recent review re-scraped once its age read differently
+        # ("3h", then "1d") was saved again. Reviews now record how far their created_at can be off, and two
+        # rows of a movie with the same user and text whose times agree within that are the same review:
+        # later copies are dropped along with their analysis (the movie_scores triggers subtract them).
+        # A dropped copy's signature moves to the kept row if that has none, clusters it labelled are
+        # relabelled by a surviving member, and near_duplicate_of is recomputed for the affected clusters.
+        "ALTER TABLE reviews ADD COLUMN created_at_precision REAL",
+        "UPDATE reviews SET created_at_precision = review_date_precision(date) WHERE created_at IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS idx_reviews_identity ON reviews (movie_id, username, created_at)",
+        f'''CREATE TEMP TABLE review_matches AS
+           SELECT r.id, (SELECT MIN(k.id) FROM reviews k
+                         WHERE k.movie_id = r.movie_id AND k.username = r.username AND k.id < r.id
+                           AND ABS(k.created_at - r.created_at) <= k.created_at_precision + r.created_at_precision + {REVIEW_DATE_SLACK}
+                           AND substr(k.review_text, 1, 100) = substr(r.review_text, 1, 100)) AS kept_id
+           FROM reviews r WHERE r.created_at IS NOT NULL''',
+        "DELETE FROM review_matches WHERE kept_id IS NULL",
+        # A copy can match one that is itself dropped; follow the matches back to the earliest row
+        '''CREATE TEMP TABLE dropped_reviews AS
+           WITH RECURSIVE chain (id, kept_id) AS (
+               SELECT id, kept_id FROM review_matches
+               UNION
+               SELECT chain.id, m.kept_id FROM chain JOIN review_matches m ON m.id = chain.kept_id)
+           SELECT id, MIN(kept_id) AS kept_id FROM chain GROUP BY id''',
+        "CREATE UNIQUE INDEX temp.idx_dropped_reviews ON dropped_reviews (id, kept_id)",
+        '''CREATE TEMP TABLE moved_signatures AS
+           SELECT MIN(d.id) AS id, d.kept_id FROM dropped_reviews d
+           JOIN review_signatures s ON s.review_id = d.id
+           WHERE NOT EXISTS (SELECT 1 FROM review_signatures k WHERE k.review_id = d.kept_id)
+           GROUP BY d.kept_id''',
+        '''UPDATE review_signatures SET review_id = (SELECT kept_id FROM moved_signatures WHERE id = review_signatures.review_id)
+           WHERE review_id IN (SELECT id FROM moved_signatures)''',
+        '''UPDATE review_lsh_buckets SET review_id = (SELECT kept_id FROM moved_signatures WHERE id = review_lsh_buckets.review_id)
+           WHERE review_id IN (SELECT id FROM moved_signatures)''',
+        '''CREATE TEMP TABLE cluster_relabels AS
+           SELECT cluster_id AS old_id, MIN(review_id) AS new_id FROM review_signatures
+           WHERE cluster_id IN (SELECT id FROM dropped_reviews) AND review_id NOT IN (SELECT id FROM dropped_reviews)
+           GROUP BY cluster_id''',
+        '''UPDATE review_signatures SET cluster_id = (SELECT new_id FROM cluster_relabels WHERE old_id = review_signatures.cluster_id)
+           WHERE cluster_id IN (SELECT old_id FROM cluster_relabels)''',
+        '''CREATE TEMP TABLE affected_clusters AS
+           SELECT DISTINCT cluster_id FROM review_signatures
+           WHERE cluster_id IS NOT NULL AND review_id IN (SELECT id FROM dropped_reviews UNION SELECT kept_id FROM dropped_reviews)''',
+        "DELETE FROM ai_analysis WHERE review_id IN (SELECT id FROM dropped_reviews)",
+        "DELETE FROM review_lsh_buckets WHERE review_id IN (SELECT id FROM dropped_reviews)",
+        "DELETE FROM review_signatures WHERE review_id IN (SELECT id FROM dropped_reviews)",
+        # Each movie's earliest member of a cluster is its representative, as in assign_cluster_representatives
+        '''UPDATE reviews SET near_duplicate_of = (
+               SELECT NULLIF(MIN(o.review_id), reviews.id) FROM review_signatures s
+               JOIN review_signatures o ON o.cluster_id = s.cluster_id AND o.movie_id = s.movie_id
+               WHERE s.review_id = reviews.id)
+           WHERE id IN (SELECT review_id FROM review_signatures WHERE cluster_id IN (SELECT cluster_id FROM affected_clusters))
+              OR near_duplicate_of IN (SELECT id FROM dropped_reviews)''',
+        "DELETE FROM reviews WHERE id IN (SELECT id FROM dropped_reviews)",
+        "UPDATE reviews SET review_hash = review_hash(review_text, username, created_at, date, movie_id)",
+        *(f"DROP TABLE temp.{name}" for name in ('affected_clusters', 'cluster_relabels', 'moved_signatures',
+                                                 'dropped_reviews', 'review_matches')),
+    ],
+]
+
+migrated_databases = set()
+
+def migrate_database():
+    # Checked once per database per process; long-running callers set up before every analysis
+    if DB_NAME in migrated_databases and os.path.exists(DB_NAME):
+        return
+    conn = sqlite3.connect(DB_NAME, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.create_function("review_timestamp", 2, parse_review_timestamp)
+    conn.create_function("review_hash", 5, review_row_hash)
+    conn.create_function("review_date_precision", 1, review_date_precision)
+
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= len(SCHEMA_MIGRATIONS):
+            migrated_databases.add(DB_NAME)
+            return
+
+        for version, statements in enumerate(SCHEMA_MIGRATIONS, start=1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock in case another process migrated first
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.execute("ROLLBACK")
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"Upgraded database schema to version {version}.")
+        migrated_databases.add(DB_NAME)
+    finally:
+        conn.close()
+
+def schema_is_current():
+    # Read-only check, so commands that only read scores never create or upgrade the database
+    if not os.path.exists(DB_NAME):
+        return False
+    conn = sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
     conn.close()
+    return version >= len(SCHEMA_MIGRATIONS)
+
+def setup_ai_analysis_table():
+    migrate_database()
     print("AI analysis table ready!")
 
-def setup_database():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS movies
-                 (id INTEGER PRIMARY KEY,
-                  title TEXT UNIQUE,
-                  rt_url TEXT)''')
-    
-    c.execute('''CREATE TABLE IF NOT EXISTS reviews
-                 (id INTEGER PRIMARY KEY,
-                  movie_id INTEGER,
-                  review_text TEXT NOT NULL,
-                  original_rating REAL,
-                  review_type TEXT,
-                  username TEXT,
-                  date TEXT,
-                  review_hash TEXT UNIQUE,  -- Add this column for deduplication
-                  FOREIGN KEY (movie_id) REFERENCES movies (id))''')
-    
-    conn.commit()
-    conn.close()
+def setup_verdict_cache_table():
+    migrate_database()
 
-    setup_ai_analysis_table()
+def setup_database():
+    migrate_database()
+    print("AI analysis table ready!")
     print("Database setup complete.")
 
 def get_movie_url():
@@ -88,67 +560,504 @@ def get_movie_url():
         print("Error: Movie title cannot be empty")
         return None, None
     
+    return movie_title, build_movie_url(movie_title)
+
+def build_movie_url(movie_title):
     url = movie_title.lower().replace(' ', '_')
     url = re.sub(r'[^a-z0-9_]', '', url)
 
-    movie_url = f"{BASE_URL}{url}/reviews?type=user"
-    return movie_title, movie_url
+    return f"{BASE_URL}{url}/reviews?type=user"
 
-def scrape_reviews(movie_url):
-    if not movie_url:
-        print("Error: Invalid movie URL provided")
+def read_titles_file(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+PAGE_READY_SCRIPT = """
+return document.readyState === 'complete' && (
+    document.querySelector('div.audience-review-row, div.load-more-container rt-button') !== null ||
+    document.body.innerText.toLowerCase().indexOf('sorry, please try again later') !== -1
+);
+"""
+
+# Returns [review rows (including rows pruned after parsing), requests in flight, ms since the network was
+# last active]. Resource timing entries only appear once a request completes, so on first use fetch and XHR
+# are wrapped to count the requests still pending; completed entries are folded into the last activity time
+# and cleared, so the browser's resource timing buffer never fills up.
+REVIEW_LOAD_STATE_SCRIPT = """
+var net = window.rtsNetwork;
+if (!net) {
+    net = window.rtsNetwork = {pending: 0, last: performance.now()};
+    var settle = function () {
+        net.pending = Math.max(0, net.pending - 1);
+        net.last = performance.now();
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            net.pending++;
+            net.last = performance.now();
+            try {
+                return fetch.apply(this, arguments).finally(settle);
+            } catch (e) {
+                settle();
+                throw e;
+            }
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.pending++;
+        net.last = performance.now();
+        this.addEventListener('loadend', settle);
+        try {
+            return send.apply(this, arguments);
+        } catch (e) {
+            this.removeEventListener('loadend', settle);
+            settle();
+            throw e;
+        }
+    };
+}
+var entries = performance.getEntriesByType('resource');
+for (var i = 0; i < entries.length; i++) {
+    net.last = Math.max(net.last, entries[i].responseEnd);
+}
+performance.clearResourceTimings();
+var count = document.querySelectorAll('div.audience-review-row').length + (window.rtsPrunedRows || 0);
+return [count, net.pending, performance.now() - net.last];
+"""
+
+# Removes the first arguments[0] review rows, which have already been parsed, and counts them as pruned
+PRUNE_REVIEW_ROWS_SCRIPT = """
+var rows = Array.from(document.querySelectorAll('div.audience-review-row')).slice(0, arguments[0]);
+rows.forEach(function (row) { row.remove(); });
+window.rtsPrunedRows = (window.rtsPrunedRows || 0) + rows.length;
+return rows.length;
+"""
+
+def percentile(values, pct):
+    if not values:
         return None
-    
-    print("Launching browser...")
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+class ClickLatencyStats:
+    def __init__(self):
+        self.latencies = []
+        self.outcomes = {'grew': 0, 'idle': 0, 'timeout': 0}
+
+    def record(self, seconds, outcome):
+        self.latencies.append(seconds)
+        self.outcomes[outcome] += 1
+        metrics.observe('scrape_click', seconds)
+
+    def adaptive_timeout(self):
+        # Allow a few times the recent p95 click latency, within fixed bounds
+        if not self.latencies:
+            return LOAD_MORE_MAX_TIMEOUT
+        recent_p95 = percentile(self.latencies[-10:], 95)
+        return min(LOAD_MORE_MAX_TIMEOUT, max(LOAD_MORE_MIN_TIMEOUT, recent_p95 * 3))
+
+    def summary(self):
+        return {
+            'clicks': len(self.latencies),
+            'total_wait': sum(self.latencies),
+            'mean': sum(self.latencies) / len(self.latencies) if self.latencies else None,
+            'p50': percentile(self.latencies, 50),
+            'p95': percentile(self.latencies, 95),
+            'max': max(self.latencies) if self.latencies else None,
+            **self.outcomes
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        if not stats['clicks']:
+            return
+        print(f"'Load More' wait: {stats['total_wait']:.1f}s over {stats['clicks']} clicks "
+              f"(mean {stats['mean']:.2f}s, p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s; "
+              f"{stats['grew']} grew, {stats['idle']} idle, {stats['timeout']} timed out)")
+
+# Stages timed by PipelineMetrics; nested stages (e.g. a save inside scrape) are subtracted from their parent's self time
+METRIC_STAGES = ('scrape', 'parse', 'save', 'near_duplicates', 'triage', 'analyze', 'score', 'export')
+
+class StageTimer:
+    def __init__(self, metrics, name, items=0):
+        self.metrics = metrics
+        self.name = name
+        self.items = items
+        self.child_seconds = 0.0
+        self.child_peak = 0
+        self.profiler = None
+
+    def __enter__(self):
+        stack = self.metrics.stage_stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        if self.metrics.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.traced_at_entry = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.profiler = self.metrics.start_profiler(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        if self.profiler:
+            self.metrics.stop_profiler(self.name)
+        self.metrics.stage_stack().pop()
+        peak = None
+        if self.metrics.trace_memory:
+            import tracemalloc
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+        if self.parent:
+            self.parent.child_seconds += seconds
+            if peak is not None:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+        self.metrics.record_stage(self.name, seconds, seconds - self.child_seconds, self.items,
+                                  None if peak is None else peak - self.traced_at_entry)
+
+class PipelineMetrics:
+    # Process-wide wall time per stage, latency samples, and counters for tokens, retries and commits.
+    # Optionally profiles chosen stages with cProfile and tracks their peak memory with tracemalloc.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.latencies = {}
+        self.counters = {}
+        self.profile_stages = set()
+        self.profilers = {}
+        self.active_profile = None
+        self.trace_memory = False
+
+    def stage(self, name, items=0):
+        return StageTimer(self, name, items)
+
+    def stage_stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def observe(self, name, seconds):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_stage(self, name, seconds, self_seconds, items, peak_bytes):
+        with self.lock:
+            stage = self.stages.setdefault(name, {'calls': 0, 'items': 0, 'wall_seconds': 0.0, 'self_seconds': 0.0})
+            stage['calls'] += 1
+            stage['items'] += items or 0
+            stage['wall_seconds'] += seconds
+            stage['self_seconds'] += self_seconds
+            if peak_bytes is not None:
+                stage['peak_traced_bytes'] = max(stage.get('peak_traced_bytes', 0), peak_bytes)
+            self.latencies.setdefault(f"stage_{name}", []).append(seconds)
+
+    def start_profiler(self, name):
+        # cProfile allows one active profiler per process, so a stage nested in a profiled one isn't profiled
+        if name not in self.profile_stages:
+            return None
+        with self.lock:
+            if self.active_profile is not None:
+                return None
+            if name not in self.profilers:
+                import cProfile
+                self.profilers[name] = cProfile.Profile()
+            self.active_profile = name
+        self.profilers[name].enable()
+        return self.profilers[name]
+
+    def stop_profiler(self, name):
+        self.profilers[name].disable()
+        with self.lock:
+            self.active_profile = None
+
+    def report(self, profile_dir="."):
+        import pstats
+
+        with self.lock:
+            stages = {name: dict(stage, items_per_second=stage['items'] / stage['wall_seconds'] if stage['wall_seconds'] else None)
+                      for name, stage in self.stages.items()}
+            latencies = {}
+            for name, values in self.latencies.items():
+                latencies[name] = {
+                    'count': len(values), 'sum': sum(values), 'mean': sum(values) / len(values),
+                    'p50': percentile(values, 50), 'p95': percentile(values, 95), 'p99': percentile(values, 99),
+                    'max': max(values)
+                }
+            counters = dict(self.counters)
+
+        for name, profiler in self.profilers.items():
+            path = os.path.join(profile_dir, f"profile-{name}.prof")
+            profiler.dump_stats(path)
+            stats = pstats.Stats(profiler)
+            top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:15]
+            stages.setdefault(name, {})['profile'] = {
+                'path': path,
+                'top_cumulative': [{'function': f"{file}:{line}({function})", 'calls': calls, 'cumulative_seconds': cumulative}
+                                   for (file, line, function), (_, calls, _, cumulative, _) in top]
+            }
+
+        return {
+            'run_id': RUN_ID,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            'wall_seconds': time.perf_counter() - self.start,
+            'stages': stages,
+            'latencies': latencies,
+            'counters': counters,
+        }
+
+    def write_json(self, path, report=None):
+        report = report or self.report(os.path.dirname(path) or ".")
+        write_file_atomically(path, json.dumps(report, indent=2))
+
+    def write_prometheus(self, path, report=None):
+        # Text exposition format, e.g. for node_exporter's textfile collector
+        report = report or self.report(os.path.dirname(path) or ".")
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP rt_sanitizer_{name} {help_text}")
+            lines.append(f"# TYPE rt_sanitizer_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"rt_sanitizer_{name}{{{label_text}}} {value}" if label_text else f"rt_sanitizer_{name} {value}")
+
+        stages = report['stages'].items()
+        metric('stage_seconds_total', 'counter', "Wall time spent in each stage, nested stages included.",
+               [({'stage': name}, stage.get('wall_seconds', 0)) for name, stage in stages])
+        metric('stage_self_seconds_total', 'counter', "Wall time spent in each stage outside nested stages.",
+               [({'stage': name}, stage.get('self_seconds', 0)) for name, stage in stages])
+        metric('stage_calls_total', 'counter', "Times each stage ran.",
+               [({'stage': name}, stage.get('calls', 0)) for name, stage in stages])
+        metric('stage_items_total', 'counter', "Reviews handled by each stage.",
+               [({'stage': name}, stage.get('items', 0)) for name, stage in stages])
+        traced = [({'stage': name}, stage['peak_traced_bytes']) for name, stage in stages if 'peak_traced_bytes' in stage]
+        if traced:
+            metric('stage_peak_traced_bytes', 'gauge', "Peak memory allocated during a stage, from tracemalloc.", traced)
+
+        samples = []
+        for name, summary in report['latencies'].items():
+            samples += [({'name': name, 'quantile': quantile}, summary[key])
+                        for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99'))]
+        metric('latency_seconds', 'summary', "Latency of individual clicks, API calls, commits and stage calls.", samples)
+        lines += [f'rt_sanitizer_latency_seconds_sum{{name="{name}"}} {summary["sum"]}' for name, summary in report['latencies'].items()]
+        lines += [f'rt_sanitizer_latency_seconds_count{{name="{name}"}} {summary["count"]}' for name, summary in report['latencies'].items()]
+
+        for name, value in sorted(report['counters'].items()):
+            metric(f"{name}_total", 'counter', f"Total {name.replace('_', ' ')}.", [({}, value)])
+        metric('run_wall_seconds', 'gauge', "Wall time of the run so far.", [({}, report['wall_seconds'])])
+
+        write_file_atomically(path, '\n'.join(lines) + '\n')
+
+    def print_summary(self, report):
+        print("\n=== STAGE METRICS ===")
+        for name, stage in report['stages'].items():
+            if 'calls' not in stage:
+                continue
+            latency = report['latencies'][f"stage_{name}"]
+            peak = f", peak {stage['peak_traced_bytes'] / 2 ** 20:.1f} MiB" if 'peak_traced_bytes' in stage else ""
+            print(f"{name:<16} {stage['wall_seconds']:8.2f}s wall, {stage['self_seconds']:8.2f}s self, "
+                  f"{stage['items']:>8} reviews in {stage['calls']:>5} calls (p50 {latency['p50'] * 1000:.1f} ms, "
+                  f"p99 {latency['p99'] * 1000:.1f} ms){peak}")
+        if report['counters']:
+            print(', '.join(f"{name.replace('_', ' ')}: {value}" for name, value in sorted(report['counters'].items())))
+
+    def write_reports(self, json_path=None, prometheus_path=None):
+        report = self.report(os.path.dirname(json_path or prometheus_path or "") or ".")
+        self.print_summary(report)
+        if json_path:
+            self.write_json(json_path, report)
+            print(f"Run report written to {json_path}")
+        if prometheus_path:
+            self.write_prometheus(prometheus_path, report)
+            print(f"Prometheus metrics written to {prometheus_path}")
+        for stage in report['stages'].values():
+            if 'profile' in stage:
+                print(f"cProfile stats written to {stage['profile']['path']}")
+
+def write_file_atomically(path, text):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+metrics = PipelineMetrics()
+
+def timed_stage(name, count_items=None):
+    # Times every call of the decorated function as a stage; count_items(result) gives the reviews it handled
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.stage(name) as stage:
+                result = func(*args, **kwargs)
+                stage.items = count_items(result) if count_items else 1
+            return result
+        return wrapper
+    return decorate
+
+def wait_for_new_reviews(driver, previous_count, timeout):
+    # Returns (review_count, outcome) once new rows appear, the network goes idle (no request in flight for
+    # NETWORK_IDLE_MS) without new rows, or timeout
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    start = time.perf_counter()
+
+    def reviews_loaded(d):
+        count, pending, idle_ms = d.execute_script(REVIEW_LOAD_STATE_SCRIPT)
+        if count > previous_count:
+            return count, 'grew'
+        waited_ms = (time.perf_counter() - start) * 1000
+        if not pending and waited_ms > NETWORK_IDLE_MS and idle_ms > NETWORK_IDLE_MS:
+            return count, 'idle'
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(reviews_loaded)
+    except TimeoutException:
+        return previous_count, 'timeout'
+
+def create_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
 
     service = Service(CHROMEDRIVER_PATH)
     driver = webdriver.Chrome(service=service)
 
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+class WebDriverPool:
+    # Bounded pool of reusable Chrome sessions; drivers are launched lazily up to `size`
+    def __init__(self, size=DRIVER_POOL_SIZE):
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        self.slots.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            print("Launching browser...")
+            return create_driver()
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, driver, discard=False):
+        if discard:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        else:
+            self.idle.put(driver)
+        self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def scrape_reviews(movie_url, driver=None, on_progress=None, click_stats=None):
+    # A driver passed in (e.g. from a WebDriverPool) is reused and left open for the caller.
+    # on_progress(driver, review_count) is called as cards load, so they can be saved before the last click.
+    # Click latencies go to metrics as 'scrape_click'; pass a ClickLatencyStats to also get this scrape's own.
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+    from tqdm import tqdm
+
+    if not movie_url:
+        print("Error: Invalid movie URL provided")
+        return None
+    
+    owns_driver = driver is None
+    if owns_driver:
+        print("Launching browser...")
+        driver = create_driver()
 
     try:
         driver.get(movie_url)
-        # print("Page loaded. Clicking 'Load More' to load additional reviews...")
 
-        time.sleep(3)
+        try:
+            WebDriverWait(driver, PAGE_LOAD_TIMEOUT, poll_frequency=0.1).until(
+                lambda d: d.execute_script(PAGE_READY_SCRIPT)
+            )
+        except TimeoutException:
+            print("Page did not show any reviews in time, checking what loaded...")
 
         # Check if the page shows a 404 error or "Not Found" message
-        page_title = driver.title.lower()
         page_source = driver.page_source.lower()
-        # print({page_source})
         
         if "sorry, please try again later" in page_source:
             print(f"Error: Movie page not found. The URL '{movie_url}' may be incorrect.")
-            driver.quit()
+            if owns_driver:
+                driver.quit()
             return None
         
         print("Page loaded. Clicking 'Load More' to load additional reviews...")
         
         clicks = 0
+        stalled_clicks = 0
+        click_stats = click_stats if click_stats is not None else ClickLatencyStats()
+        review_count = driver.execute_script(REVIEW_LOAD_STATE_SCRIPT)[0]
 
         pbar = tqdm(total=TARGET_REVIEWS, desc="Loading reviews", unit="review")
-        while clicks < MAX_CLICKS:
+        pbar.update(min(review_count, TARGET_REVIEWS))
+        while clicks < MAX_CLICKS and review_count < TARGET_REVIEWS:
+            if on_progress:
+                on_progress(driver, review_count)
             try:
-                load_more_button = WebDriverWait(driver, 10).until(
+                load_more_button = WebDriverWait(driver, click_stats.adaptive_timeout(), poll_frequency=0.1).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, 'div.load-more-container rt-button'))
                 )
 
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", load_more_button)
-                time.sleep(1)
+                driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", load_more_button)
 
+                click_start = time.perf_counter()
                 driver.execute_script("arguments[0].click();", load_more_button)
 
                 clicks += 1
-                # print(f"Clicked 'Load More' button {clicks} times.")
 
-                time.sleep(3)
+                new_count, outcome = wait_for_new_reviews(driver, review_count, click_stats.adaptive_timeout())
+                click_stats.record(time.perf_counter() - click_start, outcome)
+
+                if new_count > review_count:
+                    stalled_clicks = 0
+                else:
+                    stalled_clicks += 1
+                    if stalled_clicks >= MAX_STALLED_CLICKS:
+                        print(f"No new reviews after {stalled_clicks} clicks, assuming all reviews are loaded.")
+                        break
 
-                current_reviews = driver.find_elements(By.CSS_SELECTOR, 'div.audience-review-row')
-                # print(f"Current number of reviews loaded: {len(current_reviews)}")
-                pbar.update(len(current_reviews) - pbar.n)
-                pbar.set_postfix(current=len(current_reviews))
+                review_count = new_count
+                pbar.update(min(review_count, TARGET_REVIEWS) - pbar.n)
+                pbar.set_postfix(current=review_count)
 
-                if len(current_reviews) >= TARGET_REVIEWS:
+                if review_count >= TARGET_REVIEWS:
                     print(f"Target of {TARGET_REVIEWS} reviews reached. Stopping clicks.")
                     break
 
@@ -167,18 +1076,187 @@ def scrape_reviews(movie_url):
                 break
 
         pbar.close()
+        if on_progress:
+            on_progress(driver, review_count)
+        click_stats.print_summary()
         print("Finished loading reviews. Browser closing soon.")
         return driver
     
     except Exception as e:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
         raise e
 
-def parse_reviews(driver):
+# Optional arguments: the index of the first card to read and the index to stop before
+REVIEW_CARDS_SCRIPT = """
+var cards = Array.from(document.querySelectorAll('div.audience-review-row'));
+return cards.slice(arguments[0] || 0, arguments[1] == null ? cards.length : arguments[1]).map(function (card) {
+    var text = card.querySelector('p.audience-reviews__review');
+    var user = card.querySelector('a.audience-reviews__name');
+    var date = card.querySelector('span.audience-reviews__duration');
+    var stars = card.querySelector('rating-stars-group');
+    return {
+        text: text ? text.innerText : null,
+        username: user ? user.innerText : null,
+        date: date ? date.innerText : null,
+        score: stars ? stars.getAttribute('score') : null
+    };
+});
+"""
+
+class ReviewCardParser(HTMLParser):
+    # (tag, class) of the card children we read the text of, same selectors as parse_reviews_per_element
+    TEXT_FIELDS = {
+        ('p', 'audience-reviews__review'): 'text',
+        ('a', 'audience-reviews__name'): 'username',
+        ('span', 'audience-reviews__duration'): 'date',
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cards = []
+        self.card = None
+        self.card_depth = 0
+        self.field = None
+        self.field_tag = None
+        self.field_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if self.card is None:
+            if tag == 'div' and 'audience-review-row' in classes:
+                self.card = {'text': None, 'username': None, 'date': None, 'score': None}
+                self.card_depth = 1
+            return
+
+        if tag == 'div':
+            self.card_depth += 1
+
+        if self.field:
+            if tag == 'br':
+                self.card[self.field].append('\n')
+            elif tag == self.field_tag:
+                self.field_depth += 1
+            return
+
+        if tag == 'rating-stars-group' and self.card['score'] is None:
+            self.card['score'] = attrs.get('score')
+
+        for class_name in classes:
+            field = self.TEXT_FIELDS.get((tag, class_name))
+            if field and self.card[field] is None:
+                self.card[field] = []
+                self.field = field
+                self.field_tag = tag
+                self.field_depth = 1
+                break
+
+    def handle_endtag(self, tag):
+        if self.card is None:
+            return
+
+        if self.field and tag == self.field_tag:
+            self.field_depth -= 1
+            if self.field_depth == 0:
+                self.card[self.field] = ''.join(self.card[self.field])
+                self.field = None
+
+        if tag == 'div':
+            self.card_depth -= 1
+            if self.card_depth == 0:
+                self.cards.append(self.card)
+                self.card = None
+
+    def handle_data(self, data):
+        # Line breaks in the source render as spaces; only <br> starts a new line
+        if self.field:
+            self.card[self.field].append(data.replace('\r', ' ').replace('\n', ' '))
+
+def build_review_from_card(card):
+    # Mirrors the per-element path: cards without review text or date are skipped
+    if card.get('text') is None or card.get('date') is None:
+        return None
+
+    username = card.get('username')
+    username = username.strip() if username is not None else "Anonymous"
+
+    rating = card.get('score')
+    try:
+        rating = float(rating) if rating else None
+    except ValueError:
+        print(f"Error getting rating: could not convert {rating!r} to float")
+        rating = None
+
+    return {
+        'text': normalize_card_text(card['text']),
+        'rating': rating,
+        'username': normalize_card_text(username),
+        'date': normalize_card_text(card['date'])
+    }
+
+CARD_SPACE_PATTERN = re.compile(r'[ \f\t\v\u2028\u2029]+')
+CARD_TRIM_PATTERN = re.compile(r'^[^\S\xa0]+|[^\S\xa0]+$')
+
+def normalize_card_text(text):
+    # Renders text the way WebElement.text does: spaces collapse and each line is trimmed, blank lines
+    # (from <br><br>) are kept, and non-breaking spaces become plain spaces without collapsing
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = (CARD_TRIM_PATTERN.sub('', CARD_SPACE_PATTERN.sub(' ', line)) for line in text.split('\n'))
+    return CARD_TRIM_PATTERN.sub('', '\n'.join(lines)).replace('\xa0', ' ')
+
+def parse_reviews_from_cards(cards):
+    reviews = []
+    for card in cards:
+        review = build_review_from_card(card)
+        if review:
+            reviews.append(review)
+    return reviews
+
+def parse_reviews_from_html(page_source, start=0, end=None):
+    parser = ReviewCardParser()
+    parser.feed(page_source)
+    parser.close()
+    return parse_reviews_from_cards(parser.cards[start:end])
+
+def parse_reviews_bulk(driver, start=0, end=None):
+    try:
+        cards = driver.execute_script(REVIEW_CARDS_SCRIPT, start, end)
+    except Exception as e:
+        print(f"Bulk extraction script failed ({e}), falling back to page source parsing.")
+        return parse_reviews_from_html(driver.page_source, start, end)
+    return parse_reviews_from_cards(cards or [])
+
+def parse_review_range(driver, start=0, end=None, mode=PARSE_MODE):
+    # Parses only cards [start, end), for saving the cards each 'Load More' click adds
+    with metrics.stage('parse') as stage:
+        if mode == "bulk":
+            reviews = parse_reviews_bulk(driver, start, end)
+        elif mode == "html":
+            reviews = parse_reviews_from_html(driver.page_source, start, end)
+        elif mode == "element":
+            reviews = parse_reviews_per_element(driver, start, end)
+        else:
+            raise ValueError(f"Unknown parse mode: {mode}")
+        stage.items = len(reviews)
+    return reviews
+
+def parse_reviews(driver, mode=PARSE_MODE):
     print("Parsing reviews...")
+
+    reviews = parse_review_range(driver, mode=mode)
+    if mode != "element":
+        print(f"Successfully parsed {len(reviews)} reviews.")
+    return reviews
+
+def parse_reviews_per_element(driver, start=0, end=None):
+    from selenium.webdriver.common.by import By
+    from tqdm import tqdm
+
     reviews = []
 
-    review_cards = driver.find_elements(By.CSS_SELECTOR, 'div.audience-review-row')
+    review_cards = driver.find_elements(By.CSS_SELECTOR, 'div.audience-review-row')[start:end]
     print(f"Found {len(review_cards)} review cards on the page.")
 
     for card in tqdm(review_cards, desc="Parsing reviews", unit="review"):
@@ -219,266 +1297,2382 @@ def parse_reviews(driver):
     print(f"Successfully parsed {len(reviews)} reviews.")
     return reviews
 
-def save_reviews_to_db(reviews_list, movie_title, movie_url):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
+class ReviewApiUnavailable(Exception):
+    pass
 
-    c.execute("INSERT OR IGNORE INTO movies (title, rt_url) VALUES (?, ?)", (movie_title, movie_url))
-    c.execute("SELECT id FROM movies WHERE title = ?", (movie_title,))
-    movie_id = c.fetchone()[0]
+http_session = None
 
-    inserted_count = 0
-    duplicate_count = 0
+def get_http_session():
+    # One pooled keep-alive session shared by every request the process makes
+    global http_session
+    if http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
 
-    for review in reviews_list:
-        try:
-            review_hash = generate_review_hash(
-                review['text'],
-                review['username'],
-                review['date'],
-                movie_id
-            )
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=("GET",), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": HTTP_USER_AGENT, "Accept": "application/json, text/html;q=0.9"})
+        http_session = session
+    return http_session
 
-            c.execute("SELECT id FROM reviews WHERE review_hash = ?", (review_hash,))
-            existing_review = c.fetchone()
-            
-            if existing_review:
-                duplicate_count += 1
-                continue
+def find_ems_id(page_html):
+    for pattern in (r'"emsId"\s*:\s*"([0-9a-fA-F-]+)"', r'emsId=([0-9a-fA-F-]+)', r'data-ems-id="([0-9a-fA-F-]+)"'):
+        match = re.search(pattern, page_html)
+        if match:
+            return match.group(1)
+    return None
 
-            c.execute('''INSERT INTO reviews
-                         (movie_id, review_text, original_rating, review_type, username, date, review_hash)
-                         VALUES (?, ?, ?, ?, ?, ?, ?)''',
-                         (movie_id, review['text'], review['rating'], 'audience', 
-                          review['username'], review['date'], review_hash))
-            inserted_count += 1
+def parse_api_rating(item):
+    score = item.get('score')
+    if score is None:
+        # Older payloads encode the rating as e.g. "STAR_4_5"
+        rating = item.get('rating') or ''
+        match = re.fullmatch(r'STAR_(\d)(?:_(\d))?', rating)
+        if not match:
+            return None
+        score = f"{match.group(1)}.{match.group(2) or 0}"
+    try:
+        return float(score)
+    except (TypeError, ValueError):
+        return None
 
-        except sqlite3.Error as e:
-            print(f"Error inserting review: {e}")
+def format_review_date(value, now=None):
+    # Render API timestamps the way the review cards show them ("3h", "2d", "Jan 5", "Jan 5, 2023")
+    try:
+        created = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return value
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
 
-    conn.commit()
-    conn.close()
-    print(f"Successfully saved {inserted_count} new reviews to the database.")
-    print(f"Skipped {duplicate_count} duplicate reviews.")
+    now = now or datetime.now(timezone.utc)
+    age = (now - created).total_seconds()
+    if 0 <= age < 3600:
+        return f"{max(1, int(age // 60))}m"
+    if 0 <= age < 86400:
+        return f"{int(age // 3600)}h"
+    if 0 <= age < 7 * 86400:
+        return f"{int(age // 86400)}d"
+    if created.year == now.year:
+        return f"{created:%b} {created.day}"
+    return f"{created:%b} {created.day}, {created.year}"
 
-    return movie_id
+def build_review_from_api(item):
+    text = item.get('quote') or item.get('review')
+    created = item.get('createDate') or item.get('creationDate')
+    if not text or not created:
+        return None
 
-def analyze_single_review(review_text):
-    system_prompt = """
-    You are an expert film criticism analyst. Your task is to judge the quality and authenticity of user movie reviews to help filter out review bombing, spam, and low-effort content.
+    user = item.get('user') or {}
+    username = user.get('displayName') or item.get('displayName') or "Anonymous"
 
-    Analyze the given review text and respond STRICTLY with a valid JSON object containing only these three fields:
-    1. "is_authentic": A boolean. false if the review seems like spam, trolling, review bombing, is completely off-topic, or is a very low-effort rant (e.g., "This movie sucks!").
-    2. "quality_score": A float between 0.1 (lowest quality) and 1.0 (highest quality). Base this on thoughtfulness, use of detail, coherence, and originality. A one-word rant scores 0.1. A well-reasoned paragraph scores 0.9-1.0.
-    3. "reasoning": A very brief one-sentence explanation for your judgments.
+    return {
+        'text': normalize_card_text(text),
+        'rating': parse_api_rating(item),
+        'username': normalize_card_text(username),
+        'date': format_review_date(created),
+        'created_at': parse_review_timestamp(created)
+    }
+
+def scrape_reviews_api(movie_url, target_reviews=TARGET_REVIEWS, start_cursor="", on_page=None):
+    # Returns None if the movie page does not exist; raises ReviewApiUnavailable if the JSON endpoint can't be used.
+    # Given on_page(reviews, next_cursor), each page is handed over instead of collected and the review count
+    # is returned; passing that cursor back as start_cursor resumes after the page.
+    if not movie_url:
+        print("Error: Invalid movie URL provided")
+        return None
+
+    import requests
+    from tqdm import tqdm
+
+    session = get_http_session()
 
-    Be strict. The goal is to create a more accurate aggregate score by downweighting unhelpful reviews.
-    RESPOND WITH A JSON OBJECT ONLY PLEASE
-    """
-    
     try:
-        response = deepseek_client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"REVIEW TEXT: {review_text}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-        
-        analysis_result = json.loads(response.choices[0].message.content)
-        return analysis_result
-        
-    except Exception as e:
-        print(f"\nDeepSeek API error for review: {e}")
-        return {"is_authentic": False, "quality_score": 0.1, "reasoning": "API analysis failed."}
+        response = session.get(movie_url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        raise ReviewApiUnavailable(f"could not load movie page: {e}")
 
-def analyze_reviews_with_ai(movie_id):
-    print("Starting parallel AI analysis of reviews (ordered)...")
-    setup_ai_analysis_table()
+    if response.status_code == 404 or "sorry, please try again later" in response.text.lower():
+        print(f"Error: Movie page not found. The URL '{movie_url}' may be incorrect.")
+        return None
+    if not response.ok:
+        raise ReviewApiUnavailable(f"movie page returned HTTP {response.status_code}")
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT r.id, r.review_text 
-        FROM reviews r 
-        LEFT JOIN ai_analysis a ON r.id = a.review_id 
-        WHERE r.movie_id = ? AND a.review_id IS NULL
-        ORDER BY r.id  -- Ensure we process in order
-    ''', (movie_id,))
-    reviews_to_analyze = cursor.fetchall()
-    conn.close()
-    
-    print(f"Found {len(reviews_to_analyze)} reviews to analyze...")
-    
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    for review_id, _ in reviews_to_analyze:
-        cursor.execute('''
-            INSERT OR IGNORE INTO ai_analysis 
-            (review_id, movie_id, is_authentic, quality_score, reasoning)
-            VALUES (?, ?, NULL, NULL, 'Analysis in progress')
-        ''', (review_id, movie_id))
-    conn.commit()
-    conn.close()
-    
-    def process_review(review_data):
-        review_id, review_text = review_data
-        analysis = analyze_single_review(review_text)
-        
-        if analysis:
-            thread_conn = get_thread_safe_connection()
-            thread_cursor = thread_conn.cursor()
-            thread_cursor.execute('''
-                UPDATE ai_analysis 
-                SET is_authentic = ?, quality_score = ?, reasoning = ?
-                WHERE review_id = ?
-            ''', (
-                analysis['is_authentic'],
-                analysis['quality_score'],
-                analysis['reasoning'],
-                review_id
-            ))
-            thread_conn.commit()
-            thread_conn.close()
-        return review_id
-
-    max_workers = 5
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(tqdm(executor.map(process_review, reviews_to_analyze), 
-                          total=len(reviews_to_analyze), desc="Analyzing reviews"))
-    
-    print(f"AI analysis complete! Analyzed {len(reviews_to_analyze)} reviews")
+    ems_id = find_ems_id(response.text)
+    if not ems_id:
+        raise ReviewApiUnavailable("no emsId found on the movie page")
 
-def calculate_sanitized_score(movie_id):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    parts = urlsplit(movie_url)
+    endpoint = f"{parts.scheme}://{parts.netloc}/napi/movie/{ems_id}/reviews/user"
 
-    cursor.execute('''
-        SELECT r.original_rating, a.quality_score, a.is_authentic
-        FROM reviews r
-        JOIN ai_analysis a ON r.id = a.review_id
-        WHERE r.movie_id = ? AND r.original_rating IS NOT NULL
-    ''', (movie_id,))
+    reviews = []
+    loaded = 0
+    cursor = start_cursor or ""
+    pages = 0
 
-    reviews = cursor.fetchall()
-    conn.close()
+    pbar = tqdm(total=target_reviews, desc="Loading reviews", unit="review")
+    while loaded < target_reviews:
+        try:
+            request_start = time.perf_counter()
+            response = session.get(endpoint, params={"direction": "next", "endCursor": cursor, "startCursor": ""},
+                                   headers={"Referer": movie_url}, timeout=HTTP_TIMEOUT)
+            metrics.observe('api_page', time.perf_counter() - request_start)
+            response.raise_for_status()
+            data = response.json()
+            page = data['reviews']
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            if not loaded:
+                pbar.close()
+                raise ReviewApiUnavailable(f"review endpoint failed: {e}")
+            print(f"Error loading review page {pages + 1}, keeping {loaded} reviews: {e}")
+            break
 
-    if not reviews:
-        return None
+        pages += 1
+        with metrics.stage('parse') as stage:
+            page_reviews = [review for review in map(build_review_from_api, page) if review]
+            page_reviews = page_reviews[:target_reviews - loaded]
+            stage.items = len(page_reviews)
+        loaded += len(page_reviews)
+        pbar.update(loaded - pbar.n)
 
-    total_weight = 0
-    weighted_sum = 0
+        page_info = data.get('pageInfo') or {}
+        next_cursor = page_info.get('endCursor')
+        if on_page:
+            on_page(page_reviews, next_cursor)
+        else:
+            reviews += page_reviews
+        if not page or not page_info.get('hasNextPage') or not next_cursor or next_cursor == cursor:
+            break
+        cursor = next_cursor
 
-    for original_rating, quality_score, is_authentic in reviews:
-        weight = quality_score if is_authentic else 0.0
+    pbar.close()
+    print(f"Loaded {loaded} reviews from {pages} API pages.")
+    return loaded if on_page else reviews
 
-        weighted_sum += original_rating * weight
-        total_weight += weight
+def fetch_reviews(movie_url, backend=SCRAPE_BACKEND, driver_pool=None, on_page=None, resume=None):
+    # Returns the parsed review dicts, or None if the movie could not be scraped. Given on_page(reviews, backend,
+    # cursor), reviews are handed to it as they load instead of collected, and the number handed over is returned.
+    # resume=(backend, cursor, reviews loaded) continues a scrape from that cursor.
+    resume_backend, resume_cursor, resume_loaded = resume or (None, None, 0)
+    if backend == "api":
+        target, cursor = (TARGET_REVIEWS - resume_loaded, resume_cursor) if resume_backend == "api" else (TARGET_REVIEWS, "")
+        try:
+            return scrape_reviews_api(movie_url, target, cursor,
+                                      on_page and (lambda reviews, next_cursor: on_page(reviews, "api", next_cursor)))
+        except ReviewApiUnavailable as e:
+            print(f"Review API unavailable ({e}), falling back to the browser scraper.")
+    elif backend != "selenium":
+        raise ValueError(f"Unknown scrape backend: {backend}")
 
-    if total_weight > 0:
-        sanitized_score = (weighted_sum / total_weight) * 20
-    else:
-        sanitized_score = 0
+    # The page always reloads from the top, but cards already handed to on_page are not parsed again.
+    # With PRUNE_PARSED_ROWS they are also removed from the page, so the DOM stays one click's worth of rows.
+    saved_cards = int(resume_cursor) if resume_backend == "selenium" and resume_cursor else 0
+    pruned_cards = 0
+    handed_over = [0]
 
-    return round(sanitized_score, 2)
+    def save_new_cards(driver, review_count):
+        nonlocal saved_cards, pruned_cards
+        if review_count > saved_cards:
+            new_reviews = parse_review_range(driver, saved_cards - pruned_cards, review_count - pruned_cards)
+            if PRUNE_PARSED_ROWS:
+                driver.execute_script(PRUNE_REVIEW_ROWS_SCRIPT, review_count - pruned_cards)
+                pruned_cards = review_count
+            handed_over[0] += len(new_reviews)
+            saved_cards = review_count
+            on_page(new_reviews, "selenium", str(review_count))
 
-def calculate_rt_audience_score(movie_id):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    on_progress = save_new_cards if on_page else None
 
-    cursor.execute('''
-        SELECT
-            COUNT(*) as total_reviews,
-            SUM(CASE WHEN original_rating >= 3.5 THEN 1 ELSE 0 END) as fresh_reviews
-        FROM reviews
-        WHERE movie_id = ? AND original_rating IS NOT NULL
-    ''', (movie_id,))
+    if driver_pool is None:
+        driver = scrape_reviews(movie_url, on_progress=on_progress)
+        if not driver:
+            return None
 
-    total, fresh = cursor.fetchone()
-    conn.close()
+        try:
+            return handed_over[0] if on_page else parse_reviews(driver)
+        finally:
+            driver.quit()
 
-    if total > 0:
-        audience_score = (fresh / total) * 100
-        return round(audience_score, 2)
-    else:
-        return None
+    driver = driver_pool.acquire()
+    discard = True
+    try:
+        if scrape_reviews(movie_url, driver, on_progress):
+            scraped = handed_over[0] if on_page else parse_reviews(driver)
+        else:
+            scraped = None
+        discard = False
+        return scraped
+    finally:
+        # A driver that raised mid-scrape may be wedged, so it is replaced rather than reused
+        driver_pool.release(driver, discard)
 
-def display_analysis_results(movie_title):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+minhash_parameters = None
 
-    cursor.execute("SELECT id FROM movies WHERE title = ?", (movie_title,))
-    movie_row = cursor.fetchone()
+def get_minhash_parameters():
+    # Fixed seed: signatures and buckets stored in the database must stay comparable across runs
+    global minhash_parameters
+    if minhash_parameters is None:
+        import numpy as np
 
-    if not movie_row:
-        print(f"Movie '{movie_title}' not found in database.")
-        conn.close()
+        rng = np.random.default_rng(155)
+        odd_uint64 = lambda count: rng.integers(0, 2 ** 64 - 1, count, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        minhash_parameters = (odd_uint64(MINHASH_PERMUTATIONS)[:, None],
+                              rng.integers(0, 2 ** 64 - 1, MINHASH_PERMUTATIONS, dtype=np.uint64, endpoint=True)[:, None],
+                              odd_uint64(MINHASH_PERMUTATIONS // LSH_BANDS))
+    return minhash_parameters
+
+def minhash_signatures(review_texts, batch_size=16):
+    # MinHash over every NEAR_DUPLICATE_SHINGLE_SIZE-byte window of each normalized review, computed for
+    # batch_size reviews per numpy call (larger batches lose to cache misses). Returns a uint32 signature
+    # per review, or None if it is too short to compare.
+    import numpy as np
+
+    a, b, _ = get_minhash_parameters()
+    size = NEAR_DUPLICATE_SHINGLE_SIZE
+    weights = np.uint64(256) ** np.arange(size, dtype=np.uint64)
+    encoded = [normalize_review_text(text).encode() for text in review_texts]
+    signatures = [None] * len(encoded)
+    comparable = [i for i, data in enumerate(encoded) if len(data) >= NEAR_DUPLICATE_MIN_CHARS]
+
+    for i in range(0, len(comparable), batch_size):
+        batch = comparable[i:i + batch_size]
+        buffer = np.frombuffer(b"".join(encoded[j] for j in batch), dtype=np.uint8)
+        lengths = np.array([len(encoded[j]) for j in batch])
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, size).astype(np.uint64) @ weights
+
+        # Drop the windows that straddle two reviews
+        counts = lengths - size + 1
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        shingles = windows[np.repeat(starts - offsets, counts) + np.arange(counts.sum())]
+
+        # One multiply-shift hash per permutation: (a * x + b) mod 2**64, keeping the top 32 bits
+        hashed = (a * shingles + b) >> np.uint64(32)
+        for j, signature in zip(batch, np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32)):
+            signatures[j] = signature
+    return signatures
+
+def lsh_buckets(signature):
+    # One 64-bit bucket key per band of MINHASH_PERMUTATIONS // LSH_BANDS signature values
+    import numpy as np
+
+    _, _, band_weights = get_minhash_parameters()
+    bands = signature.astype(np.uint64).reshape(LSH_BANDS, -1)
+    return (bands * band_weights).sum(axis=1, dtype=np.uint64).view(np.int64).tolist()
+
+def signature_similarity(signature, other):
+    return (signature == other).mean()
+
+# Signatures of up to LSH_BUCKET_CANDIDATES reviews from each bucket a signature falls in
+LSH_CANDIDATES_QUERY = f'''
+    SELECT cluster_id, signature FROM review_signatures
+    WHERE review_id IN ({" UNION ".join(
+        f"SELECT review_id FROM (SELECT review_id FROM review_lsh_buckets WHERE band = {band} AND bucket = ? LIMIT {LSH_BUCKET_CANDIDATES})"
+        for band in range(LSH_BANDS))})
+'''
+
+CLUSTER_REPRESENTATIVE_QUERY = "SELECT MIN(review_id) FROM review_signatures WHERE cluster_id = ? AND movie_id = ?"
+
+def assign_cluster_representatives(conn, cluster_id, movie_ids):
+    # Within each movie the earliest member of the cluster counts; the others point at it
+    for movie_id in movie_ids:
+        members = [row[0] for row in conn.execute(
+            "SELECT review_id FROM review_signatures WHERE cluster_id = ? AND movie_id = ? ORDER BY review_id",
+            (cluster_id, movie_id))]
+        conn.execute("UPDATE reviews SET near_duplicate_of = NULL WHERE id = ? AND near_duplicate_of IS NOT NULL",
+                     (members[0],))
+        conn.executemany("UPDATE reviews SET near_duplicate_of = ? WHERE id = ? AND near_duplicate_of IS NOT ?",
+                         [(members[0], review_id, members[0]) for review_id in members[1:]])
+
+def join_near_duplicate_clusters(conn, review_id, movie_id, cluster_ids):
+    # Merges the matched clusters into the largest one (so members are renamed O(log n) times) and adds the review
+    if len(cluster_ids) == 1:
+        target = cluster_ids[0]
+        conn.execute("UPDATE review_signatures SET cluster_id = ? WHERE review_id = ?", (target, review_id))
+        representative = conn.execute(CLUSTER_REPRESENTATIVE_QUERY, (target, movie_id)).fetchone()[0]
+        if representative == review_id:
+            # An older review indexed late can become its movie's representative
+            assign_cluster_representatives(conn, target, [movie_id])
+        else:
+            conn.execute("UPDATE reviews SET near_duplicate_of = ? WHERE id = ?", (representative, review_id))
         return
-    
-    movie_id = movie_row[0]
-
-    rt_score = calculate_rt_audience_score(movie_id)
-    sanitized_score = calculate_sanitized_score(movie_id)
-
-    cursor.execute('''
-        SELECT 
-            COUNT(*) as total_reviews,
-            AVG(r.original_rating) as avg_original_rating,
-            AVG(a.quality_score) as avg_quality_score,
-            SUM(CASE WHEN a.is_authentic THEN 1 ELSE 0 END) as authentic_count,
-            SUM(CASE WHEN NOT a.is_authentic THEN 1 ELSE 0 END) as inauthentic_count
-        FROM reviews r
-        JOIN ai_analysis a ON r.id = a.review_id
-        WHERE r.movie_id = ?
-    ''', (movie_id,))
 
-    stats = cursor.fetchone()
-    
-    cursor.execute('''
-        SELECT
-            CASE 
-                WHEN quality_score >= 0.9 THEN 'Excellent (90-100%)'
-                WHEN quality_score >= 0.7 THEN 'Good (70-89%)'
-                WHEN quality_score >= 0.5 THEN 'Fair (50-69%)'
-                WHEN quality_score >= 0.3 THEN 'Poor (30-49%)'
-                ELSE 'Very Poor (10-29%)'
-            END as quality_bucket,
-            COUNT(*) as count,
-            AVG(quality_score) as avg_quality_in_bucket
-        FROM ai_analysis a
-        JOIN reviews r ON a.review_id = r.id
-        WHERE r.movie_id = ?
-        GROUP BY quality_bucket
-        ORDER BY avg_quality_in_bucket DESC
-    ''', (movie_id,))
+    sizes = {cluster_id: conn.execute("SELECT COUNT(*) FROM review_signatures WHERE cluster_id = ?",
+                                      (cluster_id,)).fetchone()[0]
+             for cluster_id in cluster_ids}
+    target = max(cluster_ids, key=lambda cluster_id: sizes[cluster_id])
+    merged = [cluster_id for cluster_id in cluster_ids if cluster_id != target]
+    placeholders = ",".join("?" * len(merged))
+    movie_ids = {row[0] for row in conn.execute(
+        f"SELECT DISTINCT movie_id FROM review_signatures WHERE cluster_id IN ({placeholders})", merged)}
+    conn.execute(f"UPDATE review_signatures SET cluster_id = ? WHERE cluster_id IN ({placeholders})", (target, *merged))
+    conn.execute("UPDATE review_signatures SET cluster_id = ? WHERE review_id = ?", (target, review_id))
+    assign_cluster_representatives(conn, target, movie_ids | {movie_id})
 
-    distribution = cursor.fetchall()
-    
-    print(f"\n=== AI ANALYSIS RESULTS for '{movie_title}' ===")
-    if stats:
-        total_reviews, avg_original, avg_quality, authentic_count, inauthentic_count = stats
+@timed_stage('near_duplicates', lambda result: result[0])
+def index_near_duplicates(conn, movie_id=None, after_id=0, limit=None):
+    # Signs reviews that are not in review_signatures yet (in id order) and joins each one to the clusters
+    # of the near-duplicates LSH finds among everything indexed before it. The caller commits.
+    # Returns (reviews indexed, reviews that matched an earlier review, last review id indexed).
+    import numpy as np
 
-        avg_original_percent = avg_original * 20
-        avg_quality_percent = avg_quality * 100
-        raw_avg_percent = avg_original * 20
-        
-        print(f"Total Reviews Analyzed: {total_reviews}")
-        print(f"Official RT Audience Score: {rt_score:.1f}%")
-        print(f"Raw Average Star Rating: {avg_original:.1f}/5 ({raw_avg_percent:.1f}%)")
-        print(f"Sanitized Score (AI-Weighted): {sanitized_score:.1f}%") 
-        print(f"Average AI Quality Score: {avg_quality_percent:.1f}%")
-        print(f"Authentic Reviews: {authentic_count} ({authentic_count/total_reviews*100:.1f}%)")
-        print(f"Potential Review Bombs/Spam: {inauthentic_count} ({inauthentic_count/total_reviews*100:.1f}%)")
-        
-        print("\n--- Review Quality Distribution ---")
-        for bucket, count, avg_qual in distribution:
-            avg_qual_percent = avg_qual * 100
-            percentage = (count / total_reviews) * 100
-            print(f"  - {bucket}: {count} reviews ({percentage:.1f}% of reviews) - Avg quality of reviews: {avg_qual_percent:.1f}%")
+    filters = "r.id > ?" + (" AND r.movie_id = ?" if movie_id is not None else "")
+    params = (after_id, movie_id) if movie_id is not None else (after_id,)
+    rows = conn.execute(f'''
+        SELECT r.id, r.movie_id, r.review_text FROM reviews r
+        WHERE {filters} AND NOT EXISTS (SELECT 1 FROM review_signatures s WHERE s.review_id = r.id)
+        ORDER BY r.id
+        {"LIMIT ?" if limit else ""}
+    ''', params + ((limit,) if limit else ())).fetchall()
+
+    signatures = minhash_signatures([review_text for _, _, review_text in rows])
+    bucket_insert = f"INSERT INTO review_lsh_buckets (band, bucket, review_id) VALUES {', '.join(['(?, ?, ?)'] * LSH_BANDS)}"
+
+    matched = 0
+    for (review_id, review_movie_id, _), signature in zip(rows, signatures):
+        if signature is None:
+            conn.execute("INSERT INTO review_signatures (review_id, movie_id) VALUES (?, ?)", (review_id, review_movie_id))
+            continue
+
+        buckets = lsh_buckets(signature)
+        cluster_ids = []
+        for cluster_id, candidate_signature in conn.execute(LSH_CANDIDATES_QUERY, buckets):
+            if cluster_id in cluster_ids:
+                continue
+            if signature_similarity(signature, np.frombuffer(candidate_signature, dtype=np.uint32)) >= NEAR_DUPLICATE_THRESHOLD:
+                cluster_ids.append(cluster_id)
+
+        conn.execute("INSERT INTO review_signatures (review_id, movie_id, cluster_id, signature) VALUES (?, ?, ?, ?)",
+                     (review_id, review_movie_id, review_id, signature.tobytes()))
+        conn.execute(bucket_insert, [value for band, bucket in enumerate(buckets) for value in (band, bucket, review_id)])
+        if cluster_ids:
+            matched += 1
+            join_near_duplicate_clusters(conn, review_id, review_movie_id, cluster_ids)
+
+    return len(rows), matched, rows[-1][0] if rows else after_id
+
+def backfill_near_duplicates():
+    # Indexes every review saved before near-duplicate detection existed, committing chunk by chunk
+    conn = get_writer_connection()
+    total_indexed = total_matched = 0
+    last_id = 0
+    while True:
+        with conn:
+            indexed, matched, last_id = index_near_duplicates(conn, after_id=last_id, limit=NEAR_DUPLICATE_INDEX_CHUNK)
+        if not indexed:
+            break
+        total_indexed += indexed
+        total_matched += matched
+        print(f"Indexed {total_indexed} reviews, {total_matched} near-duplicates so far...")
+    conn.close()
+    print(f"Near-duplicate index complete: {total_indexed} reviews indexed, {total_matched} near-duplicates found.")
+    return total_indexed, total_matched
+
+def near_duplicate_report(limit=10):
+    conn = sqlite3.connect(DB_NAME)
+    clusters = conn.execute('''
+        SELECT s.cluster_id, COUNT(*), COUNT(DISTINCT s.movie_id), r.review_text
+        FROM review_signatures s
+        JOIN reviews r ON r.id = s.cluster_id
+        WHERE s.cluster_id IS NOT NULL
+        GROUP BY s.cluster_id
+        HAVING COUNT(*) > 1
+        ORDER BY COUNT(*) DESC
+        LIMIT ?
+    ''', (limit,)).fetchall()
+    conn.close()
+
+    if not clusters:
+        print("No near-duplicate clusters found.")
+    for cluster_id, size, movies, review_text in clusters:
+        print(f"Cluster {cluster_id}: {size} reviews across {movies} movie{'s' if movies != 1 else ''} - "
+              f"\"{review_text[:80]}{'...' if len(review_text) > 80 else ''}\"")
+    return clusters
+
+REVIEW_AGE_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400, 'mo': 30 * 86400, 'y': 365 * 86400}
+REVIEW_AGE_PATTERN = re.compile(r'(\d+)\s*(mo|m|h|d|w|y)')
+
+def parse_review_timestamp(value, now=None):
+    # Epoch seconds for a review date as the cards show it ("5m", "3h", "2d", "3w", "Jan 5" within the last
+    # year, "Dec 28, 2023") or as an ISO timestamp; now is when the card was scraped. None if unrecognized.
+    if not value:
+        return None
+    now = time.time() if now is None else now
+    value = value.strip()
+    match = REVIEW_AGE_PATTERN.fullmatch(value)
+    if match:
+        return now - int(match.group(1)) * REVIEW_AGE_UNITS[match.group(2)]
+
+    scraped = datetime.fromtimestamp(now, timezone.utc)
+    for pattern in ("%b %d, %Y", "%B %d, %Y", "%b %d %Y", "%B %d %Y"):
+        try:
+            # A card without a year is from the last twelve months
+            date = datetime.strptime(value if ',' in pattern else f"{value} {scraped.year}", pattern)
+        except ValueError:
+            continue
+        date = date.replace(tzinfo=timezone.utc)
+        if ',' not in pattern and date > scraped:
+            date = date.replace(year=date.year - 1)
+        return date.timestamp()
+
+    try:
+        date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return (date if date.tzinfo else date.replace(tzinfo=timezone.utc)).timestamp()
+
+def review_date_precision(value):
+    # Seconds a parse_review_timestamp result can be off by: an age is rounded down to its unit ("2d" is two
+    # to three days old), a calendar date covers a day and an ISO timestamp is exact. None if unrecognized.
+    if parse_review_timestamp(value) is None:
+        return None
+    match = REVIEW_AGE_PATTERN.fullmatch(value.strip())
+    if match:
+        return REVIEW_AGE_UNITS[match.group(2)]
+    return 0 if ':' in value else 86400
+
+# A review is already saved if the movie has a row from the same user with the same text, posted at a time
+# that agrees with this one within the precision of both dates
+INSERT_REVIEW_QUERY = f'''
+    INSERT INTO reviews
+        (movie_id, review_text, original_rating, review_type, username, date, created_at, created_at_precision, review_hash)
+    SELECT ?1, ?2, ?3, 'audience', ?4, ?5, ?6, ?7, ?8
+    WHERE NOT EXISTS (
+        SELECT 1 FROM reviews
+        WHERE movie_id = ?1 AND username = ?4
+          AND ABS(created_at - ?6) <= created_at_precision + ?7 + {REVIEW_DATE_SLACK}
+          AND substr(review_text, 1, 100) = substr(?2, 1, 100))
+    ON CONFLICT(review_hash) DO NOTHING
+'''
+
+def get_or_create_movie(cursor, movie_title, movie_url):
+    cursor.execute("INSERT OR IGNORE INTO movies (title, rt_url) VALUES (?, ?)", (movie_title, movie_url))
+    cursor.execute("SELECT id FROM movies WHERE title = ?", (movie_title,))
+    return cursor.fetchone()[0]
+
+def insert_reviews(conn, movie_id, reviews):
+    # One executemany over a generator, so rows are hashed as they are inserted and never held in a list.
+    # Duplicates are resolved by INSERT_REVIEW_QUERY and the UNIQUE review_hash index; inserted rows are
+    # counted with rowcount, which unlike total_changes leaves out the movie_scores trigger writes.
+    # Card dates are relative, so they are resolved against the time the reviews are saved.
+    counts = {'seen': 0, 'invalid': 0}
+    scraped_at = time.time()
+
+    def rows():
+        for review in reviews:
+            counts['seen'] += 1
+            if not review.get('text'):
+                counts['invalid'] += 1
+                continue
+            if review.get('created_at') is not None:
+                created_at, precision = review['created_at'], 0
+            else:
+                created_at = parse_review_timestamp(review['date'], scraped_at)
+                precision = review_date_precision(review['date'])
+            review_hash = review_row_hash(review['text'], review['username'], created_at, review['date'], movie_id)
+            yield (movie_id, review['text'], review['rating'], review['username'], review['date'],
+                   created_at, precision, review_hash)
+
+    cursor = conn.executemany(INSERT_REVIEW_QUERY, rows())
+    inserted = cursor.rowcount
+    return inserted, counts['seen'] - counts['invalid'] - inserted, counts['invalid']
+
+def print_save_summary(inserted_count, duplicate_count, invalid_count, near_duplicate_count=0):
+    print(f"Successfully saved {inserted_count} new reviews to the database.")
+    print(f"Skipped {duplicate_count} duplicate reviews.")
+    if invalid_count:
+        print(f"Skipped {invalid_count} reviews without text.")
+    if near_duplicate_count:
+        print(f"{near_duplicate_count} new reviews are near-duplicates of earlier reviews.")
+
+def save_reviews_to_db(reviews_list, movie_title, movie_url):
+    conn = sqlite3.connect(DB_NAME)
+
+    with metrics.stage('save', len(reviews_list)), conn:
+        movie_id = get_or_create_movie(conn.cursor(), movie_title, movie_url)
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reviews").fetchone()[0]
+        inserted_count, duplicate_count, invalid_count = insert_reviews(conn, movie_id, reviews_list)
+        _, near_duplicates, _ = index_near_duplicates(conn, movie_id, after_id=last_id)
+    metrics.count('db_commits')
+
+    conn.close()
+    print_save_summary(inserted_count, duplicate_count, invalid_count, near_duplicates)
+
+    return movie_id
+
+def save_reviews_stream(reviews, movie_title, movie_url, chunk_size=SAVE_CHUNK_SIZE):
+    # Accepts any iterable (e.g. a generator) and commits every chunk_size reviews,
+    # so memory and the size of each transaction stay flat however many reviews arrive
+    conn = sqlite3.connect(DB_NAME)
+
+    with conn:
+        movie_id = get_or_create_movie(conn.cursor(), movie_title, movie_url)
+
+    totals = [0, 0, 0, 0]
+    reviews = iter(reviews)
+    while True:
+        chunk = list(itertools.islice(reviews, chunk_size))
+        if not chunk:
+            break
+        with metrics.stage('save', len(chunk)), conn:
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reviews").fetchone()[0]
+            counts = insert_reviews(conn, movie_id, chunk)
+            _, near_duplicates, _ = index_near_duplicates(conn, movie_id, after_id=last_id)
+        metrics.count('db_commits')
+        totals = [total + count for total, count in zip(totals, (*counts, near_duplicates))]
+
+    conn.close()
+    print_save_summary(*totals)
+
+    return movie_id
+
+class RunLedger:
+    # A movie's run_ledger row: the stage its latest run reached ('scrape', 'analyze', 'done' or 'failed'),
+    # where an interrupted scrape resumes and the seconds spent per stage. A run stopped by a crash, Ctrl-C
+    # or an error keeps its stage, so running the same title again continues it instead of starting over.
+    FIELDS = ('run_id', 'stage', 'backend', 'cursor', 'reviews_loaded', 'reviews_saved', 'reviews_analyzed',
+              'stage_seconds', 'error', 'started_at', 'stage_started_at', 'updated_at', 'finished_at')
+
+    def __init__(self, movie_id):
+        # movie_id may be None for a movie not saved yet; the row is written once checkpoint() knows it
+        self.movie_id = movie_id
+        self.row = None
+        if movie_id is not None:
+            conn = sqlite3.connect(DB_NAME)
+            row = conn.execute(f"SELECT {', '.join(self.FIELDS)} FROM run_ledger WHERE movie_id = ?",
+                               (movie_id,)).fetchone()
+            conn.close()
+            if row:
+                self.row = dict(zip(self.FIELDS, row))
+
+    @property
+    def unfinished_stage(self):
+        if self.row and self.row['stage'] in ('scrape', 'analyze'):
+            return self.row['stage']
+        return None
+
+    def save(self, conn=None):
+        if self.movie_id is None:
+            return
+        self.row['updated_at'] = time.time()
+        statement = (f"INSERT OR REPLACE INTO run_ledger (movie_id, {', '.join(self.FIELDS)}) "
+                     f"VALUES ({', '.join('?' * (len(self.FIELDS) + 1))})")
+        values = (self.movie_id, *(self.row[name] for name in self.FIELDS))
+        if conn is not None:
+            conn.execute(statement, values)
+            return
+        conn = get_writer_connection()
+        with conn:
+            conn.execute(statement, values)
+        conn.close()
+
+    def add_stage_seconds(self, stage, seconds):
+        stage_seconds = json.loads(self.row['stage_seconds'])
+        stage_seconds[stage] = stage_seconds.get(stage, 0) + seconds
+        self.row['stage_seconds'] = json.dumps(stage_seconds)
+
+    def begin(self, stage):
+        now = time.time()
+        if self.unfinished_stage == stage:
+            # Time the interrupted attempt spent in this stage, up to its last checkpoint
+            if self.row['stage_started_at']:
+                self.add_stage_seconds(stage, self.row['updated_at'] - self.row['stage_started_at'])
+        elif stage == 'scrape' or self.row is None:
+            self.row = {name: None for name in self.FIELDS}
+            self.row.update(reviews_loaded=0, reviews_saved=0, reviews_analyzed=0, stage_seconds='{}', started_at=now)
+        self.row.update(run_id=RUN_ID, stage=stage, error=None, stage_started_at=now, finished_at=None)
+        self.save()
+
+    def checkpoint(self, conn, movie_id, backend, cursor, loaded, saved):
+        # Written in the caller's transaction, so the cursor only moves once the reviews before it are committed
+        self.movie_id = movie_id
+        self.row['reviews_loaded'] += loaded
+        self.row['reviews_saved'] += saved
+        self.row.update(backend=backend, cursor=cursor)
+        self.save(conn)
+
+    def finish(self, next_stage, analyzed=0):
+        now = time.time()
+        self.add_stage_seconds(self.row['stage'], now - self.row['stage_started_at'])
+        self.row['reviews_analyzed'] += analyzed
+        self.row.update(stage=next_stage, stage_started_at=None, finished_at=now if next_stage == 'done' else None)
+        self.save()
+
+    def fail(self, error, stage=None):
+        self.row['error'] = error
+        if stage:
+            self.row.update(stage=stage, stage_started_at=None)
+        self.save()
+
+class StreamCancelled(Exception):
+    pass
+
+class ReviewStream:
+    # Iterates (reviews, backend, cursor) chunks as they load. The scraper runs in its own thread and hands
+    # each API page, or the rows a 'Load More' click added, over a queue of at most buffer_chunks chunks,
+    # so it runs ahead of the consumer by a bounded amount. found is False if the movie was not found.
+    def __init__(self, movie_url, backend=SCRAPE_BACKEND, driver_pool=None, resume=None,
+                 buffer_chunks=STREAM_BUFFER_CHUNKS):
+        self.movie_url = movie_url
+        self.backend = backend
+        self.driver_pool = driver_pool
+        self.resume = resume
+        self.queue = queue.Queue(maxsize=buffer_chunks)
+        self.cancelled = threading.Event()
+        self.found = None
+        self.loaded = 0
+        self.error = None
+
+    def put(self, reviews, backend, cursor):
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put((reviews, backend, cursor), timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise StreamCancelled()
+
+    def produce(self):
+        try:
+            self.found = fetch_reviews(self.movie_url, self.backend, self.driver_pool, self.put, self.resume) is not None
+        except StreamCancelled:
+            pass
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.queue.put(None)
+
+    def __iter__(self):
+        thread = threading.Thread(target=self.produce, name="review-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                self.loaded += len(chunk[0])
+                yield chunk
+        finally:
+            # Stops the scraper at its next chunk if the consumer gave up early
+            self.cancelled.set()
+            while thread.is_alive():
+                try:
+                    self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
+        if self.error:
+            raise self.error
+
+class StreamingAnalyzer:
+    # Analyzes a movie while it is still being scraped. Saved chunks are queued (the saver blocks once
+    # buffer_chunks are waiting) and a thread runs analyze_reviews_with_ai whenever min_reviews new reviews
+    # have arrived. Every round claims whatever is pending, so leases keep reviews from being analyzed twice;
+    # the remainder is left for the caller's final analyze_movie.
+    def __init__(self, min_reviews=STREAM_ANALYSIS_MIN_REVIEWS, buffer_chunks=STREAM_BUFFER_CHUNKS):
+        self.min_reviews = min_reviews
+        self.queue = queue.Queue(maxsize=buffer_chunks)
+        self.thread = threading.Thread(target=self.run, name="streaming-analysis", daemon=True)
+        self.analyzed = 0
+        self.rounds = 0
+        self.error = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, movie_id, inserted):
+        if inserted:
+            self.queue.put((movie_id, inserted))
+
+    def run(self):
+        waiting = 0
+        try:
+            for movie_id, inserted in iter(self.queue.get, None):
+                waiting += inserted
+                if waiting >= self.min_reviews:
+                    if not self.rounds:
+                        metrics.observe('first_analysis_delay', time.perf_counter() - self.start)
+                    self.rounds += 1
+                    self.analyzed += analyze_reviews_with_ai(movie_id)
+                    waiting = 0
+        except Exception as e:
+            self.error = e
+            # Keep draining so the saver never blocks on a dead analyzer
+            while self.queue.get() is not None:
+                pass
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.error:
+            raise self.error
+
+def find_movie_id(movie_title):
+    conn = sqlite3.connect(DB_NAME)
+    row = conn.execute("SELECT id FROM movies WHERE title = ?", (movie_title,)).fetchone()
+    conn.close()
+    return row[0] if row else None
+
+def scrape_movie(movie_title, movie_url, backend=SCRAPE_BACKEND, driver_pool=None, on_saved=None):
+    # Saves reviews as they load, one transaction per API page or 'Load More' click that also moves the
+    # run_ledger cursor, so a rerun after a crash resumes after the last saved page. on_saved(movie_id,
+    # reviews inserted) is called after each commit. Returns (movie_id, reviews loaded by the run), or None
+    # if the movie could not be scraped.
+    ledger = RunLedger(find_movie_id(movie_title))
+    if ledger.unfinished_stage == 'analyze':
+        print(f"Reviews for '{movie_title}' were saved by an interrupted run, resuming its analysis.")
+        return ledger.movie_id, ledger.row['reviews_loaded']
+
+    resume = None
+    if ledger.unfinished_stage == 'scrape' and ledger.row['cursor']:
+        resume = (ledger.row['backend'], ledger.row['cursor'], ledger.row['reviews_loaded'])
+        print(f"Resuming the interrupted scrape of '{movie_title}' after {ledger.row['reviews_loaded']} reviews.")
+    ledger.begin('scrape')
+
+    conn = get_writer_connection()
+    totals = [0, 0, 0, 0]
+
+    def save_page(reviews, source, cursor):
+        with metrics.stage('save', len(reviews)), conn:
+            movie_id = ledger.movie_id or get_or_create_movie(conn.cursor(), movie_title, movie_url)
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reviews").fetchone()[0]
+            counts = insert_reviews(conn, movie_id, reviews)
+            _, near_duplicates, _ = index_near_duplicates(conn, movie_id, after_id=last_id)
+            ledger.checkpoint(conn, movie_id, source, cursor, len(reviews), counts[0])
+        metrics.count('db_commits')
+        totals[:] = [total + count for total, count in zip(totals, (*counts, near_duplicates))]
+        if on_saved:
+            on_saved(movie_id, counts[0])
+
+    stream = ReviewStream(movie_url, backend, driver_pool, resume)
+    try:
+        with metrics.stage('scrape') as stage:
+            for reviews, source, cursor in stream:
+                save_page(reviews, source, cursor)
+            stage.items = stream.loaded
+    except Exception as e:
+        ledger.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        conn.close()
+
+    if not stream.found:
+        ledger.fail("movie not found", stage='failed')
+        return None
+    if not ledger.row['reviews_loaded']:
+        ledger.fail("no reviews found", stage='failed')
+        return ledger.movie_id, 0
+
+    print_save_summary(*totals)
+    ledger.finish('analyze')
+    return ledger.movie_id, ledger.row['reviews_loaded']
+
+REVIEW_ANALYSIS_CRITERIA = """
+    1. "is_authentic": A boolean. false if the review seems like spam, trolling, review bombing, is completely off-topic, or is a very low-effort rant (e.g., "This movie sucks!").
+    2. "quality_score": A float between 0.1 (lowest quality) and 1.0 (highest quality). Base this on thoughtfulness, use of detail, coherence, and originality. A one-word rant scores 0.1. A well-reasoned paragraph scores 0.9-1.0.
+    3. "reasoning": A very brief one-sentence explanation for your judgments.
+
+    Be strict. The goal is to create a more accurate aggregate score by downweighting unhelpful reviews.
+"""
+
+SINGLE_REVIEW_PROMPT = """
+    You are an expert film criticism analyst. Your task is to judge the quality and authenticity of user movie reviews to help filter out review bombing, spam, and low-effort content.
+
+    Analyze the given review text and respond STRICTLY with a valid JSON object containing only these three fields:""" + REVIEW_ANALYSIS_CRITERIA + """    RESPOND WITH A JSON OBJECT ONLY PLEASE
+    """
+
+BATCH_REVIEW_PROMPT = """
+    You are an expert film criticism analyst. Your task is to judge the quality and authenticity of user movie reviews to help filter out review bombing, spam, and low-effort content.
+
+    You will receive a JSON array of reviews, each with a "review_id" and a "text". Judge every review independently.
+    Respond STRICTLY with a valid JSON object of the form {"results": [...]}, with exactly one entry per review.
+    Each entry must contain "review_id" (copied unchanged from the input) and these three fields:""" + REVIEW_ANALYSIS_CRITERIA + """    RESPOND WITH A JSON OBJECT ONLY PLEASE
+    """
+
+# Changes whenever the prompts change, so verdicts from an older prompt are never reused
+PROMPT_VERSION = hashlib.sha256((SINGLE_REVIEW_PROMPT + BATCH_REVIEW_PROMPT).encode()).hexdigest()[:12]
+
+def estimate_tokens(text):
+    # Rough count (~4 characters per token for English) used only for batch sizing
+    return len(text) // 4 + 1
+
+def build_review_batches(reviews, token_budget=ANALYSIS_BATCH_TOKEN_BUDGET):
+    # Packs (review_id, review_text) pairs into batches that fit both the input budget and the response size limit
+    max_batch_size = max(1, ANALYSIS_MAX_OUTPUT_TOKENS // ANALYSIS_OUTPUT_TOKENS_PER_REVIEW)
+    batches = []
+    batch = []
+    batch_tokens = 0
+
+    for review_id, review_text in reviews:
+        tokens = estimate_tokens(review_text) + 10  # JSON framing per review
+        if batch and (batch_tokens + tokens > token_budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append((review_id, review_text))
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+def validate_analysis(analysis):
+    if not isinstance(analysis, dict):
+        return None
+
+    is_authentic = analysis.get('is_authentic')
+    quality_score = analysis.get('quality_score')
+    reasoning = analysis.get('reasoning', '')
+
+    if not isinstance(is_authentic, bool):
+        return None
+    if isinstance(quality_score, bool) or not isinstance(quality_score, (int, float)) or not 0 <= quality_score <= 1:
+        return None
+
+    return {
+        'is_authentic': is_authentic,
+        'quality_score': max(0.1, float(quality_score)),
+        'reasoning': str(reasoning)
+    }
+
+def normalize_review_text(text):
+    text = unicodedata.normalize('NFKC', text).casefold()
+    text = re.sub(r'([!?.])\1+', r'\1', text)
+    return ' '.join(text.split())
+
+def review_text_hash(text):
+    return hashlib.sha256(normalize_review_text(text).encode()).hexdigest()
+
+class VerdictCache:
+    # AI verdicts keyed by normalized review text, for one model and prompt version:
+    # an in-memory LRU in front of the verdict_cache table
+    def __init__(self, model=DEEPSEEK_MODEL, prompt_version=PROMPT_VERSION, max_size=VERDICT_CACHE_SIZE):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.max_size = max_size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        setup_verdict_cache_table()
+        self.invalidate_stale()
+
+    def invalidate_stale(self):
+        conn = get_thread_safe_connection()
+        cursor = conn.execute("DELETE FROM verdict_cache WHERE model != ? OR prompt_version != ?",
+                              (self.model, self.prompt_version))
+        conn.commit()
+        conn.close()
+        if cursor.rowcount > 0:
+            print(f"Invalidated {cursor.rowcount} cached verdicts from an older model or prompt.")
+
+    def remember(self, text_hash, verdict):
+        self.memory[text_hash] = verdict
+        self.memory.move_to_end(text_hash)
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def get_many(self, text_hashes):
+        found = {}
+        missing = []
+        with self.lock:
+            for text_hash in text_hashes:
+                if text_hash in self.memory:
+                    self.memory.move_to_end(text_hash)
+                    found[text_hash] = self.memory[text_hash]
+                else:
+                    missing.append(text_hash)
+            self.memory_hits += len(found)
+
+        if not missing:
+            return found
+
+        rows = []
+        conn = get_thread_safe_connection()
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            rows += conn.execute(f'''
+                SELECT text_hash, is_authentic, quality_score, reasoning
+                FROM verdict_cache
+                WHERE model = ? AND prompt_version = ? AND text_hash IN ({",".join("?" * len(chunk))})
+            ''', (self.model, self.prompt_version, *chunk)).fetchall()
+        conn.close()
+
+        with self.lock:
+            for text_hash, is_authentic, quality_score, reasoning in rows:
+                verdict = {'is_authentic': bool(is_authentic), 'quality_score': quality_score, 'reasoning': reasoning}
+                found[text_hash] = verdict
+                self.remember(text_hash, verdict)
+            self.disk_hits += len(rows)
+            self.misses += len(missing) - len(rows)
+        return found
+
+    def put_many(self, items, writer=None):
+        # Only well-formed verdicts are cached; API failures must be retried later.
+        # With a writer the table insert is queued with the analysis results instead of committed here.
+        rows = []
+        for text_hash, analysis in items:
+            verdict = validate_analysis(analysis)
+            if verdict and verdict['reasoning'] != ANALYSIS_FAILED_REASONING:
+                rows.append((text_hash, verdict))
+        if not rows:
+            return
+
+        with self.lock:
+            for text_hash, verdict in rows:
+                self.remember(text_hash, verdict)
+
+        if writer:
+            writer.submit_cache_rows(self, rows)
+        else:
+            conn = get_thread_safe_connection()
+            self.write_rows(conn, rows)
+            conn.commit()
+            conn.close()
+
+    def write_rows(self, conn, rows):
+        conn.executemany('''
+            INSERT OR REPLACE INTO verdict_cache
+            (text_hash, model, prompt_version, is_authentic, quality_score, reasoning)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (text_hash, self.model, self.prompt_version, v['is_authentic'], v['quality_score'], v['reasoning'])
+            for text_hash, v in rows
+        ])
+
+    def print_summary(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        if lookups:
+            hits = self.memory_hits + self.disk_hits
+            print(f"Verdict cache: {hits}/{lookups} hits ({hits / lookups * 100:.1f}%; "
+                  f"{self.memory_hits} memory, {self.disk_hits} disk), {self.misses} misses")
+
+verdict_cache = None
+verdict_cache_lock = threading.Lock()
+
+def get_verdict_cache():
+    global verdict_cache
+    with verdict_cache_lock:
+        if verdict_cache is None:
+            verdict_cache = VerdictCache()
+        return verdict_cache
+
+LOCAL_TRIAGE_REASONING_PREFIX = "Local triage: "
+LINK_PATTERN = re.compile(r'https?://|www\.|\.(com|net|org|ly)\b', re.IGNORECASE)
+CHARACTER_RUN_PATTERN = re.compile(r'(.)\1{3,}')
+
+def triage_features(text):
+    words = text.lower().split()
+    letters = sum(map(str.isalpha, text))
+    return {
+        'words': len(words),
+        'unique_ratio': len(set(words)) / len(words) if words else 0.0,
+        'caps_ratio': sum(map(str.isupper, text)) / letters if letters >= 10 else 0.0,
+        'has_link': bool(LINK_PATTERN.search(text)),
+        'character_runs': len(CHARACTER_RUN_PATTERN.findall(text)),
+    }
+
+def heuristic_spam_probability(features):
+    # Hand-weighted logistic model over the features above
+    words = features['words']
+    logit = -1.0 - 0.04 * min(words, 100)
+    logit += 3.0 * (words <= 3) + 1.5 * (words <= 8)
+    logit += 4.0 * (features['caps_ratio'] - 0.3)
+    logit += 4.0 * (1 - features['unique_ratio']) if words >= 8 else 0
+    logit += 3.0 * features['has_link']
+    logit += 0.5 * min(features['character_runs'], 4)
+    return 1 / (1 + math.exp(-logit))
+
+triage_classifier = None
+triage_classifier_lock = threading.Lock()
+
+def model_spam_probabilities(texts):
+    global triage_classifier
+    with triage_classifier_lock:
+        if triage_classifier is None:
+            from transformers import pipeline
+
+            triage_classifier = pipeline("text-classification", model=TRIAGE_MODEL, device=-1)
+        predictions = triage_classifier(texts, batch_size=TRIAGE_BATCH_SIZE, truncation=True)
+    return [p['score'] if p['label'].lower() == 'inauthentic' else 1 - p['score'] for p in predictions]
+
+def triage_reason(features):
+    if features['has_link']:
+        return "contains a link, likely spam."
+    if features['words'] <= 8:
+        return "very short, low-effort review."
+    if features['caps_ratio'] > 0.6:
+        return "mostly written in capitals."
+    if features['unique_ratio'] < 0.4:
+        return "highly repetitive text."
+    return "long, varied and coherent review."
+
+def triage_batch(texts, mode=TRIAGE_MODE):
+    # Returns a (verdict, confidence) pair per text
+    features = [triage_features(text) for text in texts]
+    if mode == "model":
+        spam_probabilities = model_spam_probabilities(texts)
+    elif mode == "heuristic":
+        spam_probabilities = [heuristic_spam_probability(f) for f in features]
+    else:
+        raise ValueError(f"Unknown triage mode: {mode}")
+
+    verdicts = []
+    for f, p_spam in zip(features, spam_probabilities):
+        is_authentic = p_spam < 0.5
+        if is_authentic:
+            # Length and vocabulary stand in for detail and thoughtfulness; short reviews stay ambiguous
+            confidence = (1 - p_spam) * min(1.0, f['words'] / TRIAGE_CONFIDENT_WORDS)
+            quality_score = 0.3 + 0.5 * min(1.0, f['words'] / 150) + 0.2 * f['unique_ratio']
+        else:
+            confidence = p_spam
+            quality_score = 0.1
+        verdicts.append(({
+            'is_authentic': is_authentic,
+            'quality_score': round(min(1.0, quality_score), 2),
+            'reasoning': LOCAL_TRIAGE_REASONING_PREFIX + triage_reason(f)
+        }, confidence))
+    return verdicts
+
+@timed_stage('triage', lambda result: len(result[0]) + len(result[1]))
+def triage_reviews(reviews, threshold=TRIAGE_CONFIDENCE_THRESHOLD, mode=TRIAGE_MODE, settle_authentic=TRIAGE_SETTLE_AUTHENTIC):
+    # Splits (review_id, text) pairs into locally resolved (review_id, verdict) results and ambiguous reviews.
+    # Text features can't tell a fluent review bomb from a real review, so by default only spam and junk are
+    # settled here and anything that looks authentic still goes to the LLM
+    if mode == "off":
+        return [], list(reviews)
+
+    resolved = []
+    ambiguous = []
+    for i in range(0, len(reviews), TRIAGE_BATCH_SIZE):
+        chunk = reviews[i:i + TRIAGE_BATCH_SIZE]
+        for review, (verdict, confidence) in zip(chunk, triage_batch([text for _, text in chunk], mode)):
+            if confidence >= threshold and (settle_authentic or not verdict['is_authentic']):
+                resolved.append((review[0], verdict))
+            else:
+                ambiguous.append(review)
+    return resolved, ambiguous
+
+def triage_report(sample_size=500, thresholds=(0.8, 0.9, 0.95, 0.99), mode=TRIAGE_MODE):
+    # Replays triage on reviews the LLM already judged and compares the verdicts at several thresholds
+    conn = sqlite3.connect(DB_NAME)
+    sample = conn.execute('''
+        SELECT r.id, r.review_text, a.is_authentic, a.quality_score
+        FROM ai_analysis a
+        JOIN reviews r ON r.id = a.review_id
+        WHERE a.quality_score IS NOT NULL AND a.reasoning NOT IN (?, ?, ?) AND a.reasoning NOT LIKE ?
+        ORDER BY RANDOM()
+        LIMIT ?
+    ''', (ANALYSIS_FAILED_REASONING, ANALYSIS_RETRY_REASONING, ANALYSIS_IN_PROGRESS_REASONING,
+          LOCAL_TRIAGE_REASONING_PREFIX + '%', sample_size)).fetchall()
+    conn.close()
+
+    if not sample:
+        print("No LLM-analyzed reviews to compare against.")
+        return {}
+
+    labels = {review_id: (bool(is_authentic), quality_score) for review_id, _, is_authentic, quality_score in sample}
+    reviews = [(review_id, text) for review_id, text, _, _ in sample]
+
+    print(f"Triage ({mode}) vs LLM verdicts on {len(sample)} labeled reviews "
+          f"(authentic shortcut {'on' if TRIAGE_SETTLE_AUTHENTIC else 'off'}):")
+    report = {}
+    for threshold in thresholds:
+        resolved, _ = triage_reviews(reviews, threshold, mode, settle_authentic=True)
+        report[threshold] = {}
+        # Spam verdicts are always settled locally; authentic ones only with TRIAGE_SETTLE_AUTHENTIC
+        for kind, is_authentic in (('inauthentic', False), ('authentic', True)):
+            settled = [(review_id, verdict) for review_id, verdict in resolved if verdict['is_authentic'] == is_authentic]
+            agreed = sum(labels[review_id][0] == is_authentic for review_id, _ in settled)
+            quality_error = sum(abs(verdict['quality_score'] - labels[review_id][1]) for review_id, verdict in settled)
+            report[threshold][kind] = {
+                'api_calls_avoided': len(settled) / len(sample),
+                'authenticity_agreement': agreed / len(settled) if settled else None,
+                'mean_quality_error': quality_error / len(settled) if settled else None,
+            }
+            stats = report[threshold][kind]
+            print(f"  threshold {threshold:.2f}, {kind:<11}: {len(settled)} resolved locally "
+                  f"({stats['api_calls_avoided'] * 100:.1f}% of API calls avoided), "
+                  f"authenticity agreement {format_percent(stats['authenticity_agreement'] * 100 if settled else None)}, "
+                  f"mean quality error {stats['mean_quality_error'] or 0:.3f}")
+    return report
+
+def record_api_response(response, seconds):
+    metrics.observe('deepseek_request', seconds)
+    metrics.count('api_requests')
+    usage = getattr(response, 'usage', None)
+    if usage:
+        metrics.count('prompt_tokens', usage.prompt_tokens or 0)
+        metrics.count('completion_tokens', usage.completion_tokens or 0)
+
+def analyze_single_review(review_text):
+    # Returns a validated verdict, or raises RetryableAnalysisError so the review is retried next run
+    # (the client itself retries rate limits and server errors, waiting out any Retry-After)
+    try:
+        request_start = time.perf_counter()
+        response = get_deepseek_client().chat.completions.create(
+            model=DEEPSEEK_MODEL,
+            messages=[
+                {"role": "system", "content": SINGLE_REVIEW_PROMPT},
+                {"role": "user", "content": f"REVIEW TEXT: {review_text}"}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1
+        )
+        record_api_response(response, time.perf_counter() - request_start)
         
-        # Add the new sections
+        analysis_result = validate_analysis(json.loads(response.choices[0].message.content))
+    except Exception as e:
+        metrics.count('api_errors')
+        print(f"\nDeepSeek API error for review: {e}")
+        raise RetryableAnalysisError(str(e))
+
+    if not analysis_result:
+        metrics.count('api_errors')
+        raise RetryableAnalysisError("malformed analysis")
+    return analysis_result
+
+def analyze_review_batch(batch):
+    # Returns {review_id: analysis} for the reviews the model answered validly; callers retry the rest individually
+    if len(batch) == 1:
+        return {}
+
+    payload = json.dumps([{"review_id": review_id, "text": review_text} for review_id, review_text in batch])
+    expected_ids = {review_id for review_id, _ in batch}
+
+    try:
+        request_start = time.perf_counter()
+        response = get_deepseek_client().chat.completions.create(
+            model=DEEPSEEK_MODEL,
+            messages=[
+                {"role": "system", "content": BATCH_REVIEW_PROMPT},
+                {"role": "user", "content": f"REVIEWS: {payload}"}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1,
+            max_tokens=min(ANALYSIS_MAX_OUTPUT_TOKENS, ANALYSIS_OUTPUT_TOKENS_PER_REVIEW * len(batch) + 100)
+        )
+        record_api_response(response, time.perf_counter() - request_start)
+        results = json.loads(response.choices[0].message.content).get('results')
+    except Exception as e:
+        metrics.count('api_errors')
+        print(f"\nDeepSeek API error for batch of {len(batch)} reviews: {e}")
+        return {}
+
+    analyses = {}
+    for item in results if isinstance(results, list) else []:
+        if not isinstance(item, dict):
+            continue
+        review_id = item.get('review_id')
+        if isinstance(review_id, str) and review_id.isdigit():
+            review_id = int(review_id)
+        analysis = validate_analysis(item)
+        if review_id in expected_ids and review_id not in analyses and analysis:
+            analyses[review_id] = analysis
+    return analyses
+
+def save_analysis_results(conn, results):
+    conn.executemany('''
+        UPDATE ai_analysis 
+        SET is_authentic = ?, quality_score = ?, reasoning = ?, lease_owner = NULL, lease_expires_at = NULL
+        WHERE review_id = ?
+    ''', [
+        (analysis['is_authentic'], analysis['quality_score'], analysis['reasoning'], review_id)
+        for review_id, analysis in results
+    ])
+
+def mark_analysis_retryable(conn, review_ids):
+    # Failed reviews keep NULL scores so they never count towards a score, and are picked up again next run
+    conn.executemany('''
+        UPDATE ai_analysis
+        SET is_authentic = NULL, quality_score = NULL, reasoning = ?, lease_owner = NULL, lease_expires_at = NULL
+        WHERE review_id = ?
+    ''', [(ANALYSIS_RETRY_REASONING, review_id) for review_id in review_ids])
+
+class AnalysisResultWriter:
+    # The only thread that writes analysis results. Producers queue results and it commits them with
+    # executemany, one transaction per flush, whenever DB_WRITE_BATCH_SIZE rows are waiting or
+    # DB_FLUSH_INTERVAL seconds have passed. Each flush is atomic, so after a crash every review is
+    # either fully written or still 'Analysis in progress' and gets picked up once its lease expires.
+    # Given lease_movie_id, it keeps this run's leases on that movie's pending reviews alive.
+    def __init__(self, batch_size=DB_WRITE_BATCH_SIZE, flush_interval=DB_FLUSH_INTERVAL, lease_movie_id=None,
+                 lease_seconds=ANALYSIS_LEASE_SECONDS):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lease_movie_id = lease_movie_id
+        self.lease_seconds = lease_seconds
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="analysis-writer", daemon=True)
+        self.commits = 0
+        self.rows_written = 0
+        self.error = None
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, results):
+        if results:
+            self.queue.put(('results', results))
+
+    def submit_retryable(self, review_ids):
+        if review_ids:
+            self.queue.put(('retry', review_ids))
+
+    def submit_cache_rows(self, cache, rows):
+        self.queue.put(('cache', (cache, rows)))
+
+    def run(self):
+        conn = get_writer_connection()
+        results, retries, cache_rows = [], [], []
+        last_flush = last_renewal = time.monotonic()
+        running = True
+        try:
+            while running:
+                if self.lease_movie_id is not None and time.monotonic() - last_renewal >= self.lease_seconds / 3:
+                    self.renew_leases(conn)
+                    last_renewal = time.monotonic()
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                else:
+                    if item is None:
+                        running = False
+                    else:
+                        kind, payload = item
+                        if kind == 'results':
+                            results += payload
+                        elif kind == 'retry':
+                            retries += payload
+                        else:
+                            cache_rows.append(payload)
+
+                pending = len(results) + len(retries)
+                due = time.monotonic() - last_flush >= self.flush_interval
+                if (pending or cache_rows) and (pending >= self.batch_size or due or not running):
+                    self.flush(conn, results, retries, cache_rows)
+                    results, retries, cache_rows = [], [], []
+                if due or not running:
+                    last_flush = time.monotonic()
+        except Exception as e:
+            self.error = e
+            # Keep draining so producers never block on a dead writer
+            while self.queue.get() is not None:
+                pass
+        finally:
+            conn.close()
+
+    def flush(self, conn, results, retries, cache_rows):
+        flush_start = time.perf_counter()
+        with conn:
+            save_analysis_results(conn, results)
+            mark_analysis_retryable(conn, retries)
+            for cache, rows in cache_rows:
+                cache.write_rows(conn, rows)
+        metrics.observe('db_commit', time.perf_counter() - flush_start)
+        metrics.count('db_commits')
+        self.commits += 1
+        self.rows_written += len(results) + len(retries)
+
+    def renew_leases(self, conn):
+        with conn:
+            conn.execute(RENEW_LEASES_QUERY, (time.time() + self.lease_seconds, self.lease_movie_id, RUN_ID,
+                                              ANALYSIS_IN_PROGRESS_REASONING))
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.error:
+            raise self.error
+
+class RetryableAnalysisError(Exception):
+    pass
+
+class AdaptiveConcurrencyLimiter:
+    # AIMD: the limit grows by ~1 per round of successful requests and halves on a rate limit
+    # (at most once per cooldown, so a burst of 429s from one round only counts once)
+    def __init__(self, initial=ANALYSIS_INITIAL_CONCURRENCY, minimum=1, maximum=ANALYSIS_MAX_CONCURRENCY, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.peak = 0
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    async def release(self, rate_limited=False):
+        async with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if rate_limited:
+                if now - self.last_decrease >= self.cooldown and self.limit > self.minimum:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.last_decrease = now
+                    metrics.count('concurrency_backoffs')
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+def parse_retry_after(headers):
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, retry_after=None):
+    # Full jitter exponential backoff; a server-provided Retry-After is the minimum wait
+    delay = random.uniform(0, min(ANALYSIS_BACKOFF_CAP, ANALYSIS_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, ANALYSIS_BACKOFF_BASE)
+    return delay
+
+class AsyncAnalysisEngine:
+    def __init__(self, client, limiter=None):
+        self.client = client
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    async def request_json(self, system_prompt, user_content, max_tokens=None):
+        # Returns the parsed JSON reply, or raises RetryableAnalysisError once the attempts are used up.
+        # Only rate limits, server errors and dropped connections are retried here: a malformed or empty
+        # reply (e.g. a batch cut off at max_tokens) comes back the same way at this temperature, so it
+        # fails at once and a batch falls back to single reviews.
+        from openai import APIConnectionError, APIError, APIStatusError, APITimeoutError, RateLimitError
+
+        extra = {'max_tokens': max_tokens} if max_tokens else {}
+        last_error = None
+
+        for attempt in range(ANALYSIS_MAX_ATTEMPTS):
+            if attempt:
+                self.retries += 1
+                metrics.count('api_retries')
+            await self.limiter.acquire()
+            rate_limited = False
+            retry_after = None
+            try:
+                self.requests += 1
+                request_start = time.perf_counter()
+                response = await self.client.chat.completions.create(
+                    model=DEEPSEEK_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_content}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.1,
+                    **extra
+                )
+                record_api_response(response, time.perf_counter() - request_start)
+                return json.loads(response.choices[0].message.content)
+            except (json.JSONDecodeError, TypeError, IndexError, AttributeError) as e:
+                metrics.count('api_errors')
+                raise RetryableAnalysisError(f"malformed reply: {e}")
+            except RateLimitError as e:
+                rate_limited = True
+                self.rate_limited += 1
+                metrics.count('api_rate_limited')
+                retry_after = parse_retry_after(e.response.headers)
+                last_error = e
+            except APIStatusError as e:
+                if e.status_code < 500:
+                    metrics.count('api_errors')
+                    raise RetryableAnalysisError(f"HTTP {e.status_code}: {e.message}")
+                retry_after = parse_retry_after(e.response.headers)
+                last_error = e
+            except (APITimeoutError, APIConnectionError) as e:
+                last_error = e
+            except APIError as e:
+                metrics.count('api_errors')
+                raise RetryableAnalysisError(str(e))
+            finally:
+                await self.limiter.release(rate_limited)
+
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+        metrics.count('api_errors')
+        raise RetryableAnalysisError(f"gave up after {ANALYSIS_MAX_ATTEMPTS} attempts: {last_error}")
+
+    async def analyze_single(self, review_text):
+        analysis = validate_analysis(await self.request_json(SINGLE_REVIEW_PROMPT, f"REVIEW TEXT: {review_text}"))
+        if not analysis:
+            metrics.count('api_errors')
+            raise RetryableAnalysisError("malformed analysis")
+        return analysis
+
+    async def analyze_batch(self, batch):
+        payload = json.dumps([{"review_id": review_id, "text": review_text} for review_id, review_text in batch])
+        expected_ids = {review_id for review_id, _ in batch}
+        try:
+            reply = await self.request_json(
+                BATCH_REVIEW_PROMPT, f"REVIEWS: {payload}",
+                max_tokens=min(ANALYSIS_MAX_OUTPUT_TOKENS, ANALYSIS_OUTPUT_TOKENS_PER_REVIEW * len(batch) + 100)
+            )
+        except Exception as e:
+            print(f"\nDeepSeek API error for batch of {len(batch)} reviews: {e}")
+            return {}
+
+        results = reply.get('results') if isinstance(reply, dict) else None
+        analyses = {}
+        for item in results if isinstance(results, list) else []:
+            if not isinstance(item, dict):
+                continue
+            review_id = item.get('review_id')
+            if isinstance(review_id, str) and review_id.isdigit():
+                review_id = int(review_id)
+            analysis = validate_analysis(item)
+            if review_id in expected_ids and review_id not in analyses and analysis:
+                analyses[review_id] = analysis
+        return analyses
+
+    async def analyze_unit(self, batch, on_results):
+        analyses = await self.analyze_batch(batch) if len(batch) > 1 else {}
+        missing = [(review_id, review_text) for review_id, review_text in batch if review_id not in analyses]
+
+        singles = await asyncio.gather(*(self.analyze_single(review_text) for _, review_text in missing),
+                                       return_exceptions=True)
+        # Any other error stays with its review, which is left retryable, so it can't abort the other units
+        failed = []
+        for (review_id, _), analysis in zip(missing, singles):
+            if isinstance(analysis, Exception):
+                if not isinstance(analysis, RetryableAnalysisError):
+                    metrics.count('api_errors')
+                    print(f"\nDeepSeek API error for review: {analysis}")
+                failed.append(review_id)
+            elif isinstance(analysis, BaseException):
+                raise analysis
+            else:
+                analyses[review_id] = analysis
+
+        on_results(list(analyses.items()), failed)
+
+    async def run(self, units, on_results):
+        await asyncio.gather(*(self.analyze_unit(batch, on_results) for batch in units))
+
+    def print_summary(self):
+        print(f"Async analysis: {self.requests} requests, {self.retries} retries "
+              f"({self.rate_limited} rate-limited), peak concurrency {self.limiter.peak}, "
+              f"final limit {self.limiter.limit:.1f}")
+
+def create_async_deepseek_client():
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=os.getenv("DEEPSEEK_API_KEY"), base_url=DEEPSEEK_BASE_URL,
+                       max_retries=0, timeout=ANALYSIS_REQUEST_TIMEOUT)
+
+async def analyze_pending_async(pending, batch_mode, on_results, client=None):
+    # Without a client one is created inside the running loop, because its connection pool is bound to it
+    owns_client = client is None
+    if owns_client:
+        client = create_async_deepseek_client()
+    engine = AsyncAnalysisEngine(client)
+    units = build_review_batches(pending) if batch_mode else [[review] for review in pending]
+    try:
+        await engine.run(units, on_results)
+    finally:
+        if owns_client:
+            await client.close()
+    engine.print_summary()
+    return engine
+
+class AsyncAnalysisLoop:
+    # An event loop thread with one AsyncOpenAI client that every async analysis in the process shares,
+    # so a long-running process keeps its DeepSeek connections warm instead of rebuilding them per movie
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="analysis-loop", daemon=True)
+        self.thread.start()
+        self.client = self.run(self.create_client())
+
+    async def create_client(self):
+        return create_async_deepseek_client()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self.run(self.client.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+async_analysis_loop = None
+
+PENDING_ANALYSIS_QUERY = '''
+    SELECT r.id, r.review_text 
+    FROM reviews r 
+    LEFT JOIN ai_analysis a ON r.id = a.review_id 
+    WHERE r.movie_id = ? AND (a.review_id IS NULL OR a.reasoning = ?
+                              OR (a.reasoning = ? AND COALESCE(a.lease_expires_at, 0) < ?))
+    ORDER BY r.id  -- Ensure we process in order
+'''
+
+CLAIM_ANALYSIS_QUERY = '''
+    INSERT INTO ai_analysis
+    (review_id, movie_id, is_authentic, quality_score, reasoning, lease_owner, lease_expires_at)
+    VALUES (?, ?, NULL, NULL, ?, ?, ?)
+    ON CONFLICT(review_id) DO UPDATE SET
+        reasoning = excluded.reasoning, lease_owner = excluded.lease_owner, lease_expires_at = excluded.lease_expires_at
+'''
+
+RENEW_LEASES_QUERY = '''
+    UPDATE ai_analysis SET lease_expires_at = ?
+    WHERE movie_id = ? AND lease_owner = ? AND reasoning = ?
+'''
+
+def claim_pending_reviews(movie_id, lease_seconds=ANALYSIS_LEASE_SECONDS):
+    # Selecting and leasing happen in one write transaction, so concurrent runs never claim the same review
+    conn = get_writer_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        reviews = conn.execute(PENDING_ANALYSIS_QUERY, (
+            movie_id, ANALYSIS_RETRY_REASONING, ANALYSIS_IN_PROGRESS_REASONING, now
+        )).fetchall()
+        conn.executemany(CLAIM_ANALYSIS_QUERY, [
+            (review_id, movie_id, ANALYSIS_IN_PROGRESS_REASONING, RUN_ID, now + lease_seconds)
+            for review_id, _ in reviews
+        ])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return reviews
+
+def count_leased_elsewhere(movie_id):
+    conn = sqlite3.connect(DB_NAME)
+    count = conn.execute('''
+        SELECT COUNT(*) FROM ai_analysis
+        WHERE movie_id = ? AND reasoning = ? AND lease_owner IS NOT ? AND lease_expires_at >= ?
+    ''', (movie_id, ANALYSIS_IN_PROGRESS_REASONING, RUN_ID, time.time())).fetchone()[0]
+    conn.close()
+    return count
+
+@timed_stage('analyze', lambda analyzed: analyzed)
+def analyze_reviews_with_ai(movie_id, batch_mode=ANALYSIS_BATCH_MODE, engine=ANALYSIS_ENGINE):
+    from tqdm import tqdm
+
+    print("Starting parallel AI analysis of reviews (ordered)...")
+    setup_ai_analysis_table()
+
+    # Retryable rows, and rows left 'Analysis in progress' by a run whose lease expired, are picked up again
+    reviews_to_analyze = claim_pending_reviews(movie_id)
+    
+    print(f"Found {len(reviews_to_analyze)} reviews to analyze...")
+
+    # Answer repeated review text from the verdict cache, and send each distinct text to the API only once
+    cache = get_verdict_cache()
+    text_hashes = {review_id: review_text_hash(review_text) for review_id, review_text in reviews_to_analyze}
+    cached_verdicts = cache.get_many(list(dict.fromkeys(text_hashes.values())))
+
+    cached_results = []
+    uncached = []
+    for review_id, review_text in reviews_to_analyze:
+        text_hash = text_hashes[review_id]
+        if text_hash in cached_verdicts:
+            cached_results.append((review_id, cached_verdicts[text_hash]))
+        else:
+            uncached.append((review_id, review_text))
+
+    # Obviously spammy or obviously fine reviews are judged locally; only ambiguous ones reach the API
+    triaged_results, ambiguous = triage_reviews(uncached)
+    if TRIAGE_MODE != "off":
+        print(f"Local triage resolved {len(triaged_results)} of {len(uncached)} reviews "
+              f"({format_percent(len(triaged_results) / len(uncached) * 100 if uncached else None)}) without the API.")
+
+    pending = []
+    repeats = []
+    pending_hashes = set()
+    for review_id, review_text in ambiguous:
+        text_hash = text_hashes[review_id]
+        if text_hash in pending_hashes:
+            repeats.append((review_id, review_text))
+        else:
+            pending_hashes.add(text_hash)
+            pending.append((review_id, review_text))
+
+    print(f"{len(cached_results)} reviews answered from the verdict cache, {len(pending)} sent for analysis.")
+
+    failed_ids = []
+
+    # Leaving this block, including on an exception or Ctrl-C, flushes every queued result
+    with AnalysisResultWriter(lease_movie_id=movie_id) as writer:
+        writer.submit(cached_results)
+        writer.submit(triaged_results)
+
+        def process_review(review_data):
+            review_id, review_text = review_data
+            try:
+                analysis = analyze_single_review(review_text)
+            except RetryableAnalysisError:
+                writer.submit_retryable([review_id])
+                failed_ids.append(review_id)
+                return review_id
+
+            writer.submit([(review_id, analysis)])
+            cache.put_many([(text_hashes[review_id], analysis)], writer)
+            return review_id
+
+        def process_batch(batch):
+            analyses = analyze_review_batch(batch)
+            fallbacks = 0
+            results = []
+            failed = []
+            for review_id, review_text in batch:
+                analysis = analyses.get(review_id)
+                if analysis is None:
+                    fallbacks += 1
+                    try:
+                        analysis = analyze_single_review(review_text)
+                    except RetryableAnalysisError:
+                        failed.append(review_id)
+                        continue
+                results.append((review_id, analysis))
+            writer.submit(results)
+            cache.put_many([(text_hashes[review_id], analysis) for review_id, analysis in results], writer)
+            writer.submit_retryable(failed)
+            failed_ids.extend(failed)
+            return len(batch), fallbacks
+
+        max_workers = 5
+        if engine == "async":
+            with tqdm(total=len(pending), desc="Analyzing reviews") as pbar:
+                def on_results(results, failed):
+                    writer.submit(results)
+                    cache.put_many([(text_hashes[review_id], analysis) for review_id, analysis in results], writer)
+                    writer.submit_retryable(failed)
+                    failed_ids.extend(failed)
+                    pbar.update(len(results) + len(failed))
+
+                if async_analysis_loop:
+                    async_analysis_loop.run(analyze_pending_async(pending, batch_mode, on_results,
+                                                                  async_analysis_loop.client))
+                else:
+                    asyncio.run(analyze_pending_async(pending, batch_mode, on_results))
+        elif engine == "threads":
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                if batch_mode:
+                    batches = build_review_batches(pending)
+                    print(f"Sending {len(pending)} reviews in {len(batches)} batched requests...")
+                    fallbacks = 0
+                    with tqdm(total=len(pending), desc="Analyzing reviews") as pbar:
+                        for batch_size, batch_fallbacks in executor.map(process_batch, batches):
+                            fallbacks += batch_fallbacks
+                            pbar.update(batch_size)
+                    if fallbacks:
+                        print(f"{fallbacks} reviews were missing or malformed in batched responses and were analyzed individually.")
+                else:
+                    results = list(tqdm(executor.map(process_review, pending), 
+                                      total=len(pending), desc="Analyzing reviews"))
+        else:
+            raise ValueError(f"Unknown analysis engine: {engine}")
+
+        if repeats:
+            repeat_verdicts = cache.get_many([text_hashes[review_id] for review_id, _ in repeats])
+            writer.submit([(review_id, repeat_verdicts[text_hashes[review_id]])
+                           for review_id, _ in repeats if text_hashes[review_id] in repeat_verdicts])
+            unresolved = [review for review in repeats if text_hashes[review[0]] not in repeat_verdicts]
+            # Their text failed to analyze this run, so they are retried with it next run
+            writer.submit_retryable([review_id for review_id, _ in unresolved])
+            failed_ids.extend(review_id for review_id, _ in unresolved)
+
+    print(f"Wrote {writer.rows_written} analysis results in {writer.commits} commits.")
+    cache.print_summary()
+    if failed_ids:
+        print(f"{len(failed_ids)} reviews could not be analyzed and will be retried on the next run.")
+    leased = count_leased_elsewhere(movie_id)
+    if leased:
+        print(f"{leased} reviews are leased by another run; they are picked up once its lease expires.")
+    print(f"AI analysis complete! Analyzed {len(reviews_to_analyze) - len(failed_ids)} reviews")
+    return len(reviews_to_analyze) - len(failed_ids)
+
+def analyze_movie(movie_id, analyzed_while_scraping=0):
+    # The run stays in the 'analyze' stage while another run still holds leases on this movie's reviews
+    ledger = RunLedger(movie_id)
+    ledger.begin('analyze')
+    try:
+        analyzed = analyze_reviews_with_ai(movie_id)
+    except Exception as e:
+        ledger.fail(f"{type(e).__name__}: {e}")
+        raise
+    ledger.finish('analyze' if count_leased_elsewhere(movie_id) else 'done', analyzed + analyzed_while_scraping)
+    record_score_snapshot(movie_id)
+    return analyzed + analyzed_while_scraping
+
+def process_movie(movie_title, movie_url, backend=SCRAPE_BACKEND, driver_pool=None):
+    # Scrapes and analyzes one movie with the stages overlapping: reviews stream from the scraper into the
+    # database and on to analysis, so the first verdicts arrive while later pages are still loading
+    with StreamingAnalyzer() as analyzer:
+        scraped = scrape_movie(movie_title, movie_url, backend, driver_pool, on_saved=analyzer.submit)
+    if scraped and scraped[1]:
+        analyze_movie(scraped[0], analyzer.analyzed)
+    return scraped
+
+def sanitized_score_from_sums(weighted_sum, total_weight):
+    if total_weight > 0:
+        return round((weighted_sum / total_weight) * 20, 2)
+    return 0
+
+def rt_score_from_counts(fresh, total):
+    if total > 0:
+        return round((fresh / total) * 100, 2)
+    return None
+
+MOVIE_SCORES_QUERY = f"SELECT {', '.join(SCORE_COLUMNS)} FROM movie_scores WHERE movie_id = ?"
+
+@dataclass
+class QualityBucket:
+    label: str
+    count: int
+    avg_quality: float
+
+@dataclass
+class MovieResults:
+    movie_id: int
+    title: str
+    rated_reviews: int
+    fresh_reviews: int
+    total_reviews: int  # reviews with an AI verdict
+    authentic_count: int
+    inauthentic_count: int
+    rt_score: float = None
+    sanitized_score: float = None
+    avg_original_rating: float = None
+    avg_quality_score: float = None
+    total_weight: float = 0.0
+    weighted_sum: float = 0.0
+    near_duplicate_reviews: int = 0  # left out of the sanitized score as copies of an earlier review
+    distribution: list = field(default_factory=list)
+
+    @property
+    def raw_avg_percent(self):
+        return self.avg_original_rating * 20 if self.avg_original_rating is not None else None
+
+    @property
+    def avg_quality_percent(self):
+        return self.avg_quality_score * 100 if self.avg_quality_score is not None else None
+
+    def to_dict(self):
+        return dict(asdict(self), raw_avg_percent=self.raw_avg_percent, avg_quality_percent=self.avg_quality_percent)
+
+def movie_results_from_scores(movie_id, movie_title, scores):
+    distribution = []
+    for index, (label, _) in enumerate(QUALITY_BUCKETS):
+        count = int(scores[f'bucket_{index}_count'])
+        if count:
+            distribution.append(QualityBucket(label, count, scores[f'bucket_{index}_quality_sum'] / count))
+    distribution.sort(key=lambda bucket: bucket.avg_quality, reverse=True)
+
+    analyzed = int(scores['analyzed_reviews'])
+    analyzed_rated = int(scores['analyzed_rated_reviews'])
+
+    return MovieResults(
+        movie_id=movie_id,
+        title=movie_title,
+        rated_reviews=int(scores['rated_reviews']),
+        fresh_reviews=int(scores['fresh_reviews']),
+        total_reviews=analyzed,
+        authentic_count=int(scores['authentic_count']),
+        inauthentic_count=int(scores['inauthentic_count']),
+        rt_score=rt_score_from_counts(scores['fresh_reviews'], scores['rated_reviews']),
+        sanitized_score=sanitized_score_from_sums(scores['weighted_sum'], scores['total_weight']) if analyzed_rated else None,
+        avg_original_rating=scores['analyzed_rating_sum'] / analyzed_rated if analyzed_rated else None,
+        avg_quality_score=scores['quality_sum'] / analyzed if analyzed else None,
+        total_weight=scores['total_weight'],
+        weighted_sum=scores['weighted_sum'],
+        near_duplicate_reviews=int(scores['near_duplicate_reviews']),
+        distribution=distribution
+    )
+
+@timed_stage('score')
+def compute_movie_results(movie_id, movie_title, conn=None):
+    # O(1): reads the movie's running sums from movie_scores
+    owns_conn = conn is None
+    if owns_conn:
+        conn = sqlite3.connect(DB_NAME)
+    row = conn.execute(MOVIE_SCORES_QUERY, (movie_id,)).fetchone()
+    if owns_conn:
+        conn.close()
+
+    scores = dict(zip(SCORE_COLUMNS, row or [0] * len(SCORE_COLUMNS)))
+    return movie_results_from_scores(movie_id, movie_title, scores)
+
+def get_movie_results(movie_title):
+    conn = sqlite3.connect(DB_NAME)
+    movie_row = conn.execute("SELECT id FROM movies WHERE title = ?", (movie_title,)).fetchone()
+    results = compute_movie_results(movie_row[0], movie_title, conn) if movie_row else None
+    conn.close()
+    return results
+
+def calculate_sanitized_score(movie_id):
+    return compute_movie_results(movie_id, None).sanitized_score
+
+def calculate_rt_audience_score(movie_id):
+    return compute_movie_results(movie_id, None).rt_score
+
+def rebuild_movie_scores(conn, movie_id=None):
+    where = "WHERE r.movie_id = ?" if movie_id is not None else ""
+    params = (movie_id,) if movie_id is not None else ()
+    with conn:
+        conn.execute(f"DELETE FROM movie_scores {'WHERE movie_id = ?' if movie_id is not None else ''}", params)
+        conn.execute(f"INSERT INTO movie_scores (movie_id, {', '.join(SCORE_COLUMNS)}) "
+                     f"{score_rebuild_query(where)}", params)
+
+def check_movie_scores(movie_id=None, repair=False, tolerance=1e-6):
+    # Recomputes every movie's sums from scratch and diffs them against the incremental values.
+    # Returns {movie_id: {column: (stored, rebuilt)}} for every mismatch.
+    conn = sqlite3.connect(DB_NAME)
+    where = "WHERE r.movie_id = ?" if movie_id is not None else ""
+    params = (movie_id,) if movie_id is not None else ()
+
+    rebuilt = {row[0]: dict(zip(SCORE_COLUMNS, row[1:]))
+               for row in conn.execute(score_rebuild_query(where), params)}
+    stored = {row[0]: dict(zip(SCORE_COLUMNS, row[1:]))
+              for row in conn.execute(f"SELECT movie_id, {', '.join(SCORE_COLUMNS)} FROM movie_scores "
+                                      f"{'WHERE movie_id = ?' if movie_id is not None else ''}", params)}
+
+    zeros = dict.fromkeys(SCORE_COLUMNS, 0)
+    mismatches = {}
+    for checked_id in rebuilt.keys() | stored.keys():
+        expected = rebuilt.get(checked_id, zeros)
+        actual = stored.get(checked_id, zeros)
+        diff = {column: (actual[column], expected[column]) for column in SCORE_COLUMNS
+                if abs((actual[column] or 0) - (expected[column] or 0)) > tolerance * max(1, abs(expected[column] or 0))}
+        if diff:
+            mismatches[checked_id] = diff
+
+    print(f"Checked movie_scores for {len(rebuilt.keys() | stored.keys())} movies: {len(mismatches)} inconsistent.")
+    for checked_id, diff in sorted(mismatches.items()):
+        details = ", ".join(f"{column} stored {a} vs rebuilt {b}" for column, (a, b) in diff.items())
+        print(f"  movie {checked_id}: {details}")
+
+    if mismatches and repair:
+        rebuild_movie_scores(conn, movie_id)
+        print("Rebuilt movie_scores from the reviews and ai_analysis tables.")
+    conn.close()
+    return mismatches
+
+SCORE_SNAPSHOT_COLUMNS = ('rt_score', 'sanitized_score', 'rated_reviews', 'analyzed_reviews', 'authentic_count',
+                          'inauthentic_count', 'near_duplicate_reviews')
+
+SCORE_HISTORY_QUERY = f'''
+    SELECT taken_at, {', '.join(SCORE_SNAPSHOT_COLUMNS)} FROM score_snapshots
+    WHERE movie_id = ? AND taken_at >= ? AND taken_at < ?
+    ORDER BY taken_at
+'''
+
+# Every review's score contributions in date order, over one range of the (movie_id, created_at) index
+ROLLING_SCORES_QUERY = f'''
+    SELECT CAST((r.created_at - ?1) / ?2 AS INTEGER) AS bucket, {", ".join(f"SUM({term})" for term in review_score_terms())}
+    FROM reviews r
+    LEFT JOIN ai_analysis a ON r.id = a.review_id
+    WHERE r.movie_id = ?3 AND r.created_at >= ?1 AND r.created_at < ?4
+    GROUP BY bucket
+'''
+
+INAUTHENTIC_VOLUME_QUERY = f'''
+    SELECT CAST(r.created_at / ? AS INTEGER) AS bucket, COUNT(*),
+           SUM({NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS['inauthentic_count'].format(q='a.quality_score', a='a.is_authentic', r='r.original_rating')})
+    FROM reviews r
+    LEFT JOIN ai_analysis a ON r.id = a.review_id
+    WHERE r.movie_id = ? AND r.created_at >= ? AND r.created_at < ?
+    GROUP BY bucket
+    ORDER BY bucket
+'''
+
+REVIEW_DATE_RANGE_QUERY = '''
+    SELECT (SELECT created_at FROM reviews WHERE movie_id = ?1 AND created_at IS NOT NULL ORDER BY created_at LIMIT 1),
+           (SELECT created_at FROM reviews WHERE movie_id = ?1 AND created_at IS NOT NULL ORDER BY created_at DESC LIMIT 1)
+'''
+
+def record_score_snapshot(movie_id, taken_at=None):
+    results = compute_movie_results(movie_id, None)
+    row = {**results.to_dict(), 'analyzed_reviews': results.total_reviews}
+    conn = get_writer_connection()
+    with conn:
+        conn.execute(f"INSERT OR REPLACE INTO score_snapshots (movie_id, taken_at, run_id, {', '.join(SCORE_SNAPSHOT_COLUMNS)}) "
+                     f"VALUES (?, ?, ?, {', '.join('?' * len(SCORE_SNAPSHOT_COLUMNS))})",
+                     (movie_id, taken_at or time.time(), RUN_ID, *(row[column] for column in SCORE_SNAPSHOT_COLUMNS)))
+    conn.close()
+
+def score_history(movie_id, start=0, end=math.inf):
+    # [(taken_at, {column: value})] for the snapshots taken in [start, end)
+    conn = sqlite3.connect(DB_NAME)
+    rows = conn.execute(SCORE_HISTORY_QUERY, (movie_id, start, end)).fetchall()
+    conn.close()
+    return [(row[0], dict(zip(SCORE_SNAPSHOT_COLUMNS, row[1:]))) for row in rows]
+
+def review_date_range(conn, movie_id):
+    return conn.execute(REVIEW_DATE_RANGE_QUERY, (movie_id,)).fetchone()
+
+def rolling_window_scores(movie_id, window_seconds, step_seconds, start=None, end=None):
+    # [(window end, MovieResults)] for windows [t - window, t) every step_seconds back from end (default now)
+    # to start (default the first review). One indexed range scan sums the score columns into buckets that
+    # divide both the window and the step, then prefix sums over the buckets make every window two lookups.
+    import numpy as np
+
+    conn = sqlite3.connect(DB_NAME)
+    first, _ = review_date_range(conn, movie_id)
+    end = time.time() if end is None else end
+    start = (first if first is not None else end) if start is None else start
+    window_seconds, step_seconds = int(window_seconds), int(step_seconds)
+    windows = max(1, math.ceil((end - start) / step_seconds))
+    origin = end - (windows - 1) * step_seconds - window_seconds
+    bucket_seconds = math.gcd(window_seconds, step_seconds)
+    rows = conn.execute(ROLLING_SCORES_QUERY, (origin, bucket_seconds, movie_id, end)).fetchall()
+    conn.close()
+
+    buckets = (windows - 1) * step_seconds // bucket_seconds + window_seconds // bucket_seconds
+    sums = np.zeros((buckets, len(SCORE_COLUMNS)))
+    for bucket, *values in rows:
+        # Float division can put a review sitting exactly on the end boundary one bucket too far
+        sums[min(bucket, buckets - 1)] += [value or 0 for value in values]
+    prefix = np.vstack([np.zeros(len(SCORE_COLUMNS)), np.cumsum(sums, axis=0)])
+    lower = np.arange(windows) * (step_seconds // bucket_seconds)
+    upper = lower + window_seconds // bucket_seconds
+    # Differences of running sums leave float noise where a window's true sum is 0
+    totals = np.round(prefix[upper] - prefix[lower], 9)
+    return [(end - (windows - 1 - index) * step_seconds,
+             movie_results_from_scores(movie_id, None, dict(zip(SCORE_COLUMNS, row.tolist()))))
+            for index, row in enumerate(totals)]
+
+@dataclass
+class BombOnset:
+    start: float  # first bucket of the spike
+    end: float  # end of its last bucket
+    inauthentic: int
+    reviews: int
+    peak: int  # inauthentic reviews in the busiest bucket
+    baseline: float  # mean inauthentic reviews per bucket before the onset
+
+def detect_bomb_onsets(movie_id, bucket_seconds=BOMB_BUCKET_SECONDS, baseline_buckets=BOMB_BASELINE_BUCKETS,
+                       spike_factor=BOMB_SPIKE_FACTOR, min_reviews=BOMB_MIN_REVIEWS, spike_sigma=BOMB_SPIKE_SIGMA,
+                       start=0, end=math.inf):
+    # Buckets inauthentic review volume by date with one indexed range scan and flags buckets that exceed
+    # spike_factor times the trailing baseline_buckets mean; consecutive spiking buckets form one onset
+    def exceeds(flagged, baseline):
+        baseline = max(baseline, 1)
+        return flagged > spike_factor * baseline and flagged > baseline + spike_sigma * math.sqrt(baseline)
+
+    conn = sqlite3.connect(DB_NAME)
+    rows = conn.execute(INAUTHENTIC_VOLUME_QUERY, (bucket_seconds, movie_id, start, end)).fetchall()
+    conn.close()
+    if not rows:
+        return []
+
+    first = rows[0][0]
+    totals = [0] * (rows[-1][0] - first + 1)
+    inauthentic = [0] * len(totals)
+    for bucket, count, flagged in rows:
+        totals[bucket - first] = count
+        inauthentic[bucket - first] = flagged
+
+    onsets = []
+    current = None
+    for index, flagged in enumerate(inauthentic):
+        previous = inauthentic[max(0, index - baseline_buckets):index]
+        baseline = sum(previous) / len(previous) if previous else 0.0
+        if current and flagged >= min_reviews:
+            # A running spike continues while buckets stay busy, measured against the baseline at its onset
+            spiking = exceeds(flagged, current.baseline)
+        else:
+            spiking = (len(previous) >= BOMB_MIN_BASELINE_BUCKETS and flagged >= min_reviews
+                       and exceeds(flagged, baseline))
+        if not spiking:
+            current = None
+            continue
+        bucket_start = (first + index) * bucket_seconds
+        if current is None:
+            current = BombOnset(bucket_start, bucket_start, 0, 0, 0, baseline)
+            onsets.append(current)
+        current.end = bucket_start + bucket_seconds
+        current.inauthentic += flagged
+        current.reviews += totals[index]
+        current.peak = max(current.peak, flagged)
+    return onsets
+
+def format_timestamp(value):
+    return datetime.fromtimestamp(value, timezone.utc).strftime("%Y-%m-%d %H:%M") if value is not None else "n/a"
+
+def print_score_history(movie_title):
+    movie_id = find_movie_id(movie_title)
+    if movie_id is None:
+        print(f"Movie '{movie_title}' not found in database.")
+        return
+    history = score_history(movie_id)
+    print(f"\n=== SCORE HISTORY for '{movie_title}' ({len(history)} runs) ===")
+    for taken_at, snapshot in history:
+        print(f"{format_timestamp(taken_at)} UTC: RT {format_percent(snapshot['rt_score'])}, "
+              f"sanitized {format_percent(snapshot['sanitized_score'])} ({snapshot['analyzed_reviews']} analyzed, "
+              f"{snapshot['inauthentic_count']} inauthentic)")
+
+def print_score_trend(movie_title, window_days, step_days):
+    movie_id = find_movie_id(movie_title)
+    if movie_id is None:
+        print(f"Movie '{movie_title}' not found in database.")
+        return
+    windows = rolling_window_scores(movie_id, window_days * 86400, step_days * 86400)
+    print(f"\n=== {window_days:g}-DAY ROLLING SCORES for '{movie_title}' (reviews by date) ===")
+    for window_end, results in windows:
+        if results.rated_reviews or results.total_reviews:
+            print(f"to {format_timestamp(window_end)}: RT {format_percent(results.rt_score)} of {results.rated_reviews}, "
+                  f"sanitized {format_percent(results.sanitized_score)} of {results.total_reviews} analyzed "
+                  f"({results.inauthentic_count} inauthentic)")
+
+def print_bomb_onsets(movie_title):
+    movie_id = find_movie_id(movie_title)
+    if movie_id is None:
+        print(f"Movie '{movie_title}' not found in database.")
+        return
+    onsets = detect_bomb_onsets(movie_id)
+    print(f"\n=== REVIEW BOMB ONSETS for '{movie_title}' ===")
+    if not onsets:
+        print("No spikes in inauthentic review volume.")
+    for onset in onsets:
+        print(f"{format_timestamp(onset.start)} to {format_timestamp(onset.end)} UTC: {onset.inauthentic} inauthentic "
+              f"of {onset.reviews} reviews (peak {onset.peak} per {BOMB_BUCKET_SECONDS // 3600}h, "
+              f"baseline {onset.baseline:.1f})")
+
+# Columns written per review by export_dataset, with their numpy dtypes. NULL ratings and quality scores
+# (not yet analyzed) become NaN and a NULL is_authentic becomes -1. Review text is stored as UTF-8 bytes
+# plus offsets: a text column in Parquet/Arrow, text.bin and text_offsets.npy (one more than rows) in npy.
+EXPORT_COLUMNS = {
+    'review_id': 'int64',
+    'rating': 'float32',
+    'quality_score': 'float64',
+    'is_authentic': 'int8',
+    'near_duplicate': 'bool',
+    'created_at': 'float64',
+}
+
+EXPORT_QUERY = '''
+    SELECT r.id, r.original_rating, a.quality_score, a.is_authentic, r.near_duplicate_of IS NOT NULL, r.created_at,
+           r.review_text
+    FROM reviews r
+    LEFT JOIN ai_analysis a ON a.review_id = r.id
+    WHERE r.movie_id = ?
+'''
+
+def resolve_export_format(fmt):
+    if fmt not in ("auto", "parquet", "arrow", "npy"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "auto":
+        return "parquet" if importlib.util.find_spec("pyarrow") else "npy"
+    return fmt
+
+def export_chunks(cursor):
+    # Converts the rows of EXPORT_QUERY to column arrays, EXPORT_CHUNK_ROWS at a time
+    import numpy as np
+    while True:
+        rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+        if not rows:
+            return
+        review_ids, ratings, quality_scores, authentic, duplicates, created_at, texts = zip(*rows)
+        yield {
+            'review_id': np.array(review_ids, dtype=np.int64),
+            'rating': np.array(ratings, dtype=np.float32),  # None becomes NaN
+            'quality_score': np.array(quality_scores, dtype=np.float64),
+            'is_authentic': np.array([-1 if value is None else value for value in authentic], dtype=np.int8),
+            'near_duplicate': np.array(duplicates, dtype=bool),
+            'created_at': np.array(created_at, dtype=np.float64),
+        }, texts
+
+class NpyPartitionWriter:
+    # One memory-mappable .npy file per column, filled in place as chunks arrive
+    def __init__(self, path, rows):
+        import numpy as np
+        from numpy.lib.format import open_memmap
+        self.columns = {name: open_memmap(os.path.join(path, f"{name}.npy"), mode='w+', dtype=dtype, shape=(rows,))
+                        for name, dtype in EXPORT_COLUMNS.items()}
+        self.offsets = open_memmap(os.path.join(path, "text_offsets.npy"), mode='w+', dtype=np.int64, shape=(rows + 1,))
+        self.offsets[0] = 0
+        self.text = open(os.path.join(path, "text.bin"), "wb")
+        self.rows = 0
+
+    def write(self, columns, texts):
+        import numpy as np
+        end = self.rows + len(texts)
+        for name, values in columns.items():
+            self.columns[name][self.rows:end] = values
+        encoded = [text.encode("utf-8") for text in texts]
+        self.offsets[self.rows + 1:end + 1] = self.offsets[self.rows] + np.cumsum([len(data) for data in encoded])
+        self.text.write(b"".join(encoded))
+        self.rows = end
+
+    def close(self):
+        for column in (*self.columns.values(), self.offsets):
+            column.flush()
+        self.text.close()
+
+class ArrowPartitionWriter:
+    # Parquet with a row group per chunk, or an uncompressed Arrow IPC file that reads back without copies
+    def __init__(self, path, fmt):
+        import pyarrow as pa
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name, dtype in EXPORT_COLUMNS.items()]
+                                + [('text', pa.large_string())])
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(os.path.join(path, "reviews.parquet"), self.schema)
+        else:
+            self.writer = pa.ipc.new_file(os.path.join(path, "reviews.arrow"), self.schema)
+
+    def write(self, columns, texts):
+        arrays = [self.pa.array(columns[name]) for name in EXPORT_COLUMNS] + [self.pa.array(texts, self.pa.large_string())]
+        self.writer.write_batch(self.pa.record_batch(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def export_partition(conn, movie_id, path, fmt):
+    # Streams one movie's rows into a fresh partition directory, swapped in only once it is complete.
+    # Count and rows are read in one transaction so the npy files are sized for exactly the rows written.
+    temp_path = f"{path}.tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    conn.execute("BEGIN")
+    try:
+        rows = conn.execute("SELECT COUNT(*) FROM reviews WHERE movie_id = ?", (movie_id,)).fetchone()[0]
+        writer = NpyPartitionWriter(temp_path, rows) if fmt == "npy" else ArrowPartitionWriter(temp_path, fmt)
+        try:
+            for columns, texts in export_chunks(conn.execute(EXPORT_QUERY, (movie_id,))):
+                writer.write(columns, texts)
+        finally:
+            writer.close()
+    finally:
+        conn.rollback()
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(temp_path, path)
+    return rows
+
+def export_dataset(directory, movie_titles=None, fmt=EXPORT_FORMAT):
+    # Writes reviews joined to their AI verdicts as one hive-style partition per movie (movie_id=N/) plus a
+    # _manifest.json listing them (the underscore keeps pyarrow.dataset from reading it as data)
+    fmt = resolve_export_format(fmt)
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(DB_NAME)
+    movies = conn.execute("SELECT id, title FROM movies ORDER BY id").fetchall()
+    if movie_titles:
+        missing = set(movie_titles) - {title for _, title in movies}
+        for movie_title in sorted(missing):
+            print(f"Movie '{movie_title}' not found in database.")
+        movies = [(movie_id, title) for movie_id, title in movies if title in movie_titles]
+
+    manifest = {'format': fmt, 'columns': EXPORT_COLUMNS, 'movies': []}
+    start = time.perf_counter()
+    try:
+        for movie_id, movie_title in movies:
+            partition = f"movie_id={movie_id}"
+            with metrics.stage('export') as stage:
+                stage.items = export_partition(conn, movie_id, os.path.join(directory, partition), fmt)
+            manifest['movies'].append({'movie_id': movie_id, 'title': movie_title, 'rows': stage.items, 'path': partition})
+    finally:
+        conn.close()
+    write_file_atomically(os.path.join(directory, "_manifest.json"), json.dumps(manifest, indent=2))
+
+    total = sum(movie['rows'] for movie in manifest['movies'])
+    print(f"Exported {total} reviews of {len(manifest['movies'])} movies as {fmt} to {directory} "
+          f"in {time.perf_counter() - start:.1f}s.")
+    return manifest
+
+def read_export_manifest(directory):
+    with open(os.path.join(directory, "_manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+def load_export_partition(directory, entry, fmt):
+    # Returns the EXPORT_COLUMNS of one manifest entry as numpy arrays. npy files are memory-mapped and
+    # Arrow IPC buffers are mapped and wrapped without copying; Parquet is compressed, so it is decoded.
+    import numpy as np
+    path = os.path.join(directory, entry['path'])
+    if fmt == "npy":
+        return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in EXPORT_COLUMNS}
+    import pyarrow as pa
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(os.path.join(path, "reviews.parquet"), columns=list(EXPORT_COLUMNS), memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(os.path.join(path, "reviews.arrow"))).read_all()
+    return {name: table.column(name).to_numpy() for name in EXPORT_COLUMNS}
+
+def load_export_texts(directory, entry, fmt):
+    path = os.path.join(directory, entry['path'])
+    if fmt == "npy":
+        import numpy as np
+        offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode='r')
+        with open(os.path.join(path, "text.bin"), "rb") as f:
+            data = f.read()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+    import pyarrow as pa
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(os.path.join(path, "reviews.parquet"), columns=['text']).column('text').to_pylist()
+    return pa.ipc.open_file(pa.memory_map(os.path.join(path, "reviews.arrow"))).read_all().column('text').to_pylist()
+
+def scores_from_columns(columns):
+    # The movie_scores sums (see NEAR_DUPLICATE_REVIEW_SCORE_COLUMNS and NEAR_DUPLICATE_ANALYSIS_SCORE_COLUMNS)
+    # computed with numpy over exported columns, so movie_results_from_scores works on an export as it does
+    # on the database
+    import numpy as np
+    ratings = columns['rating'].astype(np.float64)
+    quality = columns['quality_score']
+    authentic = columns['is_authentic']
+    duplicate = columns['near_duplicate']
+
+    analyzed = ~np.isnan(quality)
+    rated = ~np.isnan(ratings)
+    analyzed_rated = analyzed & rated
+    weighted = analyzed_rated & (authentic == 1) & ~duplicate
+    scores = {
+        'rated_reviews': np.count_nonzero(rated),
+        'fresh_reviews': np.count_nonzero(ratings >= 3.5),
+        'near_duplicate_reviews': np.count_nonzero(duplicate),
+        'analyzed_reviews': np.count_nonzero(analyzed),
+        'analyzed_rated_reviews': np.count_nonzero(analyzed_rated),
+        'analyzed_rating_sum': ratings.sum(where=analyzed_rated),
+        'quality_sum': quality.sum(where=analyzed),
+        'authentic_count': np.count_nonzero(analyzed & (authentic == 1)),
+        'inauthentic_count': np.count_nonzero(analyzed & (authentic == 0)),
+        'total_weight': quality.sum(where=weighted),
+        'weighted_sum': np.dot(quality[weighted], ratings[weighted]),
+    }
+
+    # QUALITY_BUCKETS runs from best to worst, so a score's bucket is the number of lower bounds above it
+    bounds = np.array(sorted(lower for _, lower in QUALITY_BUCKETS if lower is not None))
+    analyzed_quality = quality[analyzed]
+    buckets = len(bounds) - np.searchsorted(bounds, analyzed_quality, side='right')
+    counts = np.bincount(buckets, minlength=len(QUALITY_BUCKETS))
+    sums = np.bincount(buckets, weights=analyzed_quality, minlength=len(QUALITY_BUCKETS))
+    for index in range(len(QUALITY_BUCKETS)):
+        scores[f'bucket_{index}_count'] = counts[index]
+        scores[f'bucket_{index}_quality_sum'] = sums[index]
+    return scores
+
+def export_movie_results(directory, manifest=None):
+    # MovieResults for every movie in an export, computed from its columns without touching the database
+    manifest = manifest or read_export_manifest(directory)
+    results = []
+    for entry in manifest['movies']:
+        with metrics.stage('score') as stage:
+            columns = load_export_partition(directory, entry, manifest['format'])
+            results.append(movie_results_from_scores(entry['movie_id'], entry['title'], scores_from_columns(columns)))
+            stage.items = entry['rows']
+    return results
+
+def list_export_scores(directory):
+    for results in export_movie_results(directory):
+        print(f"{results.title}: RT {format_percent(results.rt_score)}, "
+              f"sanitized {format_percent(results.sanitized_score)} ({results.total_reviews} reviews analyzed)")
+
+# Hot per-movie statements with sample parameters, checked by query_plan_scans()
+PLANNED_QUERIES = {
+    'pending_analysis': (PENDING_ANALYSIS_QUERY, (1, ANALYSIS_RETRY_REASONING, ANALYSIS_IN_PROGRESS_REASONING, 0)),
+    'renew_leases': (RENEW_LEASES_QUERY, (0, 1, RUN_ID, ANALYSIS_IN_PROGRESS_REASONING)),
+    'movie_scores': (MOVIE_SCORES_QUERY, (1,)),
+    'movie_scores_rebuild': (score_rebuild_query("WHERE r.movie_id = ?"), (1,)),
+    'lsh_candidates': (LSH_CANDIDATES_QUERY, tuple(range(LSH_BANDS))),
+    'cluster_representative': (CLUSTER_REPRESENTATIVE_QUERY, (1, 1)),
+    'export_movie': (EXPORT_QUERY, (1,)),
+    'score_history': (SCORE_HISTORY_QUERY, (1, 0, 1e10)),
+    'rolling_scores': (ROLLING_SCORES_QUERY, (0, 86400, 1, 1e10)),
+    'inauthentic_volume': (INAUTHENTIC_VOLUME_QUERY, (86400, 1, 0, 1e10)),
+    'review_date_range': (REVIEW_DATE_RANGE_QUERY, (1,)),
+    'insert_review': (INSERT_REVIEW_QUERY, (1, "text", 5.0, "user", "2d", 0, 86400, "hash")),
+}
+
+def query_plan_scans(conn, queries=None):
+    # Returns {name: [plan steps]} for every statement whose plan contains a full table SCAN
+    # (reading back a LIMITed subquery shows up as "SCAN (subquery-N)", and selecting subqueries without a
+    # FROM clause as "SCAN CONSTANT ROW"; both are fine)
+    scans = {}
+    for name, (sql, params) in (queries or PLANNED_QUERIES).items():
+        steps = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        bad = [step for step in steps
+               if step.startswith("SCAN") and not step.startswith(("SCAN (subquery", "SCAN CONSTANT ROW"))]
+        if bad:
+            scans[name] = bad
+    return scans
+
+def format_percent(value):
+    return f"{value:.1f}%" if value is not None else "n/a"
+
+def print_analysis_results(results):
+    print(f"\n=== AI ANALYSIS RESULTS for '{results.title}' ===")
+    if not results.total_reviews:
+        print("No analyzed reviews yet.")
+        print(f"Official RT Audience Score: {format_percent(results.rt_score)}")
+        return
+
+    total_reviews = results.total_reviews
+    rt_score = results.rt_score
+    sanitized_score = results.sanitized_score
+    avg_original = results.avg_original_rating
+    raw_avg_percent = results.raw_avg_percent
+    avg_quality_percent = results.avg_quality_percent
+    authentic_count = results.authentic_count
+    inauthentic_count = results.inauthentic_count
+
+    print(f"Total Reviews Analyzed: {total_reviews}")
+    print(f"Official RT Audience Score: {format_percent(rt_score)}")
+    if avg_original is not None:
+        print(f"Raw Average Star Rating: {avg_original:.1f}/5 ({raw_avg_percent:.1f}%)")
+    print(f"Sanitized Score (AI-Weighted): {format_percent(sanitized_score)}") 
+    print(f"Average AI Quality Score: {avg_quality_percent:.1f}%")
+    print(f"Authentic Reviews: {authentic_count} ({authentic_count/total_reviews*100:.1f}%)")
+    print(f"Potential Review Bombs/Spam: {inauthentic_count} ({inauthentic_count/total_reviews*100:.1f}%)")
+    if results.near_duplicate_reviews:
+        print(f"Near-Duplicate Reviews (counted once): {results.near_duplicate_reviews}")
+    
+    print("\n--- Review Quality Distribution ---")
+    for bucket in results.distribution:
+        avg_qual_percent = bucket.avg_quality * 100
+        percentage = (bucket.count / total_reviews) * 100
+        print(f"  - {bucket.label}: {bucket.count} reviews ({percentage:.1f}% of reviews) - Avg quality of reviews: {avg_qual_percent:.1f}%")
+    
+    if None not in (rt_score, sanitized_score, raw_avg_percent):
         quality_adjustment = sanitized_score - raw_avg_percent
         score_difference = sanitized_score - rt_score
         
@@ -497,29 +3691,552 @@ def display_analysis_results(movie_title):
             adjustment_text = "Significant quality adjustment applied"
         
         print(f"→ {adjustment_text}")
-        
-        print("\n--- INTERPRETATION ---")
-        print(f"The AI analysis detected that {inauthentic_count/total_reviews*100:.1f}% of reviews may be review bombing, spam, or low-quality content.")
-        
+    
+    print("\n--- INTERPRETATION ---")
+    print(f"The AI analysis detected that {inauthentic_count/total_reviews*100:.1f}% of reviews may be review bombing, spam, or low-quality content.")
+    
+    if None not in (rt_score, sanitized_score):
+        score_difference = sanitized_score - rt_score
         if score_difference > 0:
             print(f"The sanitized score is {score_difference:.1f}% HIGHER than the official score, suggesting review bombing was occurring.")
         else:
             print(f"The sanitized score is {abs(score_difference):.1f}% LOWER than the official score.")
-        
-        # Quality assessment
-        if avg_quality_percent >= 70:
-            quality_text = "High quality, detailed reviews"
-        elif avg_quality_percent >= 50:
-            quality_text = "Mixed quality reviews"
-        else:
-            quality_text = "Mostly brief, emotional, or low-effort reviews"
-        
-        print(f"\nOverall review quality: {avg_quality_percent:.1f}%")
-        print(f"→ {quality_text}")
     
+    # Quality assessment
+    if avg_quality_percent >= 70:
+        quality_text = "High quality, detailed reviews"
+    elif avg_quality_percent >= 50:
+        quality_text = "Mixed quality reviews"
+    else:
+        quality_text = "Mostly brief, emotional, or low-effort reviews"
+    
+    print(f"\nOverall review quality: {avg_quality_percent:.1f}%")
+    print(f"→ {quality_text}")
+
+def display_analysis_results(movie_title):
+    results = get_movie_results(movie_title)
+
+    if not results:
+        print(f"Movie '{movie_title}' not found in database.")
+        return
+
+    print_analysis_results(results)
+    return results
+
+def list_movies():
+    conn = sqlite3.connect(DB_NAME)
+    movies = conn.execute("SELECT id, title FROM movies ORDER BY title").fetchall()
+    if not movies:
+        print("No movies in the database yet.")
+    for movie_id, movie_title in movies:
+        results = compute_movie_results(movie_id, movie_title, conn)
+        print(f"{movie_title}: RT {format_percent(results.rt_score)}, "
+              f"sanitized {format_percent(results.sanitized_score)} ({results.total_reviews} reviews analyzed)")
+    conn.close()
+
+def list_runs():
+    conn = sqlite3.connect(DB_NAME)
+    runs = conn.execute('''
+        SELECT m.title, l.stage, l.reviews_loaded, l.reviews_saved, l.reviews_analyzed, l.stage_seconds, l.error
+        FROM run_ledger l
+        JOIN movies m ON m.id = l.movie_id
+        ORDER BY l.updated_at DESC
+    ''').fetchall()
+    conn.close()
+    if not runs:
+        print("No runs recorded yet.")
+    for movie_title, stage, loaded, saved, analyzed, stage_seconds, error in runs:
+        timings = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in json.loads(stage_seconds).items())
+        print(f"{movie_title}: {stage} ({loaded} loaded, {saved} saved, {analyzed} analyzed"
+              f"{'; ' + timings if timings else ''}){' - ' + error if error else ''}")
+
+def unfinished_run_titles():
+    conn = sqlite3.connect(DB_NAME)
+    titles = [title for title, in conn.execute('''
+        SELECT m.title FROM run_ledger l
+        JOIN movies m ON m.id = l.movie_id
+        WHERE l.stage IN ('scrape', 'analyze')
+        ORDER BY l.updated_at
+    ''')]
+    conn.close()
+    return titles
+
+class StageStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+
+    def record(self, stage, seconds, items):
+        with self.lock:
+            calls, busy, total = self.stages.get(stage, (0, 0.0, 0))
+            self.stages[stage] = (calls + 1, busy + seconds, total + items)
+
+    def print_summary(self, wall_seconds):
+        print("\n=== BATCH THROUGHPUT ===")
+        for stage, (calls, busy, total) in self.stages.items():
+            rate = total / busy if busy > 0 else 0
+            print(f"{stage:<8} {total:>7} reviews in {calls:>4} movies, {busy:8.1f}s busy ({rate:.1f} reviews/s per worker)")
+        analyzed = self.stages.get('analyze', (0, 0.0, 0))[2]
+        scraped = self.stages.get('scrape', (0, 0.0, 0))[2]
+        print(f"Wall time: {wall_seconds:.1f}s")
+        if wall_seconds > 0:
+            print(f"End-to-end throughput: {scraped / wall_seconds:.1f} reviews/s scraped, "
+                  f"{analyzed / wall_seconds:.1f} reviews/s analyzed")
+
+def run_batch(titles, scrape_workers=BATCH_SCRAPE_WORKERS, analyze_workers=BATCH_ANALYZE_WORKERS, backend=SCRAPE_BACKEND):
+    # Scrapes several movies at once, saving reviews as they load, and analyzes each one as soon as its
+    # scrape finishes, so the AI stage for one title overlaps the scraping of the next
+    setup_database()
+
+    stats = StageStats()
+    driver_pool = WebDriverPool(min(DRIVER_POOL_SIZE, scrape_workers))
+    failed = []
+    completed = []
+    start = time.perf_counter()
+
+    def scrape(movie_title):
+        stage_start = time.perf_counter()
+        scraped = scrape_movie(movie_title, build_movie_url(movie_title), backend, driver_pool)
+        stats.record('scrape', time.perf_counter() - stage_start, scraped[1] if scraped else 0)
+        return scraped
+
+    def analyze(movie_title, movie_id):
+        stage_start = time.perf_counter()
+        analyzed = analyze_movie(movie_id)
+        stats.record('analyze', time.perf_counter() - stage_start, analyzed)
+        return movie_id
+
+    print(f"Processing {len(titles)} movies ({scrape_workers} scrape workers, {analyze_workers} analysis workers)...")
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=scrape_workers) as scrape_executor, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=analyze_workers) as analyze_executor:
+            scrape_futures = {scrape_executor.submit(scrape, title): title for title in titles}
+            analyze_futures = {}
+
+            # Scrape workers save their own pages; WAL and the busy timeout serialize their short transactions
+            for future in concurrent.futures.as_completed(scrape_futures):
+                movie_title = scrape_futures[future]
+                try:
+                    scraped = future.result()
+                except Exception as e:
+                    print(f"Error scraping '{movie_title}': {e}")
+                    failed.append(movie_title)
+                    continue
+
+                if not scraped or not scraped[1]:
+                    print(f"No reviews found for '{movie_title}', skipping.")
+                    failed.append(movie_title)
+                    continue
+
+                movie_id = scraped[0]
+                analyze_futures[analyze_executor.submit(analyze, movie_title, movie_id)] = movie_title
+
+            for future in concurrent.futures.as_completed(analyze_futures):
+                movie_title = analyze_futures[future]
+                try:
+                    movie_id = future.result()
+                except Exception as e:
+                    print(f"Error analyzing '{movie_title}': {e}")
+                    failed.append(movie_title)
+                    continue
+                completed.append((movie_title, movie_id))
+    finally:
+        driver_pool.close()
+
+    print("\n=== BATCH RESULTS ===")
+    for movie_title, movie_id in completed:
+        results = compute_movie_results(movie_id, movie_title)
+        print(f"{movie_title}: RT {format_percent(results.rt_score)}, sanitized {format_percent(results.sanitized_score)}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+
+    stats.print_summary(time.perf_counter() - start)
+    return completed, failed
+
+@dataclass
+class ServiceJob:
+    id: str
+    title: str
+    movie_url: str
+    status: str = 'queued'  # queued, running, done, not_found or failed
+    created_at: float = field(default_factory=time.time)
+    started_at: float = None
+    finished_at: float = None
+    error: str = None
+    results: MovieResults = field(default=None, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in ('id', 'title', 'status', 'created_at', 'started_at', 'finished_at', 'error')}
+
+class ResultCache:
+    # LRU of MovieResults by movie URL and the time each was computed. Results younger than ttl are fresh;
+    # for stale_ttl after that they are still served while a refresh runs, then dropped.
+    def __init__(self, ttl=SERVICE_RESULT_TTL, stale_ttl=SERVICE_STALE_TTL, size=SERVICE_CACHE_SIZE):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.size = size
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        # Returns (results, age in seconds), or (None, None)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, None
+        results, computed_at = entry
+        age = time.time() - computed_at
+        if age > self.ttl + self.stale_ttl:
+            del self.entries[key]
+            return None, None
+        self.entries.move_to_end(key)
+        return results, age
+
+    def put(self, key, results, computed_at=None):
+        self.entries[key] = (results, computed_at or time.time())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+def stored_movie_results(movie_title):
+    # Results of the movie's last completed run, with the time it finished, or None
+    conn = sqlite3.connect(DB_NAME)
+    try:
+        row = conn.execute('''
+            SELECT m.id, l.finished_at FROM movies m
+            JOIN run_ledger l ON l.movie_id = m.id
+            WHERE m.title = ? AND l.stage = 'done'
+        ''', (movie_title,)).fetchone()
+        return (compute_movie_results(row[0], movie_title, conn), row[1]) if row else None
+    finally:
+        conn.close()
+
+def run_progress(movie_title):
+    conn = sqlite3.connect(DB_NAME)
+    row = conn.execute('''
+        SELECT l.stage, l.reviews_loaded, l.reviews_saved, l.reviews_analyzed FROM run_ledger l
+        JOIN movies m ON m.id = l.movie_id
+        WHERE m.title = ?
+    ''', (movie_title,)).fetchone()
     conn.close()
+    return dict(zip(('stage', 'reviews_loaded', 'reviews_saved', 'reviews_analyzed'), row)) if row else None
+
+class ReviewService:
+    # asyncio HTTP front end for the pipeline. Jobs run process_movie on a thread pool that shares warm
+    # clients: the pooled HTTP session, the DeepSeek clients and a WebDriverPool whose browsers stay open.
+    # Concurrent requests for the same movie share one job, and results are served from a ResultCache.
+    #   GET /score?title=X[&wait=S]  cached results (refreshed in the background once stale), or the job
+    #                                computing them; wait=S holds the response up to S seconds for it
+    #   GET /jobs/ID                 a job's status, its run_ledger progress and, once done, its results
+    #   GET /health                  running jobs and cached movies
+    def __init__(self, workers=SERVICE_WORKERS, cache=None, backend=SCRAPE_BACKEND, warm_drivers=0):
+        self.cache = cache or ResultCache()
+        self.backend = backend
+        self.warm_drivers = warm_drivers
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service-job")
+        self.driver_pool = WebDriverPool(min(DRIVER_POOL_SIZE, workers))
+        self.jobs = OrderedDict()
+        self.active = {}  # movie URL -> its queued or running job
+        self.tasks = set()
+        self.loop = None
+        self.stopping = None
+        self.port = None
+
+    def warm_up(self):
+        global async_analysis_loop
+        setup_database()
+        get_http_session()
+        get_deepseek_client()
+        if ANALYSIS_ENGINE == "async" and async_analysis_loop is None:
+            async_analysis_loop = AsyncAnalysisLoop()
+        drivers = [self.driver_pool.acquire() for _ in range(self.warm_drivers)]
+        for driver in drivers:
+            self.driver_pool.release(driver)
+
+    def submit(self, movie_title, movie_url):
+        job = self.active.get(movie_url)
+        if job:
+            return job
+        job = ServiceJob(uuid.uuid4().hex[:12], movie_title, movie_url)
+        self.jobs[job.id] = job
+        self.active[movie_url] = job
+        while len(self.jobs) > SERVICE_JOB_HISTORY:
+            oldest = next(iter(self.jobs.values()))
+            if oldest.finished_at is None:
+                break
+            del self.jobs[oldest.id]
+        task = self.loop.create_task(self.run_job(job))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return job
+
+    def process(self, job):
+        job.status, job.started_at = 'running', time.time()
+        scraped = process_movie(job.title, job.movie_url, self.backend, self.driver_pool)
+        if not scraped or not scraped[1]:
+            return None
+        return get_movie_results(job.title)
+
+    async def run_job(self, job):
+        try:
+            job.results = await self.loop.run_in_executor(self.executor, self.process, job)
+            if job.results is None:
+                job.status, job.error = 'not_found', "No audience reviews found on Rotten Tomatoes"
+            else:
+                job.status = 'done'
+                self.cache.put(job.movie_url, job.results)
+        except Exception as e:
+            job.status, job.error = 'failed', f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+            self.active.pop(job.movie_url, None)
+            job.done.set()
+
+    async def job_response(self, job, progress=False):
+        body = job.to_dict()
+        if progress and job.status == 'running':
+            body['progress'] = await self.loop.run_in_executor(None, run_progress, job.title)
+        if job.results:
+            body['result'] = job.results.to_dict()
+        status = {'done': 200, 'not_found': 404, 'failed': 502}.get(job.status, 202)
+        return status, body
+
+    async def score(self, movie_title, wait):
+        movie_url = build_movie_url(movie_title)
+        results, age = self.cache.get(movie_url)
+        if results is None:
+            # Lookups go to the default executor so they never queue behind running jobs
+            stored = await self.loop.run_in_executor(None, stored_movie_results, movie_title)
+            if stored:
+                self.cache.put(movie_url, *stored)
+                results, age = self.cache.get(movie_url)
+
+        if results is not None:
+            body = {'title': movie_title, 'status': 'fresh', 'age_seconds': round(age, 1), 'result': results.to_dict()}
+            if age > self.cache.ttl:
+                body['status'] = 'stale'
+                body['job'] = self.submit(movie_title, movie_url).id
+            return 200, body
+
+        job = self.submit(movie_title, movie_url)
+        if wait:
+            try:
+                await asyncio.wait_for(asyncio.shield(job.done.wait()), wait)
+            except asyncio.TimeoutError:
+                pass
+        return await self.job_response(job)
+
+    async def route(self, method, target):
+        parts = urlsplit(target)
+        query = parse_qs(parts.query)
+        if method != "GET":
+            return 405, {'error': f"{method} not allowed"}
+        if parts.path == "/score":
+            movie_title = query.get('title', [''])[0].strip()
+            if not movie_title:
+                return 400, {'error': "title is required"}
+            try:
+                wait = float(query.get('wait', ['0'])[0])
+            except ValueError:
+                wait = math.nan
+            if not math.isfinite(wait) or wait < 0:
+                return 400, {'error': "wait must be a non-negative number of seconds"}
+            return await self.score(movie_title, min(wait, SERVICE_MAX_WAIT))
+        if parts.path.startswith("/jobs/"):
+            job = self.jobs.get(parts.path[len("/jobs/"):])
+            if not job:
+                return 404, {'error': "unknown job"}
+            return await self.job_response(job, progress=True)
+        if parts.path == "/health":
+            return 200, {'running_jobs': len(self.active), 'cached_movies': len(self.cache.entries)}
+        return 404, {'error': "not found"}
+
+    async def handle(self, reader, writer):
+        # One request per connection
+        try:
+            try:
+                request_line = (await reader.readline()).decode('latin-1')
+                method, target, _ = request_line.split(' ', 2)
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+            except ValueError:
+                status, body = 400, {'error': "malformed request"}
+            else:
+                try:
+                    status, body = await self.route(method, target)
+                except Exception as e:
+                    status, body = 500, {'error': f"{type(e).__name__}: {e}"}
+            data = json.dumps(body).encode('utf-8')
+            writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode('latin-1') + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, on_started=None):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        await self.loop.run_in_executor(None, self.warm_up)
+        server = await asyncio.start_server(self.handle, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"Serving on http://{host}:{self.port} (GET /score?title=..., /jobs/ID, /health)")
+        if on_started:
+            on_started(self)
+        async with server:
+            await self.stopping.wait()
+
+    def stop(self):
+        # Safe to call from any thread
+        self.loop.call_soon_threadsafe(self.stopping.set)
+
+    def close(self):
+        # Running jobs finish (their ledgers stay consistent); queued ones are dropped
+        global async_analysis_loop
+        self.executor.shutdown(cancel_futures=True)
+        self.driver_pool.close()
+        if async_analysis_loop:
+            async_analysis_loop.close()
+            async_analysis_loop = None
+
+def run_service(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS, warm_drivers=0):
+    service = ReviewService(workers, warm_drivers=warm_drivers)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("Shutting down; waiting for running jobs...")
+    finally:
+        service.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Rotten Tomatoes audience reviews and compute an AI-sanitized score.")
+    parser.add_argument("titles", nargs="*", help="Movie titles to process as a batch (prompts for one title if omitted)")
+    parser.add_argument("--titles-file", help="File with one movie title per line to process as a batch")
+    parser.add_argument("--scrape-workers", type=int, default=BATCH_SCRAPE_WORKERS)
+    parser.add_argument("--analyze-workers", type=int, default=BATCH_ANALYZE_WORKERS)
+    parser.add_argument("--check-scores", action="store_true",
+                        help="Diff the incremental movie_scores table against a full rebuild and exit")
+    parser.add_argument("--repair-scores", action="store_true",
+                        help="Like --check-scores, but rebuild movie_scores when it has drifted")
+    parser.add_argument("--show", action="append", default=[], metavar="TITLE",
+                        help="Print the stored results for a movie without scraping or analyzing (repeatable)")
+    parser.add_argument("--history", action="append", default=[], metavar="TITLE",
+                        help="Print the scores every run of a movie ended with (repeatable)")
+    parser.add_argument("--trend", action="append", default=[], metavar="TITLE",
+                        help="Print a movie's scores over rolling windows of review dates (repeatable)")
+    parser.add_argument("--window-days", type=float, default=7, help="Rolling window length for --trend")
+    parser.add_argument("--step-days", type=float, default=1, help="Distance between --trend windows")
+    parser.add_argument("--bomb-onsets", action="append", default=[], metavar="TITLE",
+                        help="List sudden spikes in a movie's inauthentic review volume (repeatable)")
+    parser.add_argument("--list-movies", action="store_true",
+                        help="List every stored movie with its RT and sanitized scores")
+    parser.add_argument("--index-duplicates", action="store_true",
+                        help="Add reviews saved before near-duplicate detection existed to the MinHash index")
+    parser.add_argument("--duplicate-clusters", type=int, metavar="N",
+                        help="List the N largest near-duplicate clusters and exit")
+    parser.add_argument("--triage-report", type=int, metavar="N",
+                        help="Compare local triage with LLM verdicts on N already-analyzed reviews and exit")
+    parser.add_argument("--runs", action="store_true",
+                        help="List the latest run per movie with its stage, counts and time per stage")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue every interrupted run as a batch, along with any titles given")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Export reviews and AI verdicts as one columnar partition per movie and exit")
+    parser.add_argument("--export-title", action="append", default=[], metavar="TITLE",
+                        help="Only export this movie (repeatable)")
+    parser.add_argument("--export-format", choices=["auto", "parquet", "arrow", "npy"], default=EXPORT_FORMAT,
+                        help="Parquet or Arrow need pyarrow; npy needs only numpy (default: parquet if available)")
+    parser.add_argument("--export-scores", metavar="DIR",
+                        help="List the scores of every movie in an export, computed from its columns, and exit")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as an HTTP service answering score requests instead of prompting for a title")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--service-workers", type=int, default=SERVICE_WORKERS)
+    parser.add_argument("--warm-drivers", type=int, default=0,
+                        help="Browsers the service launches at startup and keeps open for the Selenium backend")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="On exit, write stage timings, latency percentiles, tokens, retries and commits as JSON")
+    parser.add_argument("--metrics-prometheus", metavar="PATH",
+                        help="On exit, write the same metrics in the Prometheus text format")
+    parser.add_argument("--profile", action="append", default=[], choices=METRIC_STAGES,
+                        help="Profile a stage with cProfile (repeatable); stats are saved next to the report")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record each stage's peak memory with tracemalloc (slows the run down)")
+    args = parser.parse_args()
+
+    metrics.profile_stages = set(args.profile)
+    metrics.trace_memory = args.trace_memory
+    if args.metrics_json or args.metrics_prometheus or args.profile or args.trace_memory:
+        atexit.register(metrics.write_reports, args.metrics_json, args.metrics_prometheus)
+
+    if args.show or args.list_movies or args.history or args.trend or args.bomb_onsets:
+        if not schema_is_current():
+            print(f"No up-to-date database at {DB_NAME}; run the scraper once to create or upgrade it.")
+            exit(1)
+        if args.list_movies:
+            list_movies()
+        for movie_title in args.show:
+            display_analysis_results(movie_title)
+        for movie_title in args.history:
+            print_score_history(movie_title)
+        for movie_title in args.trend:
+            print_score_trend(movie_title, args.window_days, args.step_days)
+        for movie_title in args.bomb_onsets:
+            print_bomb_onsets(movie_title)
+        exit(0)
+
+    if args.index_duplicates or args.duplicate_clusters:
+        migrate_database()
+        if args.index_duplicates:
+            backfill_near_duplicates()
+        if args.duplicate_clusters:
+            near_duplicate_report(args.duplicate_clusters)
+        exit(0)
+
+    if args.triage_report:
+        migrate_database()
+        triage_report(args.triage_report)
+        exit(0)
+
+    if args.check_scores or args.repair_scores:
+        migrate_database()
+        mismatches = check_movie_scores(repair=args.repair_scores)
+        exit(1 if mismatches and not args.repair_scores else 0)
+
+    if args.runs:
+        migrate_database()
+        list_runs()
+        exit(0)
+
+    if args.export:
+        migrate_database()
+        export_dataset(args.export, args.export_title, args.export_format)
+        exit(0)
+
+    if args.export_scores:
+        list_export_scores(args.export_scores)
+        exit(0)
+
+    if args.serve:
+        run_service(args.host, args.port, args.service_workers, args.warm_drivers)
+        exit(0)
+
+    batch_titles = list(args.titles)
+    if args.titles_file:
+        batch_titles += read_titles_file(args.titles_file)
+    if args.resume:
+        migrate_database()
+        unfinished = unfinished_run_titles()
+        print(f"Resuming {len(unfinished)} interrupted runs.")
+        batch_titles += [title for title in unfinished if title not in batch_titles]
+        if not batch_titles:
+            exit(0)
+
+    if batch_titles:
+        run_batch(batch_titles, args.scrape_workers, args.analyze_workers)
+        exit(0)
+
     print("Starting RT reviews scraper...")
     setup_database()
 
@@ -532,23 +4249,19 @@ if __name__ == "__main__":
     print(f"Scraping reviews for: {movie_title}")
     print(f"URL: {movie_url}")
 
-    driver = scrape_reviews(movie_url)
+    scraped = process_movie(movie_title, movie_url)
 
-    if not driver:
+    if scraped is None:
         print(f"Failed to scrape reviews for '{movie_title}'. The movie may not exist on Rotten Tomatoes.")
         exit(1)
 
-    all_reviews = parse_reviews(driver)
-    driver.quit()
-
-    if len(all_reviews) == 0:
+    movie_id, loaded_count = scraped
+    if loaded_count == 0:
         print(f"No reviews found for '{movie_title}'. The movie may not have audience reviews or the page structure may have changed.")
         exit(1)
 
-    movie_id = save_reviews_to_db(all_reviews, movie_title, movie_url)
-    print("Scraping complete!")
+    print("Scraping and analysis complete!")
 
-    analyze_reviews_with_ai(movie_id)
     display_analysis_results(movie_title)
 
     print("\nProcess completed successfully :)")